@@ -0,0 +1,63 @@
+"""device trigram search
+
+Revision ID: 088bbb7784dc
+Revises: 24f2d1eca0e9
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "088bbb7784dc"
+down_revision: Union[str, None] = "24f2d1eca0e9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column(
+        "devices",
+        sa.Column(
+            "mac_digits",
+            sa.String(),
+            sa.Computed("lower(regexp_replace(mac, '[^0-9A-Fa-f]', '', 'g'))", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_devices_mac_digits_trgm",
+        "devices",
+        ["mac_digits"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"mac_digits": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_devices_ip_address_trgm",
+        "devices",
+        ["ip_address"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"ip_address": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_devices_workplace_number_trgm",
+        "devices",
+        ["workplace_number"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"workplace_number": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_devices_workplace_number_trgm", table_name="devices")
+    op.drop_index("ix_devices_ip_address_trgm", table_name="devices")
+    op.drop_index("ix_devices_mac_digits_trgm", table_name="devices")
+    op.drop_column("devices", "mac_digits")
@@ -0,0 +1,45 @@
+"""device summaries
+
+Revision ID: ba7f75d95e8d
+Revises: 088bbb7784dc
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "ba7f75d95e8d"
+down_revision: Union[str, None] = "088bbb7784dc"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f("ix_devices_switch_id"), "devices", ["switch_id"], unique=False)
+    op.create_table(
+        "device_summaries",
+        sa.Column("switch_id", sa.Integer(), nullable=False),
+        sa.Column("vlan", sa.Integer(), nullable=False),
+        sa.Column("status", sa.Boolean(), nullable=False),
+        sa.Column("device_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["switch_id"], ["switches.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("switch_id", "vlan", "status"),
+    )
+    op.execute(
+        """
+        INSERT INTO device_summaries (switch_id, vlan, status, device_count)
+        SELECT switch_id, vlan, status, count(*)
+        FROM devices
+        GROUP BY switch_id, vlan, status
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("device_summaries")
+    op.drop_index(op.f("ix_devices_switch_id"), table_name="devices")
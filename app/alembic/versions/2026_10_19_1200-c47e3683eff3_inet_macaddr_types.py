@@ -0,0 +1,140 @@
+"""inet macaddr types
+
+Revision ID: c47e3683eff3
+Revises: ba7f75d95e8d
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c47e3683eff3"
+down_revision: Union[str, None] = "ba7f75d95e8d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Текстовые индексы и вычисляемая колонка зависят от типов mac/ip_address - пересоздаём их после смены типа.
+    op.drop_index("ix_devices_ip_address_trgm", table_name="devices")
+    op.drop_index("ix_devices_mac_digits_trgm", table_name="devices")
+    op.drop_column("devices", "mac_digits")
+    op.drop_constraint("switches_core_switch_ip_fkey", "switches", type_="foreignkey")
+
+    op.alter_column(
+        "core_switches",
+        "ip_address",
+        type_=postgresql.INET(),
+        postgresql_using="ip_address::inet",
+    )
+    op.alter_column(
+        "switches",
+        "ip_address",
+        type_=postgresql.INET(),
+        postgresql_using="ip_address::inet",
+    )
+    op.alter_column(
+        "switches",
+        "core_switch_ip",
+        type_=postgresql.INET(),
+        postgresql_using="core_switch_ip::inet",
+    )
+    op.create_foreign_key(
+        "switches_core_switch_ip_fkey",
+        "switches",
+        "core_switches",
+        ["core_switch_ip"],
+        ["ip_address"],
+    )
+    op.alter_column(
+        "devices",
+        "ip_address",
+        type_=postgresql.INET(),
+        postgresql_using="ip_address::inet",
+    )
+    op.alter_column(
+        "devices",
+        "mac",
+        type_=postgresql.MACADDR(),
+        postgresql_using="mac::macaddr",
+    )
+
+    op.add_column(
+        "devices",
+        sa.Column(
+            "mac_digits",
+            sa.String(),
+            sa.Computed("replace(mac::text, ':', '')", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_devices_mac_digits_trgm",
+        "devices",
+        ["mac_digits"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"mac_digits": "gin_trgm_ops"},
+    )
+    op.execute("CREATE INDEX ix_devices_ip_address_trgm ON devices USING gin (host(ip_address) gin_trgm_ops)")
+    op.create_index(
+        "ix_devices_ip_address_gist",
+        "devices",
+        ["ip_address"],
+        unique=False,
+        postgresql_using="gist",
+        postgresql_ops={"ip_address": "inet_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_devices_ip_address_gist", table_name="devices")
+    op.drop_index("ix_devices_ip_address_trgm", table_name="devices")
+    op.drop_index("ix_devices_mac_digits_trgm", table_name="devices")
+    op.drop_column("devices", "mac_digits")
+    op.drop_constraint("switches_core_switch_ip_fkey", "switches", type_="foreignkey")
+
+    op.alter_column("devices", "mac", type_=sa.String(), postgresql_using="mac::text")
+    op.alter_column("devices", "ip_address", type_=sa.String(), postgresql_using="host(ip_address)")
+    op.alter_column("switches", "core_switch_ip", type_=sa.String(), postgresql_using="host(core_switch_ip)")
+    op.alter_column("switches", "ip_address", type_=sa.String(), postgresql_using="host(ip_address)")
+    op.alter_column("core_switches", "ip_address", type_=sa.String(), postgresql_using="host(ip_address)")
+    op.create_foreign_key(
+        "switches_core_switch_ip_fkey",
+        "switches",
+        "core_switches",
+        ["core_switch_ip"],
+        ["ip_address"],
+    )
+
+    op.add_column(
+        "devices",
+        sa.Column(
+            "mac_digits",
+            sa.String(),
+            sa.Computed("lower(regexp_replace(mac, '[^0-9A-Fa-f]', '', 'g'))", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_devices_mac_digits_trgm",
+        "devices",
+        ["mac_digits"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"mac_digits": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_devices_ip_address_trgm",
+        "devices",
+        ["ip_address"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"ip_address": "gin_trgm_ops"},
+    )
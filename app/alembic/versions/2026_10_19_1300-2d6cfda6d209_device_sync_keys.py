@@ -0,0 +1,39 @@
+"""device sync keys
+
+Revision ID: 2d6cfda6d209
+Revises: c47e3683eff3
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2d6cfda6d209"
+down_revision: Union[str, None] = "c47e3683eff3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Устройство идентифицируется MAC-адресом: оставляем только самую свежую запись.
+    op.execute(
+        """
+        DELETE FROM devices AS stale
+        USING devices AS fresh
+        WHERE stale.mac = fresh.mac
+          AND (stale.update_time, stale.id) < (fresh.update_time, fresh.id)
+        """
+    )
+    op.create_index(op.f("ix_devices_mac"), "devices", ["mac"], unique=True)
+    op.alter_column("devices", "ip_address", existing_type=postgresql.INET(), nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM devices WHERE ip_address IS NULL")
+    op.alter_column("devices", "ip_address", existing_type=postgresql.INET(), nullable=False)
+    op.drop_index(op.f("ix_devices_mac"), table_name="devices")
@@ -0,0 +1,38 @@
+"""switch health
+
+Revision ID: 03dddecfd176
+Revises: 2d6cfda6d209
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "03dddecfd176"
+down_revision: Union[str, None] = "2d6cfda6d209"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "switches",
+        sa.Column("consecutive_failures", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column("switches", sa.Column("last_success", sa.TIMESTAMP(timezone=True), nullable=True))
+    op.add_column("switches", sa.Column("last_failure", sa.TIMESTAMP(timezone=True), nullable=True))
+    op.add_column("switches", sa.Column("last_error", sa.String(), nullable=True))
+    op.add_column("switches", sa.Column("next_poll_at", sa.TIMESTAMP(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("switches", "next_poll_at")
+    op.drop_column("switches", "last_error")
+    op.drop_column("switches", "last_failure")
+    op.drop_column("switches", "last_success")
+    op.drop_column("switches", "consecutive_failures")
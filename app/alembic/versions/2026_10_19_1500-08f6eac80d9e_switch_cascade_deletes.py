@@ -0,0 +1,36 @@
+"""switch cascade deletes
+
+Revision ID: 08f6eac80d9e
+Revises: 03dddecfd176
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "08f6eac80d9e"
+down_revision: Union[str, None] = "03dddecfd176"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FOREIGN_KEYS = (
+    ("switch_excluded_ports_switch_id_fkey", "switch_excluded_ports", "switches", "switch_id"),
+    ("switch_excluded_ports_excluded_port_id_fkey", "switch_excluded_ports", "excluded_ports", "excluded_port_id"),
+    ("devices_switch_id_fkey", "devices", "switches", "switch_id"),
+)
+
+
+def upgrade() -> None:
+    for name, source, referent, column in FOREIGN_KEYS:
+        op.drop_constraint(name, source, type_="foreignkey")
+        op.create_foreign_key(name, source, referent, [column], ["id"], ondelete="CASCADE")
+
+
+def downgrade() -> None:
+    for name, source, referent, column in FOREIGN_KEYS:
+        op.drop_constraint(name, source, type_="foreignkey")
+        op.create_foreign_key(name, source, referent, [column], ["id"])
@@ -0,0 +1,36 @@
+"""switch uplink ports
+
+Revision ID: 5b1e9c7d2a43
+Revises: 08f6eac80d9e
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1e9c7d2a43"
+down_revision: Union[str, None] = "08f6eac80d9e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "switch_uplink_ports",
+        sa.Column("switch_id", sa.Integer(), nullable=False),
+        sa.Column("port", sa.Integer(), nullable=False),
+        sa.Column("reason", sa.String(), nullable=False),
+        sa.Column("mac_count", sa.Integer(), nullable=False),
+        sa.Column("detected_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["switch_id"], ["switches.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("switch_id", "port"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("switch_uplink_ports")
@@ -0,0 +1,33 @@
+"""switch snmp profile
+
+Revision ID: 9c4f1a6e8b27
+Revises: 5b1e9c7d2a43
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c4f1a6e8b27"
+down_revision: Union[str, None] = "5b1e9c7d2a43"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("switches", sa.Column("snmp_max_repetitions", sa.Integer(), nullable=True))
+    op.add_column("switches", sa.Column("snmp_bulk", sa.Boolean(), server_default="true", nullable=False))
+    op.add_column("switches", sa.Column("snmp_rtt", sa.Float(), nullable=True))
+    op.add_column("switches", sa.Column("snmp_sys_object_id", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("switches", "snmp_sys_object_id")
+    op.drop_column("switches", "snmp_rtt")
+    op.drop_column("switches", "snmp_bulk")
+    op.drop_column("switches", "snmp_max_repetitions")
@@ -0,0 +1,72 @@
+"""poll runs
+
+Revision ID: 4d8b2f6a7c15
+Revises: e3a7b5c19d62
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4d8b2f6a7c15"
+down_revision: Union[str, None] = "e3a7b5c19d62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "poll_runs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("started_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("finished_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("switches_attempted", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("switches_succeeded", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("switches_failed", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("varbinds", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("rows_inserted", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("rows_updated", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("rows_deleted", sa.Integer(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_poll_runs_started_at"), "poll_runs", ["started_at"], unique=False)
+    op.create_table(
+        "poll_run_switches",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("run_id", sa.Integer(), nullable=False),
+        sa.Column("switch_id", sa.Integer(), nullable=False),
+        sa.Column("ip_address", postgresql.INET(), nullable=False),
+        sa.Column("succeeded", sa.Boolean(), nullable=False),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("started_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("duration", sa.Float(), nullable=False),
+        sa.Column("walk_seconds", sa.Float(), nullable=False),
+        sa.Column("decode_seconds", sa.Float(), nullable=False),
+        sa.Column("write_seconds", sa.Float(), nullable=False),
+        sa.Column("varbinds", sa.Integer(), nullable=False),
+        sa.Column("rows_inserted", sa.Integer(), nullable=False),
+        sa.Column("rows_updated", sa.Integer(), nullable=False),
+        sa.Column("rows_deleted", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["run_id"], ["poll_runs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["switch_id"], ["switches.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_poll_run_switches_run_id"), "poll_run_switches", ["run_id"], unique=False)
+    op.create_index(op.f("ix_poll_run_switches_switch_id"), "poll_run_switches", ["switch_id"], unique=False)
+    op.create_index(op.f("ix_poll_run_switches_started_at"), "poll_run_switches", ["started_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_poll_run_switches_started_at"), table_name="poll_run_switches")
+    op.drop_index(op.f("ix_poll_run_switches_switch_id"), table_name="poll_run_switches")
+    op.drop_index(op.f("ix_poll_run_switches_run_id"), table_name="poll_run_switches")
+    op.drop_table("poll_run_switches")
+    op.drop_index(op.f("ix_poll_runs_started_at"), table_name="poll_runs")
+    op.drop_table("poll_runs")
@@ -3,6 +3,9 @@ from fastapi import APIRouter
 
 from .core_switches_route import router as core_switch_router
 from .device_route import router as device_router
+from .export_route import router as export_router
+from .job_route import router as job_router
+from .poll_run_route import router as poll_run_router
 from .switch_route import router as switch_router
 
 router = APIRouter(
@@ -11,3 +14,6 @@ router = APIRouter(
 router.include_router(core_switch_router, prefix=settings.api.v1.core_switches)
 router.include_router(switch_router, prefix=settings.api.v1.switches)
 router.include_router(device_router, prefix=settings.api.v1.devices)
+router.include_router(export_router, prefix=settings.api.v1.export)
+router.include_router(job_router, prefix=settings.api.v1.jobs)
+router.include_router(poll_run_router, prefix=settings.api.v1.poll_runs)
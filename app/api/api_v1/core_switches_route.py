@@ -1,25 +1,39 @@
-from typing import List, Sequence
+from typing import List
 
-from core.models import CoreSwitch
+from core.services.compression import dump_json, response_cache
 from core.services.crud.crud_core_sw import CrudCoreSwitch
 from core.services.crud.helpers import get_crud
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
+from pydantic import TypeAdapter
 from schemas.core_switch import CoreSwitchBase, CoreSwitchCreate, CoreSwitchRead, CoreSwitchUpdate
 
 router = APIRouter(tags=["CoreSwitch"])
 
 dep_crud_core_switch = get_crud(CrudCoreSwitch)
 
+core_switches_adapter = TypeAdapter(List[CoreSwitchRead])
+
 
 @router.get("/", response_model=list[CoreSwitchRead])
-async def get_core_switches(crud: CrudCoreSwitch = Depends(dep_crud_core_switch)) -> Sequence[CoreSwitch]:
+async def get_core_switches(request: Request, crud: CrudCoreSwitch = Depends(dep_crud_core_switch)) -> Response:
     """
+    Ответ сжимается по Accept-Encoding и кэшируется до изменения опорных коммутаторов, коммутаторов или устройств.
+
     Returns:
         List[CoreSwitchRead]: Список объектов CoreSwitch -> Switch из базы данных.
         CoreSwitchRead -> if switch -> SwitchRead
     """
-    core_switches = await crud.read()
-    return core_switches
+
+    async def build() -> bytes:
+        return dump_json(core_switches_adapter, await crud.read())
+
+    return await response_cache.response(
+        key=str(request.url.path),
+        entities=("core_switch", "switch", "device"),
+        build=build,
+        accept_encoding=request.headers.get("accept-encoding"),
+        if_none_match=request.headers.get("if-none-match"),
+    )
 
 
 @router.post("/", response_model=bool)
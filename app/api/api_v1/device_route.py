@@ -1,9 +1,22 @@
 from typing import List
 
+from core.services.compression import dump_json, response_cache
 from core.services.crud.crud_device import CrudDevice
 from core.services.crud.helpers import get_crud
-from fastapi import APIRouter, Depends
-from schemas.device import DeviceRead, DeviceUpdate
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter
+from schemas.device import (
+    DeviceLookup,
+    DeviceLookupResult,
+    DeviceRead,
+    DeviceStatsByCoreSwitch,
+    DeviceStatsBySwitch,
+    DeviceStatsByStatus,
+    DeviceStatsByVlan,
+    DeviceStatsSummary,
+    DeviceUpdate,
+)
+from schemas.validation_helper import validation_helper
 
 router = APIRouter(tags=["Device"])
 
@@ -11,15 +24,132 @@ router = APIRouter(tags=["Device"])
 # Зависимость для работы с моделью
 dep_crud_device = get_crud(CrudDevice)
 
+devices_adapter = TypeAdapter(List[DeviceRead])
+
 
 @router.get("/", response_model=List[DeviceRead])
-async def get_devices(crud: CrudDevice = Depends(dep_crud_device)) -> List[DeviceRead]:
+async def get_devices(request: Request, crud: CrudDevice = Depends(dep_crud_device)) -> Response:
     """
+    Ответ сжимается по Accept-Encoding и кэшируется до изменения устройств.
+
     Returns:
         List[DeviceRead]: Список объектов Device из базы данных.
     """
-    devices = await crud.read()
-    return devices
+
+    async def build() -> bytes:
+        return dump_json(devices_adapter, await crud.read())
+
+    return await response_cache.response(
+        key=str(request.url.path),
+        # Удаление коммутатора каскадно удаляет его устройства, публикуется только событие switch.
+        entities=("device", "switch", "core_switch"),
+        build=build,
+        accept_encoding=request.headers.get("accept-encoding"),
+        if_none_match=request.headers.get("if-none-match"),
+    )
+
+
+@router.get("/search", response_model=List[DeviceRead])
+async def search_devices(
+    q: str = Query(..., min_length=3, max_length=64, description="Часть MAC, IP-адреса или номера рабочего места"),
+    limit: int = Query(50, ge=1, le=500),
+    crud: CrudDevice = Depends(dep_crud_device),
+) -> List[DeviceRead]:
+    """
+    Returns:
+        List[DeviceRead]: Найденные устройства, отсортированные по релевантности.
+    """
+    devices = await crud.search(query=q, limit=limit)
+    return [DeviceRead.model_validate(device, from_attributes=True) for device in devices]
+
+
+@router.post("/lookup", response_model=DeviceLookupResult)
+async def lookup_devices(
+    device_lookup: DeviceLookup, crud: CrudDevice = Depends(dep_crud_device)
+) -> DeviceLookupResult:
+    """
+    Пакетный поиск устройств по MAC- и IP-адресам для сверки с внешними системами.
+    Ключи приводятся к каноническому виду и ищутся одним запросом.
+
+    Returns:
+        DeviceLookupResult: Найденные устройства, ключи без совпадений и некорректные ключи.
+    """
+    macs, ips, invalid = validation_helper.split_lookup_keys(device_lookup.keys)
+    devices = await crud.lookup(macs=list(macs), ips=list(ips))
+    not_found = validation_helper.lookup_not_found(macs, ips, devices)
+    return DeviceLookupResult.model_validate(
+        {"devices": devices, "not_found": not_found, "invalid": invalid}, from_attributes=True
+    )
+
+
+@router.get("/subnet", response_model=List[DeviceRead])
+async def get_devices_in_subnet(
+    cidr: str = Query(..., description="Подсеть, например 10.20.0.0/16"),
+    limit: int = Query(1000, ge=1, le=50000),
+    crud: CrudDevice = Depends(dep_crud_device),
+) -> List[DeviceRead]:
+    """
+    Returns:
+        List[DeviceRead]: Устройства, IP-адрес которых входит в подсеть.
+    """
+    try:
+        network = validation_helper.validate_ip_network(network=cidr)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    devices = await crud.read_subnet(network=network, limit=limit)
+    return [DeviceRead.model_validate(device, from_attributes=True) for device in devices]
+
+
+@router.get("/stats/summary", response_model=DeviceStatsSummary)
+async def get_devices_stats_summary(crud: CrudDevice = Depends(dep_crud_device)) -> DeviceStatsSummary:
+    """
+    Returns:
+        DeviceStatsSummary: Сводка по всей сети: устройства, онлайн/офлайн, VLAN, коммутаторы.
+    """
+    summary = await crud.stats_summary()
+    return DeviceStatsSummary.model_validate(summary._asdict())
+
+
+@router.get("/stats/switches", response_model=List[DeviceStatsBySwitch])
+async def get_devices_stats_by_switch(crud: CrudDevice = Depends(dep_crud_device)) -> List[DeviceStatsBySwitch]:
+    """
+    Returns:
+        List[DeviceStatsBySwitch]: Количество устройств на каждом коммутаторе.
+    """
+    rows = await crud.stats_by_switch()
+    return [DeviceStatsBySwitch.model_validate(row._asdict()) for row in rows]
+
+
+@router.get("/stats/vlans", response_model=List[DeviceStatsByVlan])
+async def get_devices_stats_by_vlan(crud: CrudDevice = Depends(dep_crud_device)) -> List[DeviceStatsByVlan]:
+    """
+    Returns:
+        List[DeviceStatsByVlan]: Количество устройств в каждом VLAN.
+    """
+    rows = await crud.stats_by_vlan()
+    return [DeviceStatsByVlan.model_validate(row._asdict()) for row in rows]
+
+
+@router.get("/stats/core_switches", response_model=List[DeviceStatsByCoreSwitch])
+async def get_devices_stats_by_core_switch(
+    crud: CrudDevice = Depends(dep_crud_device),
+) -> List[DeviceStatsByCoreSwitch]:
+    """
+    Returns:
+        List[DeviceStatsByCoreSwitch]: Количество устройств за каждым опорным коммутатором.
+    """
+    rows = await crud.stats_by_core_switch()
+    return [DeviceStatsByCoreSwitch.model_validate(row._asdict()) for row in rows]
+
+
+@router.get("/stats/status", response_model=List[DeviceStatsByStatus])
+async def get_devices_stats_by_status(crud: CrudDevice = Depends(dep_crud_device)) -> List[DeviceStatsByStatus]:
+    """
+    Returns:
+        List[DeviceStatsByStatus]: Количество устройств по статусу.
+    """
+    rows = await crud.stats_by_status()
+    return [DeviceStatsByStatus.model_validate(row._asdict()) for row in rows]
 
 
 @router.put("/", response_model=bool)
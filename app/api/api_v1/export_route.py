@@ -0,0 +1,21 @@
+from core.services.crud.crud_job import CrudJob
+from core.services.crud.helpers import get_crud
+from fastapi import APIRouter, Depends
+from schemas.job import JobCreate, JobRead
+
+router = APIRouter(tags=["Export"])
+
+dep_crud_job = get_crud(CrudJob)
+
+
+@router.post("/snapshot", response_model=JobRead, status_code=202)
+async def export_snapshot(crud: CrudJob = Depends(dep_crud_job)) -> JobRead:
+    """
+    Ставит в очередь задачу snapshot: выгрузка всей топологии не выполняется в запросе и не занимает
+    соединение пула. Архив скачивается через GET /jobs/{job_id}/download после завершения задачи.
+
+    Returns:
+        JobRead: Созданная задача.
+    """
+    job = await crud.create(schema=JobCreate(type="snapshot"))
+    return JobRead.model_validate(job, from_attributes=True)
@@ -0,0 +1,82 @@
+import os
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from core.services.crud.crud_job import SUCCEEDED, CrudJob
+from core.services.crud.helpers import get_crud
+from core.services.jobs import job_queue
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from schemas.job import JobCreate, JobRead
+
+router = APIRouter(tags=["Job"])
+
+dep_crud_job = get_crud(CrudJob)
+
+
+@router.post("/", response_model=JobRead, status_code=202)
+async def create_job(job_create: JobCreate, crud: CrudJob = Depends(dep_crud_job)) -> JobRead:
+    """
+    Ставит задачу в очередь. Выполнение отслеживается через GET /jobs/{job_id}.
+
+    Returns:
+        JobRead: Созданная задача.
+    """
+    if job_create.type not in job_queue.types:
+        raise HTTPException(status_code=422, detail=f"Unknown job type: {job_create.type}")
+    job = await crud.create(schema=job_create)
+    return JobRead.model_validate(job, from_attributes=True)
+
+
+@router.get("/", response_model=List[JobRead])
+async def get_jobs(
+    limit: int = Query(50, ge=1, le=500),
+    status: Optional[str] = Query(None, description="pending, running, succeeded, failed, cancelled"),
+    type: Optional[str] = Query(None, description="Тип задачи"),
+    crud: CrudJob = Depends(dep_crud_job),
+) -> List[JobRead]:
+    """
+    Returns:
+        List[JobRead]: Последние задачи, новые первыми.
+    """
+    jobs = await crud.read_recent(limit=limit, status=status, job_type=type)
+    return [JobRead.model_validate(job, from_attributes=True) for job in jobs]
+
+
+@router.get("/{job_id}", response_model=JobRead)
+async def get_job(job_id: int, crud: CrudJob = Depends(dep_crud_job)) -> JobRead:
+    """
+    Returns:
+        JobRead: Задача с прогрессом и результатом.
+    """
+    job = await crud.read_one(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job: {job_id} not found")
+    return JobRead.model_validate(job, from_attributes=True)
+
+
+@router.post("/{job_id}/cancel", response_model=JobRead)
+async def cancel_job(job_id: int, crud: CrudJob = Depends(dep_crud_job)) -> JobRead:
+    """
+    Отменяет задачу: из очереди - сразу, выполняющуюся - как только воркер получит запрос.
+
+    Returns:
+        JobRead: Задача.
+    """
+    job = await crud.request_cancel(job_id, now=datetime.now(timezone.utc))
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job: {job_id} not found")
+    return JobRead.model_validate(job, from_attributes=True)
+
+
+@router.get("/{job_id}/download", response_class=FileResponse)
+async def download_job_result(job_id: int, crud: CrudJob = Depends(dep_crud_job)) -> FileResponse:
+    """
+    Returns:
+        FileResponse: Файл-результат задачи (например, снимок топологии).
+    """
+    job = await crud.read_one(job_id)
+    path = (job.result or {}).get("path") if job is not None and job.status == SUCCEEDED else None
+    if not path or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"Job: {job_id} has no result file")
+    return FileResponse(path, filename=os.path.basename(path))
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from core.services.crud.crud_poll_run import CrudPollRun
+from core.services.crud.helpers import get_crud
+from fastapi import APIRouter, Depends, HTTPException, Query
+from schemas.poll_run import PollRunDetail, PollRunRead, SlowSwitchRead
+
+router = APIRouter(tags=["PollRun"])
+
+dep_crud_poll_run = get_crud(CrudPollRun)
+
+
+@router.get("/", response_model=List[PollRunRead])
+async def get_poll_runs(
+    limit: int = Query(20, ge=1, le=500),
+    kind: Optional[str] = Query(None, description="sweep или on_demand"),
+    crud: CrudPollRun = Depends(dep_crud_poll_run),
+) -> List[PollRunRead]:
+    """
+    Returns:
+        List[PollRunRead]: Последние опросы с итогами, новые первыми.
+    """
+    runs = await crud.read_recent(limit=limit, kind=kind)
+    return [PollRunRead.model_validate(run, from_attributes=True) for run in runs]
+
+
+@router.get("/slowest_switches", response_model=List[SlowSwitchRead])
+async def get_slowest_switches(
+    hours: int = Query(24, ge=1, le=24 * 90, description="Период, в часах"),
+    limit: int = Query(20, ge=1, le=500),
+    crud: CrudPollRun = Depends(dep_crud_poll_run),
+) -> List[SlowSwitchRead]:
+    """
+    Returns:
+        List[SlowSwitchRead]: Коммутаторы с наибольшей средней длительностью опроса за период
+            и среднее время по этапам (обход SNMP, декодирование, запись в БД).
+    """
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    rows = await crud.slowest_switches(since=since, limit=limit)
+    return [SlowSwitchRead.model_validate(row, from_attributes=True) for row in rows]
+
+
+@router.get("/{run_id}", response_model=PollRunDetail)
+async def get_poll_run(run_id: int, crud: CrudPollRun = Depends(dep_crud_poll_run)) -> PollRunDetail:
+    """
+    Returns:
+        PollRunDetail: Опрос с показателями по каждому коммутатору.
+    """
+    run = await crud.read_one(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"PollRun: {run_id} not found")
+    return PollRunDetail.model_validate(run, from_attributes=True)
@@ -1,25 +1,48 @@
+from datetime import timedelta
 from typing import List
 
+from core.config import settings
+from core.services.compression import dump_json, response_cache
+from core.services.crud.crud_device import CrudDevice
 from core.services.crud.crud_switch import CrudSwitch
 from core.services.crud.helpers import get_crud
-from fastapi import APIRouter, Depends
+from core.services.poller import poller
+from core.services.snmp import SnmpError
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic import TypeAdapter
+from schemas.device import DeviceRead
 from schemas.switch import SwitchCreate, SwitchIpAddress, SwitchRead, SwitchUpdate
+from schemas.validation_helper import validation_helper
 
 router = APIRouter(tags=["Switch"])
 
 
 # Зависимость для работы с моделью Switch.
 dep_crud_switch = get_crud(CrudSwitch)
+dep_crud_device = get_crud(CrudDevice)
+
+switches_adapter = TypeAdapter(List[SwitchRead])
 
 
 @router.get("/", response_model=List[SwitchRead])
-async def get_switches(crud: CrudSwitch = Depends(dep_crud_switch)) -> List[SwitchRead]:
+async def get_switches(request: Request, crud: CrudSwitch = Depends(dep_crud_switch)) -> Response:
     """
+    Ответ сжимается по Accept-Encoding и кэшируется до изменения коммутаторов или устройств.
+
     Returns:
         List[SwitchRead]: Список объектов Switch из базы данных.
     """
-    switches = await crud.read()
-    return switches
+
+    async def build() -> bytes:
+        return dump_json(switches_adapter, await crud.read())
+
+    return await response_cache.response(
+        key=str(request.url.path),
+        entities=("switch", "device"),
+        build=build,
+        accept_encoding=request.headers.get("accept-encoding"),
+        if_none_match=request.headers.get("if-none-match"),
+    )
 
 
 @router.post("/", response_model=bool)
@@ -32,6 +55,31 @@ async def create_switch(switch_create: SwitchCreate, crud: CrudSwitch = Depends(
     return is_new_core_switch
 
 
+@router.post("/{ip_address}/poll", response_model=List[DeviceRead])
+async def poll_switch(ip_address: str, crud: CrudDevice = Depends(dep_crud_device)) -> List[DeviceRead]:
+    """
+    Опрашивает коммутатор по SNMP. Одновременные запросы по одному коммутатору объединяются в один опрос,
+    данные моложе settings.poller.on_demand_max_age отдаются без опроса.
+
+    Returns:
+        List[DeviceRead]: Устройства коммутатора после опроса.
+    """
+    try:
+        ip_address = validation_helper.validate_ip_address(ip=ip_address)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    try:
+        switch = await poller.poll_on_demand(ip_address, max_age=timedelta(seconds=settings.poller.on_demand_max_age))
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except SnmpError as exc:
+        raise HTTPException(status_code=504, detail=str(exc))
+
+    devices = await crud.read_by_switch(switch.id)
+    return [DeviceRead.model_validate(device, from_attributes=True) for device in devices]
+
+
 @router.put("/", response_model=bool)
 async def update_switch(switch_update: SwitchUpdate, crud: CrudSwitch = Depends(dep_crud_switch)) -> SwitchRead:
     """
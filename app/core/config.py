@@ -1,3 +1,7 @@
+import os
+import tempfile
+from typing import Dict, List
+
 from pydantic import BaseModel, PostgresDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -20,6 +24,9 @@ class ApiV1Prefix(BaseModel):
     core_switches: str = "/core_switches"
     switches: str = "/switches"
     devices: str = "/devices"
+    export: str = "/export"
+    jobs: str = "/jobs"
+    poll_runs: str = "/poll_runs"
 
 
 class ApiPrefix(BaseModel):
@@ -62,6 +69,11 @@ class DataBaseConfig(BaseModel):
     def url(self) -> PostgresDsn:
         return f"postgresql+asyncpg://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
 
+    @property
+    def dsn(self) -> str:
+        """DSN для прямого подключения через asyncpg (без драйвера SQLAlchemy в схеме)."""
+        return f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
+
 
 class SnmpConfig(BaseModel):
     """
@@ -73,6 +85,14 @@ class SnmpConfig(BaseModel):
         auth_key (str): Ключ аутентификации для SNMPv3.
         priv_key (str): Ключ для шифрования данных (privacy key).
         community (str): Сообщество для SNMP (если используется SNMPv2c).
+        version (int): Версия протокола: 2 (SNMPv2c) или 3 (по умолчанию 3).
+        auth_protocol (str): Протокол аутентификации SNMPv3: md5, sha, sha256, sha512 (по умолчанию sha).
+        priv_protocol (str): Протокол шифрования SNMPv3: des, aes, aes256 (по умолчанию aes).
+        timeout (float): Таймаут ответа агента, в секундах.
+        retries (int): Количество повторов запроса.
+        sockets (int): Количество UDP-сокетов, через которые мультиплексируются запросы ко всем агентам.
+        min_repetitions (int): Нижняя граница max-repetitions при подстройке GETBULK под агент.
+        max_repetitions (int): Верхняя граница max-repetitions при подстройке GETBULK под агент.
     """
 
     port: str
@@ -80,6 +100,163 @@ class SnmpConfig(BaseModel):
     auth_key: str
     priv_key: str
     community: str
+    version: int = 3
+    auth_protocol: str = "sha"
+    priv_protocol: str = "aes"
+    timeout: float = 2.0
+    retries: int = 2
+    sockets: int = 4
+    min_repetitions: int = 5
+    max_repetitions: int = 100
+
+
+class PollerConfig(BaseModel):
+    """
+    Конфигурация периодического опроса коммутаторов.
+
+    Attributes:
+        enabled (bool): Запускать опрос в фоне при старте приложения (по умолчанию False).
+        interval (int): Интервал между обходами сети, в секундах.
+        concurrency (int): Максимальное количество одновременно опрашиваемых коммутаторов.
+        core_concurrency (int): Максимальное количество опорных коммутаторов, ARP-таблицы которых держатся в памяти.
+        batch_size (int): Размер пачки устройств при записи в БД; определяет пиковое потребление памяти опросом.
+        max_repetitions (int): Начальное значение max-repetitions для GETBULK, далее подстраивается под коммутатор.
+        device_retention_days (int): Через сколько дней отсутствия в таблице MAC-адресов устройство удаляется.
+        failure_threshold (int): После скольких неудачных опросов подряд коммутатор опрашивается с задержкой.
+        backoff_base (int): Начальная задержка повторного опроса недоступного коммутатора, в секундах.
+        backoff_max (int): Максимальная задержка повторного опроса, в секундах.
+        on_demand_max_age (int): Опрос по запросу не выполняется, если последний успешный опрос коммутатора
+        моложе этого значения, в секундах.
+        uplink_mac_threshold (int): Порт, на котором видно больше MAC-адресов, считается uplink/trunk
+        и исключается автоматически (0 - не проверять).
+        uplink_lldp (bool): Исключать порты, за которыми LLDP видит коммутатор или маршрутизатор.
+        journal_retention_days (int): Срок хранения журнала опросов, в днях.
+        decode_processes (int): Количество процессов для декодирования таблиц MAC-адресов
+        (0 - декодирование в event loop).
+    """
+
+    enabled: bool = False
+    interval: int = 300
+    concurrency: int = 50
+    core_concurrency: int = 4
+    batch_size: int = 1000
+    max_repetitions: int = 25
+    device_retention_days: int = 30
+    failure_threshold: int = 3
+    backoff_base: int = 300
+    backoff_max: int = 6 * 3600
+    on_demand_max_age: int = 60
+    uplink_mac_threshold: int = 32
+    uplink_lldp: bool = True
+    journal_retention_days: int = 14
+    decode_processes: int = 0
+
+
+class DiscoveryConfig(BaseModel):
+    """
+    Конфигурация обнаружения коммутаторов по LLDP.
+
+    Attributes:
+        concurrency (int): Максимальное количество одновременно опрашиваемых коммутаторов.
+        max_depth (int): Максимальная глубина обхода от опорного коммутатора.
+        max_switches (int): Максимальное количество адресов в одном обходе.
+        retries (int): Количество повторов SNMP-запросов (недоступные соседи не должны задерживать обход).
+        update_core_switch (bool): Менять опорный коммутатор уже существующих коммутаторов на найденный обходом;
+            по умолчанию обход только добавляет новые коммутаторы.
+    """
+
+    concurrency: int = 32
+    max_depth: int = 16
+    max_switches: int = 5000
+    retries: int = 1
+    update_core_switch: bool = False
+
+
+class NotifyConfig(BaseModel):
+    """
+    Конфигурация уведомлений об изменениях между воркерами через PostgreSQL LISTEN/NOTIFY.
+
+    Attributes:
+        enabled (bool): Публиковать и слушать уведомления (по умолчанию True).
+        channel (str): Имя канала NOTIFY.
+        reconnect_delay (float): Пауза перед переподключением LISTEN-соединения, в секундах.
+        keepalive_interval (float): Интервал проверки LISTEN-соединения запросом SELECT 1, в секундах.
+        keepalive_timeout (float): Время ожидания ответа на проверку, после которого соединение
+        считается потерянным, в секундах.
+    """
+
+    enabled: bool = True
+    channel: str = "net_view_changes"
+    reconnect_delay: float = 5.0
+    keepalive_interval: float = 30.0
+    keepalive_timeout: float = 10.0
+
+
+class ExportConfig(BaseModel):
+    """
+    Конфигурация выгрузки снимка топологии.
+
+    Attributes:
+        batch_size (int): Количество строк, читаемых из БД и записываемых в одну группу строк Parquet.
+        compression (str): Кодек сжатия Parquet (zstd, snappy, gzip, none).
+    """
+
+    batch_size: int = 50_000
+    compression: str = "zstd"
+
+
+class CompressionConfig(BaseModel):
+    """
+    Конфигурация сжатия больших JSON-ответов.
+
+    Attributes:
+        minimum_size (int): Ответы меньше этого размера, в байтах, не сжимаются.
+        gzip_level (int): Уровень сжатия gzip (1-9).
+        brotli_quality (int): Качество сжатия brotli (0-11).
+        max_entries (int): Количество закэшированных ответов.
+    """
+
+    minimum_size: int = 1024
+    gzip_level: int = 6
+    brotli_quality: int = 5
+    max_entries: int = 64
+
+
+class JobsConfig(BaseModel):
+    """
+    Конфигурация очереди фоновых задач.
+
+    Attributes:
+        enabled (bool): Запускать воркер очереди при старте приложения (по умолчанию True).
+        poll_interval (float): Интервал проверки очереди без уведомлений, в секундах.
+        heartbeat_interval (float): Интервал heartbeat выполняющихся задач, в секундах.
+        stale_after (float): Задача без heartbeat дольше этого времени считается потерянной, в секундах.
+        retention_days (int): Через сколько дней завершённые задачи и их файлы удаляются.
+        directory (str): Каталог для файлов-результатов задач (снимки топологии).
+        concurrency (Dict[str, int]): Максимальное количество одновременно выполняемых задач по типам.
+        default_concurrency (int): Ограничение для типов, не указанных в concurrency.
+    """
+
+    enabled: bool = True
+    poll_interval: float = 5.0
+    heartbeat_interval: float = 15.0
+    stale_after: float = 120.0
+    retention_days: int = 7
+    directory: str = os.path.join(tempfile.gettempdir(), "net-view-jobs")
+    concurrency: Dict[str, int] = {"sweep": 1, "poll_switch": 8, "snapshot": 1, "discover": 1}
+    default_concurrency: int = 1
+
+
+class OuiConfig(BaseModel):
+    """
+    Конфигурация определения производителя устройства по MAC-адресу.
+
+    Attributes:
+        paths (List[str]): CSV-файлы реестра IEEE (MA-L oui.csv, MA-M mam.csv, MA-S oui36.csv).
+            Пустой список - производитель не определяется; отсутствующий файл - ошибка при старте.
+    """
+
+    paths: List[str] = []
 
 
 class Setting(BaseSettings):
@@ -91,6 +268,13 @@ class Setting(BaseSettings):
         api (ApiPrefix): Конфигурация префикса для API маршрутов.
         db (DataBaseConfig): Конфигурация для подключения к базе данных.
         snmp (SnmpConfig): Конфигурация для SNMP подключения.
+        poller (PollerConfig): Конфигурация периодического опроса коммутаторов.
+        discovery (DiscoveryConfig): Конфигурация обнаружения коммутаторов по LLDP.
+        notify (NotifyConfig): Конфигурация межпроцессных уведомлений об изменениях.
+        export (ExportConfig): Конфигурация выгрузки снимка топологии.
+        compression (CompressionConfig): Конфигурация сжатия ответов.
+        jobs (JobsConfig): Конфигурация очереди фоновых задач.
+        oui (OuiConfig): Конфигурация реестра производителей.
         api_key (str): API ключ для авторизации.
     """
 
@@ -104,6 +288,13 @@ class Setting(BaseSettings):
     api: ApiPrefix = ApiPrefix()
     db: DataBaseConfig
     snmp: SnmpConfig
+    poller: PollerConfig = PollerConfig()
+    discovery: DiscoveryConfig = DiscoveryConfig()
+    notify: NotifyConfig = NotifyConfig()
+    export: ExportConfig = ExportConfig()
+    compression: CompressionConfig = CompressionConfig()
+    jobs: JobsConfig = JobsConfig()
+    oui: OuiConfig = OuiConfig()
     api_key: str
 
 
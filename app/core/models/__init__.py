@@ -4,10 +4,26 @@ __all__ = (
     "CoreSwitch",
     "Switch",
     "Device",
+    "DeviceSummary",
+    "Job",
+    "PollRun",
+    "PollRunSwitch",
     "ExcludedPort",
     "SwitchExcludedPort",
+    "SwitchUplinkPort",
 )
 
 from .base import Base
 from .db_helper import db_helper
-from .models import CoreSwitch, Device, ExcludedPort, Switch, SwitchExcludedPort
+from .models import (
+    CoreSwitch,
+    Device,
+    DeviceSummary,
+    ExcludedPort,
+    Job,
+    PollRun,
+    PollRunSwitch,
+    Switch,
+    SwitchExcludedPort,
+    SwitchUplinkPort,
+)
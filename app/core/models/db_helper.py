@@ -36,6 +36,9 @@ class DataBaseHelper:
             echo_pool=echo_pool,
             pool_size=pool_size,
             max_overflow=max_overflow,
+            # asyncpg по умолчанию возвращает inet/cidr как объекты ipaddress; схемы, SNMP-клиенты и выгрузка
+            # работают со строками, поэтому адреса читаются в текстовом виде PostgreSQL.
+            native_inet_types=False,
         )
         self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
             bind=self.engine,
@@ -1,8 +1,9 @@
 from datetime import datetime
-from typing import List
+from typing import Any, Dict, List
 
 from core.models.base import Base
-from sqlalchemy import TIMESTAMP, ForeignKey
+from sqlalchemy import TIMESTAMP, Computed, Float, ForeignKey, Index, func
+from sqlalchemy.dialects.postgresql import INET, JSONB, MACADDR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
@@ -19,7 +20,7 @@ class CoreSwitch(Base):
     __tablename__ = "core_switches"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    ip_address: Mapped[str] = mapped_column(unique=True, index=True)
+    ip_address: Mapped[str] = mapped_column(INET, unique=True, index=True)
     name: Mapped[str] = mapped_column(unique=True, index=True, nullable=True)
     snmp_oid: Mapped[str] = mapped_column(default="1.3.6.1.2.1.4.22.1.2")
 
@@ -33,23 +34,47 @@ class Switch(Base):
     Attributes:
         ip_address (str): IP-адрес коммутатора.
         snmp_oid (str): Идентификатор SNMP-агента.
+        snmp_max_repetitions (int): Подобранное опросом значение max-repetitions для GETBULK.
+        snmp_bulk (bool): Коммутатор поддерживает GETBULK.
+        snmp_rtt (float): Среднее время ответа SNMP-агента, в секундах.
+        snmp_sys_object_id (str): sysObjectID агента (модель/производитель).
         core_switch_ip (str): IP опорного коммутатора, к которому принадлежит данный коммутатор.
         core_switch (CoreSwitch): Связанный опорный коммутатор, к которому принадлежит этот коммутатор.
         devices (List[Device]): Список устройств, подключенных к этому коммутатору.
         excluded_ports_relation (List[SwitchExcludedPort]): Список исключенных портов, связанных с данным коммутатором.
+        uplink_ports (List[SwitchUplinkPort]): Порты, автоматически определённые опросом как uplink/trunk.
+        consecutive_failures (int): Количество неудачных опросов подряд.
+        last_success (datetime): Время последнего успешного опроса.
+        last_failure (datetime): Время последнего неудачного опроса.
+        last_error (str): Текст последней ошибки опроса.
+        next_poll_at (datetime): Не опрашивать до этого времени (экспоненциальная задержка для недоступных).
     """
 
     __tablename__ = "switches"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    ip_address: Mapped[str] = mapped_column(unique=True, index=True)
+    ip_address: Mapped[str] = mapped_column(INET, unique=True, index=True)
     comment: Mapped[str] = mapped_column(nullable=True)
     snmp_oid: Mapped[str] = mapped_column(default="1.3.6.1.2.1.17.7.1.2.2.1.2")
-    core_switch_ip: Mapped[str] = mapped_column(ForeignKey("core_switches.ip_address"))
+    snmp_max_repetitions: Mapped[int] = mapped_column(nullable=True)
+    snmp_bulk: Mapped[bool] = mapped_column(default=True, server_default="true")
+    snmp_rtt: Mapped[float] = mapped_column(Float, nullable=True)
+    snmp_sys_object_id: Mapped[str] = mapped_column(nullable=True)
+    core_switch_ip: Mapped[str] = mapped_column(INET, ForeignKey("core_switches.ip_address"))
+    consecutive_failures: Mapped[int] = mapped_column(default=0, server_default="0")
+    last_success: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    last_failure: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    last_error: Mapped[str] = mapped_column(nullable=True)
+    next_poll_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
     core_switch = relationship("CoreSwitch", back_populates="switches", lazy="selectin")
-    devices: Mapped[List["Device"]] = relationship("Device", back_populates="switch", lazy="selectin")
+    devices: Mapped[List["Device"]] = relationship(
+        "Device", back_populates="switch", lazy="selectin", passive_deletes=True
+    )
     excluded_ports_relation: Mapped[List["SwitchExcludedPort"]] = relationship(
-        "SwitchExcludedPort", back_populates="switch", lazy="selectin"
+        "SwitchExcludedPort", back_populates="switch", lazy="selectin", passive_deletes=True
+    )
+    uplink_ports: Mapped[List["SwitchUplinkPort"]] = relationship(
+        "SwitchUplinkPort", back_populates="switch", lazy="selectin", passive_deletes=True
     )
 
 
@@ -84,13 +109,40 @@ class SwitchExcludedPort(Base):
 
     __tablename__ = "switch_excluded_ports"
 
-    switch_id: Mapped[int] = mapped_column(ForeignKey("switches.id"), primary_key=True)
-    excluded_port_id: Mapped[int] = mapped_column(ForeignKey("excluded_ports.id"), primary_key=True)
+    switch_id: Mapped[int] = mapped_column(ForeignKey("switches.id", ondelete="CASCADE"), primary_key=True)
+    excluded_port_id: Mapped[int] = mapped_column(
+        ForeignKey("excluded_ports.id", ondelete="CASCADE"), primary_key=True
+    )
 
     switch: Mapped["Switch"] = relationship("Switch", back_populates="excluded_ports_relation", lazy="selectin")
     excluded_port: Mapped["ExcludedPort"] = relationship("ExcludedPort", back_populates="switches", lazy="selectin")
 
 
+class SwitchUplinkPort(Base):
+    """
+    Порт коммутатора, автоматически определённый при опросе как uplink/trunk. Хранится отдельно от исключенных
+    вручную портов (SwitchExcludedPort) и пересчитывается при каждом опросе; устройства на таких портах
+    не записываются.
+
+    Attributes:
+        switch_id (int): ID коммутатора.
+        port (int): Номер порта моста.
+        reason (str): Признак, по которому порт определён как uplink: lldp, switch_mac или mac_count.
+        mac_count (int): Количество различных MAC-адресов на порту в последнем опросе, не больше порога + 1.
+        detected_at (datetime): Время опроса, в котором порт был определён как uplink.
+    """
+
+    __tablename__ = "switch_uplink_ports"
+
+    switch_id: Mapped[int] = mapped_column(ForeignKey("switches.id", ondelete="CASCADE"), primary_key=True)
+    port: Mapped[int] = mapped_column(primary_key=True)
+    reason: Mapped[str] = mapped_column()
+    mac_count: Mapped[int] = mapped_column()
+    detected_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
+
+    switch: Mapped["Switch"] = relationship("Switch", back_populates="uplink_ports", lazy="selectin")
+
+
 class Device(Base):
     """
     Модель для устройства.
@@ -99,24 +151,191 @@ class Device(Base):
         workplace_number: Номер рабочего места.(по умолчанию null)
         port (int): Номер порта, к которому подключено устройство.
         mac (str): MAC-адрес устройства.
+        mac_digits (str): MAC-адрес без разделителей в нижнем регистре, для поиска по подстроке.
         vlan (int): Идентификатор VLAN, к которому принадлежит устройство.
-        ip_address (str): IP-адрес устройства.
-        status (bool): Статус устройства (включено/выключено).
+        ip_address (str): IP-адрес устройства из ARP-таблицы опорного коммутатора (null, если не найден).
+        status (bool): Статус устройства: порт в состоянии up и MAC-адрес виден в последнем опросе.
         update_time (datetime): Время последнего обновления данных об устройстве.
         switch_id (int): Идентификатор коммутатора, к которому подключено устройство.
         switch (Switch): Связанный коммутатор, к которому принадлежит это устройство.
     """
 
     __tablename__ = "devices"
+    __table_args__ = (
+        Index(
+            "ix_devices_mac_digits_trgm",
+            "mac_digits",
+            postgresql_using="gin",
+            postgresql_ops={"mac_digits": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_devices_ip_address_gist",
+            "ip_address",
+            postgresql_using="gist",
+            postgresql_ops={"ip_address": "inet_ops"},
+        ),
+        Index(
+            "ix_devices_workplace_number_trgm",
+            "workplace_number",
+            postgresql_using="gin",
+            postgresql_ops={"workplace_number": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     workplace_number: Mapped[str] = mapped_column(unique=True, nullable=True)
     port: Mapped[int] = mapped_column()
-    mac: Mapped[str] = mapped_column()
+    mac: Mapped[str] = mapped_column(MACADDR, unique=True, index=True)
+    mac_digits: Mapped[str] = mapped_column(Computed("replace(mac::text, ':', '')", persisted=True))
     vlan: Mapped[int] = mapped_column()
-    ip_address: Mapped[str] = mapped_column()
+    ip_address: Mapped[str] = mapped_column(INET, nullable=True)
     status: Mapped[bool] = mapped_column(default=False)
     update_time: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
 
-    switch_id: Mapped[int] = mapped_column(ForeignKey("switches.id"))
+    switch_id: Mapped[int] = mapped_column(ForeignKey("switches.id", ondelete="CASCADE"), index=True)
     switch: Mapped["Switch"] = relationship("Switch", back_populates="devices", lazy="selectin")
+
+
+# Поиск по подстроке IP-адреса идёт по текстовому представлению inet без префикса.
+Index(
+    "ix_devices_ip_address_trgm",
+    func.host(Device.ip_address).label("ip_host"),
+    postgresql_using="gin",
+    postgresql_ops={"ip_host": "gin_trgm_ops"},
+)
+
+
+class DeviceSummary(Base):
+    """
+    Агрегированное количество устройств по коммутатору, VLAN и статусу.
+    Обновляется инкрементально при синхронизации устройств коммутатора (CrudDevice.refresh_summary).
+
+    Attributes:
+        switch_id (int): Идентификатор коммутатора.
+        vlan (int): Идентификатор VLAN.
+        status (bool): Статус устройств.
+        device_count (int): Количество устройств.
+    """
+
+    __tablename__ = "device_summaries"
+
+    switch_id: Mapped[int] = mapped_column(ForeignKey("switches.id", ondelete="CASCADE"), primary_key=True)
+    vlan: Mapped[int] = mapped_column(primary_key=True)
+    status: Mapped[bool] = mapped_column(primary_key=True)
+    device_count: Mapped[int] = mapped_column()
+
+
+class Job(Base):
+    """
+    Фоновая задача (полный опрос, выгрузка снимка ...), выполняемая очередью задач вне обработчиков запросов.
+
+    Attributes:
+        type (str): Тип задачи.
+        status (str): Состояние: pending, running, succeeded, failed, cancelled.
+        params (Dict[str, Any]): Параметры задачи.
+        result (Dict[str, Any]): Результат выполнения.
+        error (str): Текст ошибки.
+        progress (float): Доля выполнения от 0 до 1.
+        message (str): Описание текущего этапа.
+        cancel_requested (bool): Запрошена отмена.
+        created_at (datetime): Время постановки в очередь.
+        started_at (datetime): Время начала выполнения.
+        finished_at (datetime): Время завершения.
+        heartbeat_at (datetime): Последний сигнал воркера, выполняющего задачу.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_status_created_at", "status", "created_at"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    type: Mapped[str] = mapped_column()
+    status: Mapped[str] = mapped_column(default="pending", server_default="pending")
+    params: Mapped[Dict[str, Any]] = mapped_column(JSONB, default=dict, server_default="{}")
+    result: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=True)
+    error: Mapped[str] = mapped_column(nullable=True)
+    progress: Mapped[float] = mapped_column(Float, default=0.0, server_default="0")
+    message: Mapped[str] = mapped_column(nullable=True)
+    cancel_requested: Mapped[bool] = mapped_column(default=False, server_default="false")
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now())
+    started_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    finished_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    heartbeat_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+
+
+class PollRun(Base):
+    """
+    Журнал запусков опроса (полный обход или опрос по запросу).
+
+    Attributes:
+        kind (str): Тип запуска: sweep или on_demand.
+        started_at (datetime): Время начала.
+        finished_at (datetime): Время завершения.
+        switches_attempted (int): Количество опрошенных коммутаторов (без пропущенных circuit breaker).
+        switches_succeeded (int): Количество успешно опрошенных коммутаторов.
+        switches_failed (int): Количество коммутаторов с ошибкой опроса.
+        varbinds (int): Количество полученных значений таблиц MAC-адресов.
+        rows_inserted (int): Количество добавленных устройств.
+        rows_updated (int): Количество обновлённых устройств.
+        rows_deleted (int): Количество удалённых устройств.
+        switches (List[PollRunSwitch]): Опросы коммутаторов в этом запуске.
+    """
+
+    __tablename__ = "poll_runs"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column()
+    started_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), index=True)
+    finished_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    switches_attempted: Mapped[int] = mapped_column(default=0, server_default="0")
+    switches_succeeded: Mapped[int] = mapped_column(default=0, server_default="0")
+    switches_failed: Mapped[int] = mapped_column(default=0, server_default="0")
+    varbinds: Mapped[int] = mapped_column(default=0, server_default="0")
+    rows_inserted: Mapped[int] = mapped_column(default=0, server_default="0")
+    rows_updated: Mapped[int] = mapped_column(default=0, server_default="0")
+    rows_deleted: Mapped[int] = mapped_column(default=0, server_default="0")
+
+    switches: Mapped[List["PollRunSwitch"]] = relationship(
+        "PollRunSwitch", back_populates="run", lazy="noload", passive_deletes=True
+    )
+
+
+class PollRunSwitch(Base):
+    """
+    Опрос одного коммутатора в запуске опроса с разбивкой времени по этапам.
+
+    Attributes:
+        run_id (int): ID запуска опроса.
+        switch_id (int): ID коммутатора.
+        ip_address (str): IP-адрес коммутатора на момент опроса.
+        succeeded (bool): Опрос завершился успешно.
+        error (str): Текст ошибки опроса.
+        started_at (datetime): Время начала опроса коммутатора.
+        duration (float): Общая длительность, в секундах.
+        walk_seconds (float): Время обхода SNMP-таблиц (сеть и агент).
+        decode_seconds (float): Время декодирования, фильтрации и сопоставления с ARP.
+        write_seconds (float): Время записи в БД.
+        varbinds (int): Количество полученных значений таблицы MAC-адресов.
+        rows_inserted (int): Количество добавленных устройств.
+        rows_updated (int): Количество обновлённых устройств.
+        rows_deleted (int): Количество удалённых устройств.
+    """
+
+    __tablename__ = "poll_run_switches"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    run_id: Mapped[int] = mapped_column(ForeignKey("poll_runs.id", ondelete="CASCADE"), index=True)
+    switch_id: Mapped[int] = mapped_column(ForeignKey("switches.id", ondelete="CASCADE"), index=True)
+    ip_address: Mapped[str] = mapped_column(INET)
+    succeeded: Mapped[bool] = mapped_column()
+    error: Mapped[str] = mapped_column(nullable=True)
+    started_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), index=True)
+    duration: Mapped[float] = mapped_column(Float)
+    walk_seconds: Mapped[float] = mapped_column(Float, default=0.0)
+    decode_seconds: Mapped[float] = mapped_column(Float, default=0.0)
+    write_seconds: Mapped[float] = mapped_column(Float, default=0.0)
+    varbinds: Mapped[int] = mapped_column(default=0)
+    rows_inserted: Mapped[int] = mapped_column(default=0)
+    rows_updated: Mapped[int] = mapped_column(default=0)
+    rows_deleted: Mapped[int] = mapped_column(default=0)
+
+    run: Mapped["PollRun"] = relationship("PollRun", back_populates="switches", lazy="noload")
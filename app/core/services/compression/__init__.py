@@ -0,0 +1,8 @@
+__all__ = (
+    "ResponseCache",
+    "dump_json",
+    "negotiate_encoding",
+    "response_cache",
+)
+
+from .cache import ResponseCache, dump_json, negotiate_encoding, response_cache
@@ -0,0 +1,178 @@
+import asyncio
+import gzip
+import hashlib
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+import brotli
+from core.config import settings
+from core.services.notify.notifier import ALL_ENTITIES, RESYNC_ACTION, ChangeEvent, ChangeListener
+from fastapi import Response
+from pydantic import TypeAdapter
+
+IDENTITY = "identity"
+GZIP = "gzip"
+BROTLI = "br"
+
+# Порядок предпочтения при одинаковом q: brotli сжимает JSON заметно лучше gzip.
+PREFERRED_ENCODINGS = (BROTLI, GZIP)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> str:
+    """
+    Выбирает кодировку ответа по заголовку Accept-Encoding (с учётом q-значений).
+
+    Returns:
+        str: br, gzip или identity.
+    """
+    weights: Dict[str, float] = {}
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    best, best_q = IDENTITY, 0.0
+    for encoding in PREFERRED_ENCODINGS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def dump_json(adapter: TypeAdapter, value: Any) -> bytes:
+    """
+    Сериализует ORM-объекты в JSON по схеме ответа так же, как FastAPI делает это для response_model.
+    """
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+
+@dataclass
+class CachedPayload:
+    """
+    Сериализованный ответ и его сжатые варианты.
+
+    Attributes:
+        version (Tuple[int, ...]): Версия данных, из которых построен ответ.
+        etag (str): ETag ответа.
+        encodings (Dict[str, bytes]): Кодировка -> тело ответа.
+    """
+
+    version: Tuple[int, ...]
+    etag: str
+    encodings: Dict[str, bytes] = field(default_factory=dict)
+
+
+class ResponseCache:
+    """
+    Кэш больших JSON-ответов со сжатием gzip/brotli по Accept-Encoding.
+
+    Ответ сериализуется и сжимается один раз на версию данных. Версия - счётчики изменений сущностей,
+    от которых зависит ответ; счётчики увеличиваются по уведомлениям ChangeListener (в том числе
+    от других воркеров), после переподключения LISTEN сбрасываются все ответы. Пока кэш не подключён
+    к ChangeListener (уведомления выключены), ответы только сжимаются, без кэширования.
+
+    Params:
+        minimum_size (int): Ответы меньше этого размера не сжимаются.
+        gzip_level (int): Уровень сжатия gzip.
+        brotli_quality (int): Качество сжатия brotli.
+        max_entries (int): Количество закэшированных ответов.
+    """
+
+    def __init__(self, minimum_size: int, gzip_level: int, brotli_quality: int, max_entries: int) -> None:
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.max_entries = max_entries
+        self.active = False
+        self._generation = 0
+        self._versions: Dict[str, int] = defaultdict(int)
+        self._entries: "OrderedDict[str, CachedPayload]" = OrderedDict()
+
+    def attach(self, listener: ChangeListener) -> None:
+        listener.subscribe(ALL_ENTITIES, self.on_change)
+        self.active = True
+
+    def on_change(self, event: ChangeEvent) -> None:
+        if event.action == RESYNC_ACTION:
+            self._generation += 1
+            self._entries.clear()
+        else:
+            self._versions[event.entity] += 1
+
+    def version(self, entities: Iterable[str]) -> Tuple[int, ...]:
+        return (self._generation, *(self._versions[entity] for entity in entities))
+
+    async def response(
+        self,
+        key: str,
+        entities: Iterable[str],
+        build: Callable[[], Awaitable[bytes]],
+        accept_encoding: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> Response:
+        """
+        JSON-ответ из кэша или построенный build.
+
+        Args:
+            key (str): Ключ ответа (путь и параметры запроса).
+            entities (Iterable[str]): Сущности, от изменений которых зависит ответ.
+            build (Callable[[], Awaitable[bytes]]): Построение тела ответа в JSON.
+            accept_encoding (Optional[str]): Заголовок Accept-Encoding запроса.
+            if_none_match (Optional[str]): Заголовок If-None-Match запроса.
+
+        Returns:
+            Response: Ответ (304, если If-None-Match совпадает с ETag).
+        """
+        # Версия берётся до чтения данных: изменение во время построения ответа даст новую версию.
+        version = self.version(entities)
+        entry = self._entries.get(key) if self.active else None
+        if entry is None or entry.version != version:
+            body = await build()
+            entry = CachedPayload(version=version, etag=f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"')
+            entry.encodings[IDENTITY] = body
+            if self.active:
+                self._entries[key] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        elif self.active:
+            self._entries.move_to_end(key)
+
+        headers = {"ETag": entry.etag, "Vary": "Accept-Encoding"}
+        if if_none_match and entry.etag in (tag.strip() for tag in if_none_match.split(",")):
+            return Response(status_code=304, headers=headers)
+
+        encoding = IDENTITY
+        if len(entry.encodings[IDENTITY]) >= self.minimum_size:
+            encoding = negotiate_encoding(accept_encoding)
+        payload = entry.encodings.get(encoding)
+        if payload is None:
+            # zlib и brotli отпускают GIL: сжатие мегабайтных ответов не блокирует event loop.
+            payload = await asyncio.to_thread(self.compress, entry.encodings[IDENTITY], encoding)
+            entry.encodings[encoding] = payload
+        if encoding != IDENTITY:
+            headers["Content-Encoding"] = encoding
+        return Response(content=payload, media_type="application/json", headers=headers)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == BROTLI:
+            payload: bytes = brotli.compress(body, mode=brotli.MODE_TEXT, quality=self.brotli_quality)
+            return payload
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+
+response_cache = ResponseCache(
+    minimum_size=settings.compression.minimum_size,
+    gzip_level=settings.compression.gzip_level,
+    brotli_quality=settings.compression.brotli_quality,
+    max_entries=settings.compression.max_entries,
+)
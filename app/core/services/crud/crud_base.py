@@ -1,13 +1,29 @@
 from abc import ABC, abstractmethod
+from typing import Optional
 
+from core.services.notify import publish
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
 class BaseCRUD(ABC):
+    """
+    Базовый CRUD класс.
+
+    Attributes:
+        entity (str): Тип сущности в уведомлениях об изменениях.
+    """
+
+    entity: str = ""
 
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    async def notify(self, action: str, key: Optional[object] = None) -> None:
+        """
+        Публикует уведомление об изменении в текущей транзакции. Вызывать до commit.
+        """
+        await publish(self.session, entity=self.entity, action=action, key=key)
+
     @abstractmethod
     async def create(self, schema):
         pass
@@ -2,7 +2,7 @@ from typing import Sequence
 
 from core.models import CoreSwitch
 from schemas.core_switch import CoreSwitchBase, CoreSwitchCreate, CoreSwitchUpdate
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 from sqlalchemy.orm import selectinload
 
 from .crud_base import BaseCRUD
@@ -13,9 +13,12 @@ class CrudCoreSwitch(BaseCRUD):
     Crud класс для опорных коммутаторов.
     """
 
+    entity = "core_switch"
+
     async def create(self, schema: CoreSwitchCreate) -> bool:
         core_switch = CoreSwitch(**schema.model_dump())
         self.session.add(core_switch)
+        await self.notify("create", schema.ip_address)
         await self.session.commit()
         await self.session.refresh(core_switch)
         return True
@@ -26,28 +29,34 @@ class CrudCoreSwitch(BaseCRUD):
         return result.all()
 
     async def update(self, schema: CoreSwitchUpdate) -> bool:
-        stmt = select(CoreSwitch).where(CoreSwitch.ip_address == schema.ip_address)
-        result = await self.session.execute(stmt)
-        core_switch = result.scalar_one_or_none()
-
-        if core_switch is None:
+        stmt = (
+            update(CoreSwitch)
+            .where(CoreSwitch.ip_address == schema.ip_address)
+            .values(**schema.model_dump(exclude_none=True))
+            .returning(CoreSwitch.id)
+            .execution_options(synchronize_session=False)
+        )
+        core_switch_id = (await self.session.execute(stmt)).scalar_one_or_none()
+
+        if core_switch_id is None:
             raise ValueError(f"Core switch: {schema.ip_address} not found")
 
-        for attr, value in schema.model_dump(exclude_none=True).items():
-            setattr(core_switch, attr, value)
-
+        await self.notify("update", schema.ip_address)
         await self.session.commit()
-        await self.session.refresh(core_switch)
         return True
 
     async def delete(self, schema: CoreSwitchBase) -> bool:
-        stmt = select(CoreSwitch).where(CoreSwitch.name == schema.name)
-        result = await self.session.execute(stmt)
-        core_switch = result.scalar_one_or_none()
-
-        if core_switch is None:
+        stmt = (
+            delete(CoreSwitch)
+            .where(CoreSwitch.name == schema.name)
+            .returning(CoreSwitch.ip_address)
+            .execution_options(synchronize_session=False)
+        )
+        ip_address = (await self.session.execute(stmt)).scalar_one_or_none()
+
+        if ip_address is None:
             return False
 
-        await self.session.delete(core_switch)
+        await self.notify("delete", ip_address)
         await self.session.commit()
         return True
@@ -1,14 +1,25 @@
-from typing import Sequence
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Sequence, Set, Tuple
 
-from core.models import Device
+from core.models import CoreSwitch, Device, DeviceSummary, Switch
 from schemas.device import DeviceUpdate
-from sqlalchemy import select
+from sqlalchemy import ARRAY, Boolean, Row, String, any_, cast, delete, func, literal_column, or_, select, update
+from sqlalchemy.dialects.postgresql import CIDR, INET, MACADDR
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import noload
 
 from .crud_base import BaseCRUD
 
+# Разделители, допустимые в поисковом запросе по MAC-адресу (aa:bb, aa-bb, aabb.ccdd, "aa bb").
+MAC_SEPARATORS = re.compile(r"[\s:.\-]")
+HEX_DIGITS = re.compile(r"^[0-9a-f]+$")
+
 
 class CrudDevice(BaseCRUD):
 
+    entity = "device"
+
     async def create(self, schema):
         pass
 
@@ -17,19 +28,293 @@ class CrudDevice(BaseCRUD):
         result = await self.session.scalars(stmt)
         return result.all()
 
-    async def update(self, schema: DeviceUpdate):
-        stmt = select(Device).where(Device.mac == schema.mac)
+    async def read_by_switch(self, switch_id: int) -> Sequence[Device]:
+        stmt = select(Device).where(Device.switch_id == switch_id).order_by(Device.port)
+        result = await self.session.scalars(stmt)
+        return result.all()
+
+    async def search(self, query: str, limit: int = 50) -> Sequence[Device]:
+        """
+        Поиск устройств по подстроке MAC-адреса (с любыми разделителями), IP-адреса или номера рабочего места.
+        Использует GIN-индексы pg_trgm, результаты ранжируются по similarity.
+
+        Args:
+            query (str): Поисковая строка.
+            limit (int): Максимальное количество результатов.
+
+        Returns:
+            Sequence[Device]: Найденные устройства, наиболее похожие первыми.
+        """
+        query = query.strip()
+        ip_host = func.host(Device.ip_address, type_=String)
+        conditions = [
+            ip_host.contains(query, autoescape=True),
+            Device.workplace_number.icontains(query, autoescape=True),
+        ]
+        ranks = [
+            func.similarity(ip_host, query),
+            func.similarity(func.coalesce(Device.workplace_number, ""), query),
+        ]
+
+        mac_query = MAC_SEPARATORS.sub("", query.lower())
+        if HEX_DIGITS.match(mac_query):
+            conditions.append(Device.mac_digits.contains(mac_query, autoescape=True))
+            ranks.append(func.similarity(Device.mac_digits, mac_query))
+
+        stmt = select(Device).where(or_(*conditions)).order_by(func.greatest(*ranks).desc(), Device.id).limit(limit)
+        result = await self.session.scalars(stmt)
+        return result.all()
+
+    async def read_subnet(self, network: str, limit: int = 1000) -> Sequence[Device]:
+        """
+        Устройства, IP-адрес которых входит в подсеть. Использует GiST-индекс inet_ops.
+
+        Args:
+            network (str): Подсеть в нотации CIDR, например 10.20.0.0/16.
+            limit (int): Максимальное количество результатов.
+
+        Returns:
+            Sequence[Device]: Устройства подсети, отсортированные по IP-адресу.
+        """
+        stmt = (
+            select(Device)
+            .where(Device.ip_address.op("<<=")(cast(network, CIDR)))
+            .order_by(Device.ip_address)
+            .limit(limit)
+        )
+        result = await self.session.scalars(stmt)
+        return result.all()
+
+    async def lookup(self, macs: Sequence[str], ips: Sequence[str]) -> Sequence[Device]:
+        """
+        Устройства по спискам MAC- и IP-адресов одним запросом: каждый список передаётся одним параметром-массивом
+        (= ANY), поэтому размер запроса и время планирования не зависят от количества ключей.
+        Связанные коммутаторы не загружаются.
+
+        Args:
+            macs (Sequence[str]): MAC-адреса в каноническом виде.
+            ips (Sequence[str]): IP-адреса в каноническом виде.
+
+        Returns:
+            Sequence[Device]: Найденные устройства.
+        """
+        conditions = []
+        if macs:
+            conditions.append(Device.mac == any_(cast(list(macs), ARRAY(MACADDR))))
+        if ips:
+            conditions.append(Device.ip_address == any_(cast(list(ips), ARRAY(INET))))
+        if not conditions:
+            return []
+        stmt = select(Device).options(noload(Device.switch)).where(or_(*conditions))
+        result = await self.session.scalars(stmt)
+        return result.all()
+
+    async def refresh_summary(self, switch_ids: Optional[Iterable[int]] = None) -> None:
+        """
+        Пересчитывает агрегаты device_summaries для указанных коммутаторов (None - для всех).
+        Выполняется в текущей транзакции, commit остаётся за вызывающим кодом синхронизации устройств.
+
+        Args:
+            switch_ids (Optional[Iterable[int]]): Идентификаторы коммутаторов, устройства которых изменились.
+        """
+        source = select(Device.switch_id, Device.vlan, Device.status, func.count().label("device_count")).group_by(
+            Device.switch_id, Device.vlan, Device.status
+        )
+        # Удаляются только группы, устройств которых больше нет; остальные обновляются на месте.
+        stale = delete(DeviceSummary).where(
+            ~select(Device.id)
+            .where(
+                Device.switch_id == DeviceSummary.switch_id,
+                Device.vlan == DeviceSummary.vlan,
+                Device.status == DeviceSummary.status,
+            )
+            .exists()
+        )
+
+        if switch_ids is not None:
+            switch_ids = list(switch_ids)
+            if not switch_ids:
+                return
+            source = source.where(Device.switch_id.in_(switch_ids))
+            stale = stale.where(DeviceSummary.switch_id.in_(switch_ids))
+
+        # INSERT .. ON CONFLICT вместо DELETE + INSERT: одновременные синхронизации одного коммутатора
+        # (обход и опрос по запросу) не нарушают первичный ключ device_summaries.
+        upsert = pg_insert(DeviceSummary).from_select(["switch_id", "vlan", "status", "device_count"], source)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[DeviceSummary.switch_id, DeviceSummary.vlan, DeviceSummary.status],
+            set_={"device_count": upsert.excluded.device_count},
+        )
+        await self.session.execute(stale)
+        await self.session.execute(upsert)
+
+    async def stats_by_switch(self) -> Sequence[Row]:
+        stmt = (
+            select(
+                Switch.id.label("switch_id"),
+                Switch.ip_address,
+                func.coalesce(func.sum(DeviceSummary.device_count), 0).label("device_count"),
+            )
+            .outerjoin(DeviceSummary, DeviceSummary.switch_id == Switch.id)
+            .group_by(Switch.id)
+            .order_by(Switch.id)
+        )
         result = await self.session.execute(stmt)
-        device = result.scalar_one_or_none()
+        return result.all()
 
-        if device is None:
-            raise ValueError(f"Device: {schema.mac} not found")
+    async def stats_by_vlan(self) -> Sequence[Row]:
+        stmt = (
+            select(DeviceSummary.vlan, func.sum(DeviceSummary.device_count).label("device_count"))
+            .group_by(DeviceSummary.vlan)
+            .order_by(DeviceSummary.vlan)
+        )
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def stats_by_core_switch(self) -> Sequence[Row]:
+        stmt = (
+            select(
+                CoreSwitch.ip_address.label("core_switch_ip"),
+                func.coalesce(func.sum(DeviceSummary.device_count), 0).label("device_count"),
+            )
+            .outerjoin(Switch, Switch.core_switch_ip == CoreSwitch.ip_address)
+            .outerjoin(DeviceSummary, DeviceSummary.switch_id == Switch.id)
+            .group_by(CoreSwitch.ip_address)
+            .order_by(CoreSwitch.ip_address)
+        )
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def stats_by_status(self) -> Sequence[Row]:
+        stmt = (
+            select(DeviceSummary.status, func.sum(DeviceSummary.device_count).label("device_count"))
+            .group_by(DeviceSummary.status)
+            .order_by(DeviceSummary.status)
+        )
+        result = await self.session.execute(stmt)
+        return result.all()
 
-        for attr, value in schema.model_dump(exclude_none=True).items():
-            setattr(device, attr, value)
+    async def stats_summary(self) -> Row:
+        stmt = select(
+            func.coalesce(func.sum(DeviceSummary.device_count), 0).label("devices"),
+            func.coalesce(func.sum(DeviceSummary.device_count).filter(DeviceSummary.status.is_(True)), 0).label(
+                "online"
+            ),
+            func.coalesce(func.sum(DeviceSummary.device_count).filter(DeviceSummary.status.is_(False)), 0).label(
+                "offline"
+            ),
+            func.count(DeviceSummary.vlan.distinct()).label("vlans"),
+            select(func.count(Switch.id)).scalar_subquery().label("switches"),
+            select(func.count(CoreSwitch.id)).scalar_subquery().label("core_switches"),
+        )
+        result = await self.session.execute(stmt)
+        return result.one()
+
+    async def upsert_devices(
+        self, switch_id: int, devices: Sequence[Dict[str, Any]], polled_at: datetime, move: bool = True
+    ) -> Tuple[int, int, Set[str]]:
+        """
+        Вставляет или обновляет пачку устройств коммутатора по MAC-адресу (устройство могло переехать
+        на другой коммутатор). Выполняется в текущей транзакции.
+
+        Args:
+            switch_id (int): Идентификатор коммутатора.
+            devices (Sequence[Dict[str, Any]]): Устройства (mac, ip_address, port, vlan, status) с уникальными MAC.
+            polled_at (datetime): Время опроса.
+            move (bool): Переносить на коммутатор устройства, записанные за другим коммутатором.
+                При False такие устройства не изменяются и возвращаются отдельно.
+
+        Returns:
+            Tuple[int, int, Set[str]]: Количество добавленных и обновлённых устройств и MAC-адреса
+            устройств другого коммутатора, оставленных без изменений.
+        """
+        if not devices:
+            return 0, 0, set()
+        insert_stmt = pg_insert(Device)
+        excluded = insert_stmt.excluded
+        stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[Device.mac],
+            set_={
+                "port": excluded.port,
+                "vlan": excluded.vlan,
+                "ip_address": func.coalesce(excluded.ip_address, Device.ip_address),
+                "status": excluded.status,
+                "update_time": excluded.update_time,
+                "switch_id": excluded.switch_id,
+            },
+            where=None if move else Device.switch_id == excluded.switch_id,
+        ).returning(
+            # xmax = 0 только у строк, вставленных этим запросом; у обновлённых по конфликту xmax заполнен.
+            cast(Device.mac, String),
+            literal_column("xmax = 0", Boolean),
+        )
+        result = await self.session.execute(
+            stmt,
+            [{**device, "update_time": polled_at, "switch_id": switch_id} for device in devices],
+        )
+        written = {mac: inserted for mac, inserted in result.all()}
+        inserted = sum(written.values())
+        skipped = {device["mac"] for device in devices} - written.keys()
+        return inserted, len(written) - inserted, skipped
+
+    async def finish_switch_sync(
+        self, switch_id: int, polled_at: datetime, retention: timedelta, uplink_ports: Iterable[int] = ()
+    ) -> Tuple[int, int]:
+        """
+        Завершает синхронизацию устройств коммутатора после записи всех пачек: устройства, не найденные
+        в опросе, помечаются выключенными и удаляются по истечении retention; устройства коммутатора на uplink
+        портах удаляются сразу; обновляются агрегаты. Записанные в опросе до определения порта uplink устройства
+        другого коммутатора сюда не попадают: до конца обхода они не переносятся (upsert_devices, move=False).
+
+        Args:
+            switch_id (int): Идентификатор коммутатора.
+            polled_at (datetime): Время опроса.
+            retention (timedelta): Срок хранения устройств, отсутствующих в таблице MAC-адресов.
+            uplink_ports (Iterable[int]): Порты, определённые в опросе как uplink/trunk.
+
+        Returns:
+            Tuple[int, int]: Количество устройств, помеченных выключенными, и удалённых устройств.
+        """
+        # Количество затронутых строк есть у CursorResult соединения, а не у Result сессии.
+        connection = await self.session.connection()
+        deleted = 0
+        uplink_ports = list(uplink_ports)
+        if uplink_ports:
+            result = await connection.execute(
+                delete(Device).where(Device.switch_id == switch_id, Device.port.in_(uplink_ports))
+            )
+            deleted += result.rowcount
+        result = await connection.execute(
+            update(Device)
+            .where(Device.switch_id == switch_id, Device.update_time < polled_at, Device.status.is_(True))
+            .values(status=False)
+        )
+        updated = result.rowcount
+        result = await connection.execute(
+            delete(Device).where(Device.switch_id == switch_id, Device.update_time < polled_at - retention)
+        )
+        deleted += result.rowcount
+        await self.refresh_summary([switch_id])
+        await self.notify("sync", switch_id)
+        await self.session.commit()
+        return updated, deleted
+
+    async def update(self, schema: DeviceUpdate):
+        values = schema.model_dump(exclude={"mac"}, exclude_none=True)
+        stmt = (
+            update(Device)
+            .where(Device.mac == schema.mac)
+            .values(mac=schema.mac, **values)
+            .returning(Device.id)
+            .execution_options(synchronize_session=False)
+        )
+        device_id = (await self.session.execute(stmt)).scalar_one_or_none()
+
+        if device_id is None:
+            raise ValueError(f"Device: {schema.mac} not found")
 
+        await self.notify("update", schema.mac)
         await self.session.commit()
-        await self.session.refresh(device)
         return True
 
     async def delete(self, schema):
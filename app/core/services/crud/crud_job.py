@@ -0,0 +1,196 @@
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from core.models import Job
+from schemas.job import JobCreate
+from sqlalchemy import case, delete, insert, select, update
+
+from .crud_base import BaseCRUD
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+ACTIVE_STATUSES = (PENDING, RUNNING)
+
+
+class CrudJob(BaseCRUD):
+    """
+    Crud класс для фоновых задач.
+    """
+
+    entity = "job"
+
+    async def create(self, schema: JobCreate) -> Job:
+        stmt = insert(Job).values(type=schema.type, params=schema.params).returning(Job)
+        job = (await self.session.scalars(stmt)).one()
+        await self.notify("create", job.id)
+        await self.session.commit()
+        return job
+
+    async def read(self, schema: Any = None) -> Sequence[Job]:
+        return await self.read_recent()
+
+    async def read_recent(
+        self, limit: int = 50, status: Optional[str] = None, job_type: Optional[str] = None
+    ) -> Sequence[Job]:
+        stmt = select(Job).order_by(Job.id.desc()).limit(limit)
+        if status is not None:
+            stmt = stmt.where(Job.status == status)
+        if job_type is not None:
+            stmt = stmt.where(Job.type == job_type)
+        result = await self.session.scalars(stmt)
+        return result.all()
+
+    async def read_one(self, job_id: int) -> Optional[Job]:
+        return await self.session.get(Job, job_id)
+
+    async def request_cancel(self, job_id: int, now: datetime) -> Optional[Job]:
+        """
+        Запрашивает отмену задачи. Задача в очереди отменяется сразу, выполняющуюся останавливает воркер.
+
+        Returns:
+            Optional[Job]: Задача или None, если она не найдена.
+        """
+        stmt = (
+            update(Job)
+            .where(Job.id == job_id, Job.status.in_(ACTIVE_STATUSES))
+            .values(
+                cancel_requested=True,
+                status=case((Job.status == PENDING, CANCELLED), else_=Job.status),
+                finished_at=case((Job.status == PENDING, now), else_=Job.finished_at),
+            )
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )
+        job = (await self.session.scalars(stmt)).one_or_none()
+        if job is None:
+            return await self.read_one(job_id)
+        await self.notify("cancel", job_id)
+        await self.session.commit()
+        return job
+
+    async def claim(self, job_types: Sequence[str], now: datetime) -> Optional[Job]:
+        """
+        Забирает самую старую задачу из очереди. FOR UPDATE SKIP LOCKED позволяет нескольким воркерам
+        разбирать очередь одновременно, не получая одну задачу дважды.
+        """
+        candidate = (
+            select(Job.id)
+            .where(Job.status == PENDING, Job.type.in_(job_types))
+            .order_by(Job.created_at, Job.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(Job)
+            .where(Job.id == candidate)
+            .values(status=RUNNING, started_at=now, heartbeat_at=now)
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )
+        job = (await self.session.scalars(stmt)).one_or_none()
+        await self.session.commit()
+        return job
+
+    async def set_progress(self, job_id: int, progress: float, message: Optional[str], now: datetime) -> bool:
+        """
+        Returns:
+            bool: Запрошена отмена задачи.
+        """
+        stmt = (
+            update(Job)
+            .where(Job.id == job_id)
+            .values(progress=progress, message=message, heartbeat_at=now)
+            .returning(Job.cancel_requested)
+        )
+        cancel_requested = (await self.session.execute(stmt)).scalar_one_or_none()
+        await self.session.commit()
+        return bool(cancel_requested)
+
+    async def heartbeat(self, job_ids: Sequence[int], now: datetime) -> Sequence[int]:
+        """
+        Обновляет heartbeat выполняющихся задач одним запросом.
+
+        Returns:
+            Sequence[int]: Задачи, для которых запрошена отмена.
+        """
+        if not job_ids:
+            return []
+        stmt = (
+            update(Job)
+            .where(Job.id.in_(list(job_ids)), Job.status == RUNNING)
+            .values(heartbeat_at=now)
+            .returning(Job.id, Job.cancel_requested)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        await self.session.commit()
+        return [job_id for job_id, cancel_requested in rows if cancel_requested]
+
+    async def finish(
+        self,
+        job_id: int,
+        status: str,
+        now: datetime,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        values: Dict[str, Any] = dict(status=status, finished_at=now, result=result, error=error)
+        if status == SUCCEEDED:
+            values["progress"] = 1.0
+        await self.session.execute(update(Job).where(Job.id == job_id).values(**values))
+        await self.notify("finish", job_id)
+        await self.session.commit()
+
+    async def requeue(self, job_ids: Sequence[int]) -> None:
+        """
+        Возвращает в очередь задачи, прерванные остановкой воркера.
+        """
+        await self.session.execute(
+            update(Job)
+            .where(Job.id.in_(list(job_ids)), Job.status == RUNNING)
+            .values(status=PENDING, started_at=None, heartbeat_at=None)
+        )
+        await self.session.commit()
+
+    async def fail_stale(self, before: datetime, now: datetime) -> int:
+        """
+        Завершает с ошибкой задачи, воркер которых перестал присылать heartbeat (процесс упал).
+
+        Returns:
+            int: Количество задач.
+        """
+        stmt = (
+            update(Job)
+            .where(Job.status == RUNNING, Job.heartbeat_at < before)
+            .values(status=FAILED, error="Worker lost", finished_at=now)
+            .returning(Job.id)
+        )
+        job_ids = (await self.session.scalars(stmt)).all()
+        await self.session.commit()
+        return len(job_ids)
+
+    async def purge(self, before: datetime) -> Sequence[Tuple[int, Optional[Dict[str, Any]]]]:
+        """
+        Удаляет завершённые задачи старше before.
+
+        Returns:
+            Sequence[Tuple[int, Optional[Dict[str, Any]]]]: Идентификаторы и результаты удалённых задач.
+        """
+        stmt = (
+            delete(Job)
+            .where(Job.status.not_in(ACTIVE_STATUSES), Job.finished_at < before)
+            .returning(Job.id, Job.result)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        await self.session.commit()
+        return [(row.id, row.result) for row in rows]
+
+    async def update(self, schema: Any) -> None:
+        pass
+
+    async def delete(self, schema: Any) -> None:
+        pass
@@ -0,0 +1,108 @@
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence
+
+from core.models import PollRun, PollRunSwitch
+from sqlalchemy import Row, delete, func, insert, select, update
+from sqlalchemy.orm import selectinload
+
+from .crud_base import BaseCRUD
+
+
+class CrudPollRun(BaseCRUD):
+    """
+    Crud класс для журнала опросов.
+    """
+
+    entity = "poll_run"
+
+    async def create(self, schema: Any = None) -> None:
+        pass
+
+    async def start_run(self, kind: str, started_at: datetime) -> int:
+        """
+        Returns:
+            int: Идентификатор запуска опроса.
+        """
+        stmt = insert(PollRun).values(kind=kind, started_at=started_at).returning(PollRun.id)
+        run_id = (await self.session.execute(stmt)).scalar_one()
+        await self.session.commit()
+        return run_id
+
+    async def record_switch(self, run_id: int, stats: Dict[str, Any]) -> None:
+        """
+        Записывает показатели опроса коммутатора (SwitchPollStats.as_row()).
+        """
+        await self.session.execute(insert(PollRunSwitch).values(run_id=run_id, **stats))
+        await self.session.commit()
+
+    async def finish_run(self, run_id: int, finished_at: datetime, purge_before: Optional[datetime] = None) -> None:
+        """
+        Завершает запуск: итоги считаются по записям коммутаторов. Запуски старше purge_before удаляются.
+        """
+        totals = (
+            await self.session.execute(
+                select(
+                    func.count().label("switches_attempted"),
+                    func.count().filter(PollRunSwitch.succeeded.is_(True)).label("switches_succeeded"),
+                    func.count().filter(PollRunSwitch.succeeded.is_(False)).label("switches_failed"),
+                    func.coalesce(func.sum(PollRunSwitch.varbinds), 0).label("varbinds"),
+                    func.coalesce(func.sum(PollRunSwitch.rows_inserted), 0).label("rows_inserted"),
+                    func.coalesce(func.sum(PollRunSwitch.rows_updated), 0).label("rows_updated"),
+                    func.coalesce(func.sum(PollRunSwitch.rows_deleted), 0).label("rows_deleted"),
+                ).where(PollRunSwitch.run_id == run_id)
+            )
+        ).one()
+        await self.session.execute(
+            update(PollRun).where(PollRun.id == run_id).values(finished_at=finished_at, **totals._asdict())
+        )
+        if purge_before is not None:
+            await self.session.execute(delete(PollRun).where(PollRun.started_at < purge_before))
+        await self.session.commit()
+
+    async def read(self, schema: Any = None) -> Sequence[PollRun]:
+        return await self.read_recent()
+
+    async def read_recent(self, limit: int = 20, kind: Optional[str] = None) -> Sequence[PollRun]:
+        stmt = select(PollRun).order_by(PollRun.id.desc()).limit(limit)
+        if kind is not None:
+            stmt = stmt.where(PollRun.kind == kind)
+        result = await self.session.scalars(stmt)
+        return result.all()
+
+    async def read_one(self, run_id: int) -> Optional[PollRun]:
+        stmt = select(PollRun).options(selectinload(PollRun.switches)).where(PollRun.id == run_id)
+        return (await self.session.scalars(stmt)).one_or_none()
+
+    async def slowest_switches(self, since: datetime, limit: int = 20) -> Sequence[Row]:
+        """
+        Коммутаторы с наибольшей средней длительностью опроса с момента since.
+
+        Returns:
+            Sequence[Row]: switch_id, ip_address, polls, failures, avg/max duration, среднее время по этапам.
+        """
+        stmt = (
+            select(
+                PollRunSwitch.switch_id,
+                func.max(PollRunSwitch.ip_address).label("ip_address"),
+                func.count().label("polls"),
+                func.count().filter(PollRunSwitch.succeeded.is_(False)).label("failures"),
+                func.avg(PollRunSwitch.duration).label("avg_duration"),
+                func.max(PollRunSwitch.duration).label("max_duration"),
+                func.avg(PollRunSwitch.walk_seconds).label("avg_walk_seconds"),
+                func.avg(PollRunSwitch.decode_seconds).label("avg_decode_seconds"),
+                func.avg(PollRunSwitch.write_seconds).label("avg_write_seconds"),
+                func.avg(PollRunSwitch.varbinds).label("avg_varbinds"),
+            )
+            .where(PollRunSwitch.started_at >= since)
+            .group_by(PollRunSwitch.switch_id)
+            .order_by(func.avg(PollRunSwitch.duration).desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def update(self, schema: Any) -> None:
+        pass
+
+    async def delete(self, schema: Any) -> None:
+        pass
@@ -1,62 +1,59 @@
-from typing import Sequence
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
 
-from core.models import CoreSwitch, ExcludedPort, Switch, SwitchExcludedPort
+from core.models import ExcludedPort, Switch, SwitchExcludedPort, SwitchUplinkPort
+from core.services.snmp import SnmpProfile
 from schemas.switch import SwitchCreate, SwitchUpdate
-from sqlalchemy import select
+from sqlalchemy import (
+    ARRAY,
+    Boolean,
+    Integer,
+    any_,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    union,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
 from .crud_base import BaseCRUD
 
+UNIQUE_VIOLATION = "23505"
+
 
 class CrudSwitch(BaseCRUD):
     """
     Crud класс для коммутаторов.
     """
 
-    async def create(self, schema: SwitchCreate) -> bool:
-        existing_switch = await self.session.execute(select(Switch).where(Switch.ip_address == schema.ip_address))
-        existing_switch = existing_switch.scalar_one_or_none()
-
-        if existing_switch:
-            raise ValueError(f"Switch with IP address {schema.ip_address} already exists.")
+    entity = "switch"
 
-        stmt = select(CoreSwitch).where(CoreSwitch.ip_address == schema.core_switch_ip)
-        result = await self.session.execute(stmt)
-        core_switch = result.scalar_one_or_none()
-
-        if core_switch is None:
-            raise ValueError(f"Core switch: {schema.core_switch_ip} not found")
-
-        switch = Switch(
-            ip_address=schema.ip_address,
-            comment=schema.comment,
-            snmp_oid=schema.snmp_oid,
-            core_switch_ip=schema.core_switch_ip,
-            core_switch=core_switch,
+    async def create(self, schema: SwitchCreate) -> bool:
+        stmt = (
+            insert(Switch)
+            .values(
+                ip_address=schema.ip_address,
+                comment=schema.comment,
+                snmp_oid=schema.snmp_oid,
+                core_switch_ip=schema.core_switch_ip,
+            )
+            .returning(Switch.id)
         )
-
-        self.session.add(switch)
-        await self.session.commit()
-        await self.session.refresh(switch)
-
-        if schema.excluded_ports_relation:
-            for port in schema.excluded_ports_relation:
-                excluded_port = await self.session.execute(
-                    select(ExcludedPort).where(ExcludedPort.port_number == int(port))
-                )
-                excluded_port = excluded_port.scalar_one_or_none()
-
-                if excluded_port is None:
-                    excluded_port = ExcludedPort(port_number=int(port))
-                    self.session.add(excluded_port)
-                    await self.session.flush()
-
-                if excluded_port.id is None:
-                    raise ValueError(f"Failed to retrieve ID for excluded port: {port}")
-
-                switch_excluded_port = SwitchExcludedPort(switch_id=switch.id, excluded_port_id=excluded_port.id)
-                self.session.add(switch_excluded_port)
-
+        try:
+            switch_id = (await self.session.execute(stmt)).scalar_one()
+        except IntegrityError as exc:
+            await self.session.rollback()
+            raise self._integrity_error(exc, schema)
+
+        await self._sync_excluded_ports(switch_id, schema.excluded_ports_relation)
+        await self.notify("create", schema.ip_address)
         await self.session.commit()
         return True
 
@@ -65,66 +62,192 @@ class CrudSwitch(BaseCRUD):
         result = await self.session.scalars(stmt)
         return result.all()
 
-    async def update(self, schema: SwitchUpdate) -> bool:
-        stmt = select(Switch).where(Switch.ip_address == schema.ip_address)
-        result = await self.session.execute(stmt)
-        switch = result.scalar_one_or_none()
-
-        if switch is None:
-            raise ValueError(f"Switch: {schema.ip_address} not found")
-
-        if schema.comment is not None:
-            switch.comment = schema.comment
-
-        if schema.snmp_oid is not None:
-            switch.snmp_oid = schema.snmp_oid
-
-        if schema.core_switch_ip is not None:
-            core_switch = await self.session.execute(
-                select(CoreSwitch).where(CoreSwitch.ip_address == schema.core_switch_ip)
+    async def record_poll_success(
+        self, switch_id: int, polled_at: datetime, profile: Optional[SnmpProfile] = None
+    ) -> None:
+        """
+        Отмечает успешный опрос коммутатора, закрывает circuit breaker и сохраняет профиль SNMP-агента.
+        """
+        values = dict(consecutive_failures=0, last_success=polled_at, last_error=None, next_poll_at=None)
+        if profile is not None:
+            values.update(
+                snmp_max_repetitions=profile.max_repetitions,
+                snmp_bulk=profile.bulk,
+                snmp_rtt=profile.rtt,
+                snmp_sys_object_id=profile.sys_object_id,
             )
-            core_switch = core_switch.scalar_one_or_none()
-
-            if core_switch is None:
-                raise ValueError(f"Core switch: {schema.core_switch_ip} not found.")
-
-            switch.core_switch = core_switch
-
-        for excluded_port in switch.excluded_ports_relation:
-            await self.session.delete(excluded_port)
+        await self.session.execute(update(Switch).where(Switch.id == switch_id).values(**values))
+        await self.notify("poll", switch_id)
+        await self.session.commit()
 
-        if schema.excluded_ports_relation:
-            for port in schema.excluded_ports_relation:
-                excluded_port = await self.session.execute(
-                    select(ExcludedPort).where(ExcludedPort.port_number == int(port))
-                )
-                excluded_port = excluded_port.scalar_one_or_none()
+    async def record_poll_failure(
+        self, switch_id: int, error: str, failed_at: datetime, next_poll_at: Optional[datetime]
+    ) -> None:
+        """
+        Отмечает неудачный опрос коммутатора.
+
+        Args:
+            switch_id (int): Идентификатор коммутатора.
+            error (str): Текст ошибки.
+            failed_at (datetime): Время опроса.
+            next_poll_at (Optional[datetime]): Не опрашивать до этого времени.
+        """
+        await self.session.execute(
+            update(Switch)
+            .where(Switch.id == switch_id)
+            .values(
+                consecutive_failures=Switch.consecutive_failures + 1,
+                last_failure=failed_at,
+                last_error=error[:500],
+                next_poll_at=next_poll_at,
+            )
+        )
+        await self.notify("poll", switch_id)
+        await self.session.commit()
 
-                if excluded_port is None:
-                    excluded_port = ExcludedPort(port_number=int(port))
-                    self.session.add(excluded_port)
-                    await self.session.flush()
+    async def sync_uplink_ports(
+        self, switch_id: int, uplinks: Dict[int, Tuple[str, int]], detected_at: datetime
+    ) -> None:
+        """
+        Приводит автоматически определённые uplink порты коммутатора к результату опроса одним запросом.
+        Исключенные вручную порты не затрагиваются. Выполняется в текущей транзакции.
+
+        Args:
+            switch_id (int): Идентификатор коммутатора.
+            uplinks (Dict[int, Tuple[str, int]]): Порт -> (признак, количество MAC-адресов на порту).
+            detected_at (datetime): Время опроса.
+        """
+        stale = delete(SwitchUplinkPort).where(
+            SwitchUplinkPort.switch_id == switch_id, SwitchUplinkPort.port.not_in(list(uplinks))
+        )
+        if not uplinks:
+            await self.session.execute(stale)
+            return
+        stmt = pg_insert(SwitchUplinkPort).values(
+            [
+                {
+                    "switch_id": switch_id,
+                    "port": port,
+                    "reason": reason,
+                    "mac_count": mac_count,
+                    "detected_at": detected_at,
+                }
+                for port, (reason, mac_count) in uplinks.items()
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SwitchUplinkPort.switch_id, SwitchUplinkPort.port],
+            set_={"reason": stmt.excluded.reason, "mac_count": stmt.excluded.mac_count},
+        ).add_cte(stale.returning(SwitchUplinkPort.port).cte("removed"))
+        await self.session.execute(stmt)
+
+    async def upsert_discovered(
+        self, switches: Sequence[Dict[str, Any]], update_core_switch: bool = False
+    ) -> Tuple[int, int]:
+        """
+        Записывает коммутаторы, найденные обходом LLDP, одним запросом. У существующих коммутаторов
+        комментарий (имя системы из LLDP) заполняется, только если он пуст; опорный коммутатор меняется
+        только при update_core_switch, чтобы обход не переписывал введённые вручную данные.
+
+        Args:
+            switches (Sequence[Dict[str, Any]]): Коммутаторы (ip_address, core_switch_ip, comment).
+            update_core_switch (bool): Обновлять опорный коммутатор существующих коммутаторов.
+
+        Returns:
+            Tuple[int, int]: Количество добавленных и обновлённых коммутаторов.
+        """
+        if not switches:
+            return 0, 0
+        insert_stmt = pg_insert(Switch)
+        set_: Dict[str, Any] = {"comment": func.coalesce(Switch.comment, insert_stmt.excluded.comment)}
+        if update_core_switch:
+            set_["core_switch_ip"] = insert_stmt.excluded.core_switch_ip
+        stmt = insert_stmt.on_conflict_do_update(index_elements=[Switch.ip_address], set_=set_).returning(
+            literal_column("xmax = 0", Boolean)
+        )
+        inserted = sum(await self.session.scalars(stmt, list(switches)))
+        await self.notify("discover")
+        await self.session.commit()
+        return inserted, len(switches) - inserted
 
-                if excluded_port.id is None:
-                    raise ValueError(f"Failed to retrieve ID for excluded port: {port}")
+    async def update(self, schema: SwitchUpdate) -> bool:
+        values = schema.model_dump(include={"comment", "snmp_oid", "core_switch_ip"}, exclude_none=True)
+        stmt = (
+            update(Switch)
+            .where(Switch.ip_address == schema.ip_address)
+            .values(ip_address=schema.ip_address, **values)
+            .returning(Switch.id)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            switch_id = (await self.session.execute(stmt)).scalar_one_or_none()
+        except IntegrityError as exc:
+            await self.session.rollback()
+            raise self._integrity_error(exc, schema)
 
-                switch_excluded_port = SwitchExcludedPort(switch_id=switch.id, excluded_port_id=excluded_port.id)
-                self.session.add(switch_excluded_port)
+        if switch_id is None:
+            raise ValueError(f"Switch: {schema.ip_address} not found")
 
+        await self._sync_excluded_ports(switch_id, schema.excluded_ports_relation)
+        await self.notify("update", schema.ip_address)
         await self.session.commit()
         return True
 
     async def delete(self, schema: SwitchCreate) -> bool:
-        stmt = select(Switch).where(Switch.ip_address == schema.ip_address)
-        result = await self.session.execute(stmt)
-        switch = result.scalar_one_or_none()
+        # Связи с исключенными портами, устройства и агрегаты удаляются каскадно (ON DELETE CASCADE).
+        stmt = (
+            delete(Switch)
+            .where(Switch.ip_address == schema.ip_address)
+            .returning(Switch.id)
+            .execution_options(synchronize_session=False)
+        )
+        switch_id = (await self.session.execute(stmt)).scalar_one_or_none()
 
-        if switch is None:
+        if switch_id is None:
             return False
 
-        for excluded_port in switch.excluded_ports_relation:
-            await self.session.delete(excluded_port)
-
-        await self.session.delete(switch)
+        await self.notify("delete", schema.ip_address)
         await self.session.commit()
         return True
+
+    async def _sync_excluded_ports(self, switch_id: int, ports: Optional[Sequence[int]]) -> None:
+        """
+        Приводит исключенные порты коммутатора к списку ports одним запросом, независимо от количества портов:
+        недостающие порты создаются, лишние связи удаляются, новые добавляются.
+        """
+        ports = sorted({int(port) for port in ports or []})
+        ports_param = cast(ports, ARRAY(Integer))
+
+        created = (
+            pg_insert(ExcludedPort)
+            .from_select(["port_number"], select(func.unnest(ports_param)))
+            .on_conflict_do_nothing(index_elements=[ExcludedPort.port_number])
+            .returning(ExcludedPort.id)
+            .cte("created")
+        )
+        port_ids = union(
+            select(created.c.id),
+            select(ExcludedPort.id).where(ExcludedPort.port_number == any_(ports_param)),
+        ).cte("port_ids")
+        removed = (
+            delete(SwitchExcludedPort)
+            .where(
+                SwitchExcludedPort.switch_id == switch_id,
+                SwitchExcludedPort.excluded_port_id.not_in(select(port_ids.c.id)),
+            )
+            .returning(SwitchExcludedPort.excluded_port_id)
+            .cte("removed")
+        )
+        stmt = (
+            pg_insert(SwitchExcludedPort)
+            .from_select(["switch_id", "excluded_port_id"], select(literal(switch_id), port_ids.c.id))
+            .on_conflict_do_nothing()
+            .add_cte(removed)
+        )
+        await self.session.execute(stmt)
+
+    @staticmethod
+    def _integrity_error(exc: IntegrityError, schema: SwitchCreate) -> ValueError:
+        if getattr(exc.orig, "pgcode", None) == UNIQUE_VIOLATION:
+            return ValueError(f"Switch with IP address {schema.ip_address} already exists.")
+        return ValueError(f"Core switch: {schema.core_switch_ip} not found")
@@ -0,0 +1,3 @@
+__all__ = ("write_snapshot",)
+
+from .snapshot import write_snapshot
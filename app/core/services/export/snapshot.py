@@ -0,0 +1,151 @@
+import os
+import tempfile
+import zipfile
+from typing import Dict, List, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from core.models import CoreSwitch, Device, ExcludedPort, Switch, SwitchExcludedPort
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+CORE_SWITCHES_SCHEMA = pa.schema(
+    [
+        ("id", pa.int32()),
+        ("ip_address", pa.string()),
+        ("name", pa.string()),
+        ("snmp_oid", pa.string()),
+    ]
+)
+
+SWITCHES_SCHEMA = pa.schema(
+    [
+        ("id", pa.int32()),
+        ("ip_address", pa.string()),
+        ("comment", pa.string()),
+        ("snmp_oid", pa.string()),
+        ("core_switch_ip", pa.string()),
+    ]
+)
+
+EXCLUDED_PORTS_SCHEMA = pa.schema(
+    [
+        ("switch_id", pa.int32()),
+        ("port_number", pa.int32()),
+        ("comment", pa.string()),
+    ]
+)
+
+DEVICES_SCHEMA = pa.schema(
+    [
+        ("id", pa.int32()),
+        ("workplace_number", pa.string()),
+        ("port", pa.int32()),
+        ("mac", pa.string()),
+        ("vlan", pa.int32()),
+        ("ip_address", pa.string()),
+        ("status", pa.bool_()),
+        ("update_time", pa.timestamp("us", tz="UTC")),
+        ("switch_id", pa.int32()),
+    ]
+)
+
+
+def snapshot_tables() -> List[Tuple[str, Select, pa.Schema]]:
+    """
+    Таблицы снимка: имя файла в архиве, запрос (только колонки, без ORM-объектов) и схема Arrow.
+    """
+    return [
+        (
+            "core_switches",
+            select(CoreSwitch.id, CoreSwitch.ip_address, CoreSwitch.name, CoreSwitch.snmp_oid).order_by(CoreSwitch.id),
+            CORE_SWITCHES_SCHEMA,
+        ),
+        (
+            "switches",
+            select(Switch.id, Switch.ip_address, Switch.comment, Switch.snmp_oid, Switch.core_switch_ip).order_by(
+                Switch.id
+            ),
+            SWITCHES_SCHEMA,
+        ),
+        (
+            "excluded_ports",
+            select(SwitchExcludedPort.switch_id, ExcludedPort.port_number, ExcludedPort.comment)
+            .join(ExcludedPort, ExcludedPort.id == SwitchExcludedPort.excluded_port_id)
+            .order_by(SwitchExcludedPort.switch_id, ExcludedPort.port_number),
+            EXCLUDED_PORTS_SCHEMA,
+        ),
+        (
+            "devices",
+            select(
+                Device.id,
+                Device.workplace_number,
+                Device.port,
+                Device.mac,
+                Device.vlan,
+                Device.ip_address,
+                Device.status,
+                Device.update_time,
+                Device.switch_id,
+            ).order_by(Device.id),
+            DEVICES_SCHEMA,
+        ),
+    ]
+
+
+def rows_to_batch(rows: Sequence[Sequence], schema: pa.Schema) -> pa.RecordBatch:
+    """
+    Преобразует пачку строк результата запроса в колоночный RecordBatch.
+    """
+    columns = list(zip(*rows))
+    arrays = [pa.array(column, type=field.type) for column, field in zip(columns, schema)]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+async def write_table(
+    session: AsyncSession,
+    stmt: Select,
+    schema: pa.Schema,
+    path: str,
+    batch_size: int,
+    compression: str,
+) -> int:
+    """
+    Потоково читает результат запроса серверным курсором и записывает его в Parquet
+    по одной группе строк на пачку. В памяти одновременно находится не более batch_size строк.
+
+    Returns:
+        int: Количество записанных строк.
+    """
+    written = 0
+    result = await session.stream(stmt.execution_options(yield_per=batch_size))
+    with pq.ParquetWriter(path, schema, compression=compression) as writer:
+        async for rows in result.partitions(batch_size):
+            writer.write_batch(rows_to_batch(rows, schema))
+            written += len(rows)
+    return written
+
+
+async def write_snapshot(session: AsyncSession, path: str, batch_size: int, compression: str) -> Dict[str, int]:
+    """
+    Записывает снимок топологии в zip-архив из Parquet-файлов:
+    core_switches, switches, excluded_ports, devices.
+
+    Args:
+        session (AsyncSession): Сессия базы данных.
+        path (str): Путь к итоговому архиву.
+        batch_size (int): Размер пачки строк.
+        compression (str): Кодек сжатия Parquet.
+
+    Returns:
+        Dict[str, int]: Количество строк по каждой таблице.
+    """
+    counts: Dict[str, int] = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+            for name, stmt, schema in snapshot_tables():
+                table_path = os.path.join(workdir, f"{name}.parquet")
+                counts[name] = await write_table(session, stmt, schema, table_path, batch_size, compression)
+                archive.write(table_path, arcname=f"{name}.parquet")
+                os.remove(table_path)
+    return counts
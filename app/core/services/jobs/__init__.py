@@ -0,0 +1,9 @@
+__all__ = (
+    "JobCancelled",
+    "JobContext",
+    "JobQueue",
+    "job_queue",
+)
+
+from .handlers import job_queue
+from .queue import JobCancelled, JobContext, JobQueue
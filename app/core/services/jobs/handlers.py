@@ -0,0 +1,80 @@
+import os
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from core.config import settings
+from core.models import db_helper
+from core.services.export import write_snapshot
+from core.services.poller import poller, topology_crawler
+from schemas.validation_helper import validation_helper
+
+from .queue import JobContext, JobQueue
+
+job_queue = JobQueue(
+    session_factory=db_helper.session_factory,
+    poll_interval=settings.jobs.poll_interval,
+    heartbeat_interval=settings.jobs.heartbeat_interval,
+    stale_after=timedelta(seconds=settings.jobs.stale_after),
+    retention=timedelta(days=settings.jobs.retention_days),
+)
+
+
+def concurrency(job_type: str) -> int:
+    return settings.jobs.concurrency.get(job_type, settings.jobs.default_concurrency)
+
+
+@job_queue.register("sweep", concurrency=concurrency("sweep"))
+async def sweep(context: JobContext) -> Optional[Dict[str, Any]]:
+    """
+    Полный опрос всех коммутаторов, прогресс - по опорным коммутаторам. Если обход уже выполняется
+    (периодический или другой задачей), задача завершается без второго обхода.
+    """
+    await context.progress(0.0, "Polling switches")
+    if not await poller.sweep_exclusive(progress=context.progress):
+        return {"skipped": True, "reason": "Sweep is already running"}
+    return None
+
+
+@job_queue.register("poll_switch", concurrency=concurrency("poll_switch"))
+async def poll_switch(context: JobContext) -> Optional[Dict[str, Any]]:
+    """
+    Опрос одного коммутатора без учёта возраста данных. Params: ip_address.
+    """
+    ip_address = context.params.get("ip_address")
+    if not isinstance(ip_address, str):
+        raise ValueError("poll_switch job requires the ip_address param: IP address of the switch")
+    ip_address = validation_helper.validate_ip_address(ip=ip_address)
+    switch = await poller.poll_on_demand(ip_address, max_age=timedelta(0))
+    return {"switch_id": switch.id, "ip_address": switch.ip_address}
+
+
+@job_queue.register("discover", concurrency=concurrency("discover"))
+async def discover(context: JobContext) -> Optional[Dict[str, Any]]:
+    """
+    Обнаружение коммутаторов обходом LLDP от опорных коммутаторов, прогресс - по уровням обхода.
+    """
+    await context.progress(0.0, "Crawling LLDP neighbors")
+    return await topology_crawler.discover(progress=context.progress)
+
+
+@job_queue.register("snapshot", concurrency=concurrency("snapshot"))
+async def snapshot(context: JobContext) -> Optional[Dict[str, Any]]:
+    """
+    Выгрузка снимка топологии в файл; скачивается через GET /jobs/{id}/download.
+    """
+    os.makedirs(settings.jobs.directory, exist_ok=True)
+    path = os.path.join(settings.jobs.directory, f"snapshot_{context.job_id}.zip")
+    await context.progress(0.0, "Writing snapshot")
+    try:
+        async with db_helper.session_factory() as session:
+            rows = await write_snapshot(
+                session,
+                path=path,
+                batch_size=settings.export.batch_size,
+                compression=settings.export.compression,
+            )
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return {"path": path, "rows": rows}
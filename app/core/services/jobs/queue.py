@@ -0,0 +1,217 @@
+import asyncio
+import logging
+import os
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from core.models import Job
+from core.services.crud.crud_job import CANCELLED, FAILED, SUCCEEDED, CrudJob
+from core.services.notify import ChangeEvent, ChangeListener
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    """Отмена задачи, запрошенная через API."""
+
+
+class JobContext:
+    """
+    Контекст выполняемой задачи, передаётся обработчику.
+
+    Params:
+        queue (JobQueue): Очередь задач.
+        job (Job): Задача.
+    """
+
+    def __init__(self, queue: "JobQueue", job: Job) -> None:
+        self.queue = queue
+        self.job_id = job.id
+        self.params: Dict[str, Any] = dict(job.params or {})
+
+    async def progress(self, value: float, message: Optional[str] = None) -> None:
+        """
+        Сохраняет прогресс задачи. Если запрошена отмена, выбрасывает JobCancelled.
+
+        Args:
+            value (float): Доля выполнения от 0 до 1.
+            message (Optional[str]): Описание текущего этапа.
+        """
+        async with self.queue.session_factory() as session:
+            cancel_requested = await CrudJob(session).set_progress(
+                self.job_id, progress=min(max(value, 0.0), 1.0), message=message, now=datetime.now(timezone.utc)
+            )
+        if cancel_requested:
+            raise JobCancelled()
+
+
+JobHandler = Callable[[JobContext], Awaitable[Optional[Dict[str, Any]]]]
+
+
+@dataclass(frozen=True)
+class JobType:
+    """
+    Тип задачи.
+
+    Attributes:
+        name (str): Имя типа.
+        handler (JobHandler): Обработчик; возвращает результат задачи.
+        concurrency (int): Максимальное количество одновременно выполняемых задач этого типа в воркере.
+    """
+
+    name: str
+    handler: JobHandler
+    concurrency: int
+
+
+class JobQueue:
+    """
+    Очередь фоновых задач на таблице jobs.
+
+    Воркер забирает задачи из таблицы (FOR UPDATE SKIP LOCKED, поэтому воркеров может быть несколько),
+    соблюдая ограничение одновременно выполняемых задач по типам, и выполняет их в отдельных asyncio-задачах
+    со своими сессиями БД - обработчики запросов только ставят задачу в очередь. Новые задачи и запросы
+    отмены приходят через ChangeListener; без уведомлений очередь проверяется раз в poll_interval.
+
+    Выполняющиеся задачи периодически отмечаются heartbeat; задачи упавшего воркера завершаются с ошибкой
+    через stale_after. При остановке приложения прерванные задачи возвращаются в очередь.
+
+    Params:
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий.
+        poll_interval (float): Интервал проверки очереди, в секундах.
+        heartbeat_interval (float): Интервал heartbeat, в секундах.
+        stale_after (timedelta): Через сколько без heartbeat задача считается потерянной.
+        retention (timedelta): Срок хранения завершённых задач.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        poll_interval: float = 5.0,
+        heartbeat_interval: float = 15.0,
+        stale_after: timedelta = timedelta(minutes=2),
+        retention: timedelta = timedelta(days=7),
+    ) -> None:
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.retention = retention
+        self.types: Dict[str, JobType] = {}
+        self._running: Dict[int, asyncio.Task] = {}
+        self._active: Counter = Counter()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, concurrency: int = 1) -> Callable[[JobHandler], JobHandler]:
+        """
+        Декоратор регистрации обработчика задач типа name.
+        """
+
+        def decorator(handler: JobHandler) -> JobHandler:
+            self.types[name] = JobType(name=name, handler=handler, concurrency=max(1, concurrency))
+            return handler
+
+        return decorator
+
+    def attach(self, listener: ChangeListener) -> None:
+        listener.subscribe(CrudJob.entity, self.on_change)
+
+    def on_change(self, event: ChangeEvent) -> None:
+        if event.action == "create":
+            self._wakeup.set()
+        elif event.action == "cancel" and event.key is not None:
+            task = self._running.get(int(event.key))
+            if task is not None:
+                task.cancel()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopping = True
+        self._task.cancel()
+        for task in list(self._running.values()):
+            task.cancel()
+        await asyncio.gather(self._task, *self._running.values(), return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        next_maintenance = 0.0
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                if loop.time() >= next_maintenance:
+                    await self._maintenance()
+                    next_maintenance = loop.time() + self.heartbeat_interval
+                await self._claim_available()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Job queue iteration failed")
+            self._wakeup.clear()
+            # Не wait_for: до Python 3.12 он может потерять отмену, совпавшую с пробуждением, и stop() зависнет.
+            wakeup = asyncio.ensure_future(self._wakeup.wait())
+            try:
+                await asyncio.wait({wakeup}, timeout=self.poll_interval)
+            finally:
+                wakeup.cancel()
+
+    async def _maintenance(self) -> None:
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session:
+            crud = CrudJob(session)
+            for job_id in await crud.heartbeat(list(self._running), now=now):
+                task = self._running.get(job_id)
+                if task is not None:
+                    task.cancel()
+            if await crud.fail_stale(before=now - self.stale_after, now=now):
+                logger.warning("Jobs of a lost worker marked as failed")
+            for _, result in await crud.purge(before=now - self.retention):
+                path = (result or {}).get("path")
+                if path and os.path.exists(path):
+                    os.remove(path)
+
+    async def _claim_available(self) -> None:
+        while True:
+            free = [name for name, job_type in self.types.items() if self._active[name] < job_type.concurrency]
+            if not free:
+                return
+            async with self.session_factory() as session:
+                job = await CrudJob(session).claim(free, now=datetime.now(timezone.utc))
+            if job is None:
+                return
+            self._active[job.type] += 1
+            self._running[job.id] = asyncio.create_task(self._execute(job))
+
+    async def _execute(self, job: Job) -> None:
+        context = JobContext(self, job)
+        status, result, error = SUCCEEDED, None, None
+        try:
+            result = await self.types[job.type].handler(context)
+        except (asyncio.CancelledError, JobCancelled):
+            if self._stopping:
+                async with self.session_factory() as session:
+                    await CrudJob(session).requeue([job.id])
+                return
+            status = CANCELLED
+        except Exception as exc:
+            logger.exception("Job %s (%s) failed", job.id, job.type)
+            status, error = FAILED, str(exc)[:500]
+        finally:
+            self._active[job.type] -= 1
+            self._running.pop(job.id, None)
+            self._wakeup.set()
+
+        async with self.session_factory() as session:
+            await CrudJob(session).finish(
+                job.id, status=status, now=datetime.now(timezone.utc), result=result, error=error
+            )
@@ -0,0 +1,8 @@
+__all__ = (
+    "ChangeEvent",
+    "ChangeListener",
+    "change_listener",
+    "publish",
+)
+
+from .notifier import ChangeEvent, ChangeListener, change_listener, publish
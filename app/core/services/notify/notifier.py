@@ -0,0 +1,234 @@
+import asyncio
+import inspect
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Union
+
+import asyncpg
+from core.config import settings
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Идентификатор воркера, от имени которого публикуются уведомления.
+WORKER_ID = os.getpid()
+
+# Полезная нагрузка NOTIFY ограничена 8000 байт, оставляем запас под служебные поля.
+MAX_KEY_LENGTH = 7000
+
+# Сущность/действие служебного события, которое рассылается всем подписчикам после (пере)подключения.
+ALL_ENTITIES = "*"
+RESYNC_ACTION = "resync"
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """
+    Уведомление об изменении данных.
+
+    Attributes:
+        entity (str): Тип изменённой сущности (core_switch, switch, device ...).
+        action (str): Действие (create, update, delete, sync ...).
+        key (Optional[str]): Ключ изменённой записи. None - изменилось всё по данной сущности.
+        origin (int): WORKER_ID процесса, опубликовавшего уведомление.
+    """
+
+    entity: str
+    action: str
+    key: Optional[str] = None
+    origin: int = 0
+
+    @property
+    def is_local(self) -> bool:
+        return self.origin == WORKER_ID
+
+    def dumps(self) -> str:
+        return json.dumps({"e": self.entity, "a": self.action, "k": self.key, "o": self.origin}, separators=(",", ":"))
+
+    @classmethod
+    def loads(cls, payload: str) -> "ChangeEvent":
+        data = json.loads(payload)
+        return cls(entity=data["e"], action=data["a"], key=data.get("k"), origin=data.get("o", 0))
+
+
+ChangeHandler = Callable[[ChangeEvent], Union[None, Awaitable[None]]]
+
+
+async def publish(session: AsyncSession, entity: str, action: str, key: Optional[object] = None) -> None:
+    """
+    Добавляет уведомление в текущую транзакцию сессии.
+    PostgreSQL доставляет его слушателям только после COMMIT, при ROLLBACK уведомление отбрасывается.
+
+    Args:
+        session (AsyncSession): Сессия, в транзакции которой выполняется запись.
+        entity (str): Тип изменённой сущности.
+        action (str): Действие.
+        key (Optional[object]): Ключ изменённой записи.
+    """
+    if not settings.notify.enabled:
+        return
+
+    key = None if key is None else str(key)
+    if key is not None and len(key) > MAX_KEY_LENGTH:
+        key = None
+
+    event = ChangeEvent(entity=entity, action=action, key=key, origin=WORKER_ID)
+    await session.execute(select(func.pg_notify(settings.notify.channel, event.dumps())))
+
+
+class ChangeListener:
+    """
+    Слушатель уведомлений об изменениях. Держит выделенное asyncpg-соединение с LISTEN
+    и передаёт полученные события подписчикам текущего воркера.
+
+    После каждого (пере)подключения подписчикам рассылается событие resync,
+    так как уведомления, пришедшие во время разрыва, потеряны.
+
+    Закрытие соединения сервером определяется сразу, но полуоткрытое TCP-соединение (сервер
+    перезагружен, разрыв на промежуточном узле) молчит, и LISTEN просто перестаёт получать уведомления.
+    Поэтому соединение проверяется запросом SELECT 1 раз в keepalive_interval: нет ответа
+    за keepalive_timeout - соединение считается потерянным и переподключается.
+
+    Params:
+        dsn (str): DSN для подключения через asyncpg.
+        channel (str): Имя канала NOTIFY.
+        reconnect_delay (float): Пауза перед переподключением, в секундах.
+        keepalive_interval (float): Интервал проверки соединения, в секундах.
+        keepalive_timeout (float): Время ожидания ответа на проверку, в секундах.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str,
+        reconnect_delay: float = 5.0,
+        keepalive_interval: float = 30.0,
+        keepalive_timeout: float = 10.0,
+    ) -> None:
+        self.dsn = dsn
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.keepalive_interval = keepalive_interval
+        self.keepalive_timeout = keepalive_timeout
+        self._handlers: Dict[str, List[ChangeHandler]] = {}
+        self._pending: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._connection: Optional[asyncpg.Connection] = None
+
+    def subscribe(self, entity: str, handler: ChangeHandler) -> None:
+        """
+        Регистрирует обработчик событий сущности. entity="*" - все события.
+
+        Args:
+            entity (str): Тип сущности.
+            handler (ChangeHandler): Синхронная или асинхронная функция, принимающая ChangeEvent.
+        """
+        self._handlers.setdefault(entity, []).append(handler)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._pending):
+            task.cancel()
+
+    def dispatch(self, event: ChangeEvent) -> None:
+        """
+        Передаёт событие подписчикам. Асинхронные обработчики запускаются отдельными задачами.
+
+        Args:
+            event (ChangeEvent): Событие.
+        """
+        if event.entity == ALL_ENTITIES:
+            handlers = [handler for entity_handlers in self._handlers.values() for handler in entity_handlers]
+        else:
+            handlers = self._handlers.get(event.entity, []) + self._handlers.get(ALL_ENTITIES, [])
+
+        for handler in handlers:
+            try:
+                result = handler(event)
+            except Exception:
+                logger.exception("Change handler failed for %s", event)
+                continue
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(result)
+                self._pending.add(task)
+                task.add_done_callback(self._pending.discard)
+
+    def _on_notify(self, connection: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = ChangeEvent.loads(payload)
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Malformed change notification: %r", payload)
+            return
+        self.dispatch(event)
+
+    async def _watch(self, connection: asyncpg.Connection, lost: asyncio.Event) -> None:
+        """
+        Ждёт потери соединения, проверяя его запросом SELECT 1 раз в keepalive_interval.
+        Ожидание построено на asyncio.wait: asyncio.wait_for до Python 3.12 может потерять отмену,
+        если ожидаемое завершилось одновременно с ней, и stop() ждал бы цикл вечно.
+
+        Raises:
+            asyncio.TimeoutError: Соединение не ответило на проверку за keepalive_timeout.
+        """
+        lost_waiter = asyncio.ensure_future(lost.wait())
+        check: Optional[asyncio.Future] = None
+        try:
+            while True:
+                done, _ = await asyncio.wait({lost_waiter}, timeout=self.keepalive_interval)
+                if done:
+                    return
+                check = asyncio.ensure_future(connection.fetchval("SELECT 1"))
+                answered, _ = await asyncio.wait({check}, timeout=self.keepalive_timeout)
+                if not answered:
+                    raise asyncio.TimeoutError()
+                check.result()
+        finally:
+            lost_waiter.cancel()
+            if check is not None:
+                check.cancel()
+
+    async def _run(self) -> None:
+        while True:
+            lost = asyncio.Event()
+            try:
+                self._connection = await asyncpg.connect(self.dsn)
+                self._connection.add_termination_listener(lambda connection: lost.set())
+                await self._connection.add_listener(self.channel, self._on_notify)
+                self.dispatch(ChangeEvent(entity=ALL_ENTITIES, action=RESYNC_ACTION, origin=WORKER_ID))
+                await self._watch(self._connection, lost)
+                logger.warning("LISTEN connection on %s lost", self.channel)
+            except asyncio.TimeoutError:
+                logger.warning("LISTEN connection on %s did not answer the liveness check", self.channel)
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as exc:
+                logger.warning("LISTEN connection on %s failed: %s", self.channel, exc)
+            except Exception:
+                # Любая ошибка только переподключает LISTEN: без него кэш ответов и очередь задач
+                # перестают получать изменения. После переподключения подписчикам уходит RESYNC.
+                logger.exception("LISTEN connection on %s failed", self.channel)
+            finally:
+                if self._connection is not None and not self._connection.is_closed():
+                    self._connection.terminate()
+                self._connection = None
+            await asyncio.sleep(self.reconnect_delay)
+
+
+change_listener = ChangeListener(
+    dsn=settings.db.dsn,
+    channel=settings.notify.channel,
+    reconnect_delay=settings.notify.reconnect_delay,
+    keepalive_interval=settings.notify.keepalive_interval,
+    keepalive_timeout=settings.notify.keepalive_timeout,
+)
@@ -0,0 +1,6 @@
+__all__ = (
+    "OuiIndex",
+    "oui_index",
+)
+
+from .index import OuiIndex, oui_index
@@ -0,0 +1,118 @@
+import csv
+import logging
+import os
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Блоки реестра IEEE: длина префикса в битах по количеству hex-цифр поля Assignment.
+# MA-L (OUI, 24 бита), MA-M (28 бит), MA-S (OUI-36, 36 бит).
+PREFIX_BITS = {6: 24, 7: 28, 9: 36}
+
+# Более длинные префиксы проверяются первыми: блоки MA-M/MA-S выделены внутри OUI владельца реестра.
+LOOKUP_ORDER = (36, 28, 24)
+
+
+class OuiIndex:
+    """
+    Индекс производителей сетевых карт по префиксу MAC-адреса из реестра IEEE (oui.csv, mam.csv, oui36.csv).
+
+    Для каждой длины префикса хранятся два параллельных отсортированных массива: префиксы (array 'Q')
+    и номера производителей (array 'I') в списке уникальных названий. Поиск - бинарный поиск по массиву,
+    без объектов на каждую запись: весь реестр (~50 тыс. блоков) занимает несколько МБ,
+    в основном под строки названий.
+    """
+
+    def __init__(self) -> None:
+        self._prefixes: Dict[int, "array[int]"] = {bits: array("Q") for bits in LOOKUP_ORDER}
+        self._vendor_ids: Dict[int, "array[int]"] = {bits: array("I") for bits in LOOKUP_ORDER}
+        self._vendors: List[str] = []
+
+    def __len__(self) -> int:
+        return sum(len(prefixes) for prefixes in self._prefixes.values())
+
+    def build(self, entries: Iterable[Tuple[str, str]]) -> None:
+        """
+        Строит индекс заново.
+
+        Args:
+            entries (Iterable[Tuple[str, str]]): Пары (Assignment в hex, название организации).
+        """
+        vendor_ids: Dict[str, int] = {}
+        vendors: List[str] = []
+        blocks: Dict[int, Dict[int, int]] = {bits: {} for bits in LOOKUP_ORDER}
+        for assignment, organization in entries:
+            assignment = assignment.strip().replace("-", "").replace(":", "")
+            bits = PREFIX_BITS.get(len(assignment))
+            if bits is None:
+                continue
+            try:
+                prefix = int(assignment, 16)
+            except ValueError:
+                continue
+            organization = " ".join(organization.split())
+            vendor_id = vendor_ids.get(organization)
+            if vendor_id is None:
+                vendor_id = vendor_ids[organization] = len(vendors)
+                vendors.append(organization)
+            blocks[bits][prefix] = vendor_id
+
+        for bits, block in blocks.items():
+            prefixes = sorted(block)
+            self._prefixes[bits] = array("Q", prefixes)
+            self._vendor_ids[bits] = array("I", (block[prefix] for prefix in prefixes))
+        self._vendors = vendors
+
+    def load(self, paths: Iterable[str]) -> None:
+        """
+        Загружает индекс из CSV-файлов реестра IEEE (колонки Registry, Assignment, Organization Name, ...).
+
+        Raises:
+            FileNotFoundError: Один из указанных файлов не найден: настроенный, но отсутствующий реестр -
+                ошибка конфигурации, а не тихое отключение определения производителя.
+        """
+        paths = list(paths)
+        missing = [path for path in paths if not os.path.exists(path)]
+        if missing:
+            raise FileNotFoundError(f"OUI registry files not found: {', '.join(missing)} (settings.oui.paths)")
+
+        def rows() -> Iterable[Tuple[str, str]]:
+            for path in paths:
+                with open(path, newline="", encoding="utf-8") as file:
+                    for row in csv.DictReader(file):
+                        assignment, organization = row.get("Assignment"), row.get("Organization Name")
+                        if assignment and organization:
+                            yield assignment, organization
+
+        self.build(rows())
+        logger.info("OUI index: %d blocks, %d vendors", len(self), len(self._vendors))
+
+    def lookup(self, mac: Optional[str]) -> Optional[str]:
+        """
+        Производитель по MAC-адресу в любом формате с разделителями или без.
+
+        Returns:
+            Optional[str]: Название организации из реестра или None.
+        """
+        if not mac or not self._vendors:
+            return None
+        digits = mac.replace(":", "").replace("-", "").replace(".", "")
+        if len(digits) != 12:
+            return None
+        try:
+            value = int(digits, 16)
+        except ValueError:
+            return None
+
+        for bits in LOOKUP_ORDER:
+            prefixes = self._prefixes[bits]
+            prefix = value >> (48 - bits)
+            position = bisect_left(prefixes, prefix)
+            if position < len(prefixes) and prefixes[position] == prefix:
+                return self._vendors[self._vendor_ids[bits][position]]
+        return None
+
+
+oui_index = OuiIndex()
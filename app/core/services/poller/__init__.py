@@ -0,0 +1,9 @@
+__all__ = (
+    "Poller",
+    "TopologyCrawler",
+    "poller",
+    "topology_crawler",
+)
+
+from .discovery import TopologyCrawler, topology_crawler
+from .poller import Poller, poller
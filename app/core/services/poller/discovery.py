@@ -0,0 +1,276 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from core.config import settings
+from core.models import CoreSwitch, db_helper
+from core.services.crud.crud_switch import CrudSwitch
+from core.services.snmp import SnmpBase, SnmpError, SnmpProfile, get_snmp_client, snmp_profiles
+from core.services.snmp.snmp_base import Oid, oid_to_tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .journal import ProgressCallback
+from .oids import (
+    LLDP_CAP_BRIDGE,
+    LLDP_CAP_TELEPHONE,
+    LLDP_CAP_WLAN_AP,
+    LLDP_REM_MAN_ADDR_IF_SUBTYPE,
+    LLDP_REM_SYS_CAP_ENABLED,
+    LLDP_REM_SYS_NAME,
+    lldp_neighbor_key,
+    parse_lldp_man_addr,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DiscoveredSwitch:
+    """
+    Коммутатор, найденный обходом LLDP.
+
+    Attributes:
+        ip_address (str): Адрес управления из LLDP.
+        core_switch_ip (str): Опорный коммутатор, от которого коммутатор найден кратчайшим путём.
+        name (Optional[str]): Имя системы из LLDP (lldpRemSysName).
+        depth (int): Расстояние от опорного коммутатора, в переходах.
+    """
+
+    ip_address: str
+    core_switch_ip: str
+    name: Optional[str] = None
+    depth: int = 0
+
+
+@dataclass
+class DiscoveryResult:
+    """
+    Результат обхода.
+
+    Attributes:
+        switches (List[DiscoveredSwitch]): Ответившие по SNMP коммутаторы (без опорных).
+        unreachable (Dict[str, str]): Адрес -> ошибка для соседей, не ответивших по SNMP.
+        depth (int): Максимальная достигнутая глубина.
+        truncated (bool): Обход остановлен по max_switches.
+    """
+
+    switches: List[DiscoveredSwitch] = field(default_factory=list)
+    unreachable: Dict[str, str] = field(default_factory=dict)
+    depth: int = 0
+    truncated: bool = False
+
+
+class TopologyCrawler:
+    """
+    Обнаружение коммутаторов обходом таблиц соседей LLDP-MIB в ширину от опорных коммутаторов.
+
+    Обход ведут concurrency воркеров из общей очереди: соседи коммутатора ставятся в очередь сразу после
+    его ответа, без ожидания остальных коммутаторов того же уровня, а таблицы соседа читаются параллельно.
+    Поэтому время обхода определяется глубиной сети и RTT, а не количеством коммутаторов.
+    Адрес попадает в очередь один раз. Обходятся только соседи с признаком bridge в lldpRemSysCapEnabled
+    и без признаков telephone и wlanAccessPoint: IP-телефоны и точки доступа со встроенным коммутатором
+    тоже анонсируют bridge. Маршрутизаторы без bridge не обходятся.
+
+    Найденные коммутаторы записываются в switches одним запросом вместе с опорным коммутатором,
+    от которого они найдены. Опорный коммутатор уже существующих в switches записей (в том числе
+    введённых вручную) меняется, только если включён update_core_switch.
+
+    Params:
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий.
+        concurrency (int): Максимальное количество одновременно опрашиваемых коммутаторов.
+        max_depth (int): Максимальная глубина обхода от опорного коммутатора.
+        max_switches (int): Максимальное количество адресов в обходе.
+        max_repetitions (int): Начальное значение max-repetitions для GETBULK.
+        retries (int): Количество повторов SNMP-запросов к соседям.
+        update_core_switch (bool): Переносить существующие коммутаторы на опорный коммутатор, найденный обходом.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        concurrency: int = 32,
+        max_depth: int = 16,
+        max_switches: int = 5000,
+        max_repetitions: int = 25,
+        retries: int = 1,
+        update_core_switch: bool = False,
+    ) -> None:
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.max_depth = max_depth
+        self.max_switches = max_switches
+        self.max_repetitions = max_repetitions
+        self.retries = retries
+        self.update_core_switch = update_core_switch
+
+    async def discover(self, progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """
+        Обходит сеть от всех опорных коммутаторов и записывает найденные коммутаторы.
+
+        Args:
+            progress (Optional[ProgressCallback]): Отчёт о ходе обхода (см. crawl).
+
+        Returns:
+            Dict[str, Any]: Итоги обхода (найдено, добавлено, обновлено, недоступно, глубина).
+        """
+        async with self.session_factory() as session:
+            core_ips = (await session.scalars(select(CoreSwitch.ip_address))).all()
+        result = await self.crawl(core_ips, progress)
+
+        created = updated = 0
+        if result.switches:
+            async with self.session_factory() as session:
+                rows = [
+                    {"ip_address": switch.ip_address, "core_switch_ip": switch.core_switch_ip, "comment": switch.name}
+                    for switch in result.switches
+                ]
+                created, updated = await CrudSwitch(session).upsert_discovered(
+                    rows, update_core_switch=self.update_core_switch
+                )
+        logger.info(
+            "Discovery: %d switches (%d new), %d unreachable, depth %d",
+            len(result.switches),
+            created,
+            len(result.unreachable),
+            result.depth,
+        )
+        return {
+            "discovered": len(result.switches),
+            "created": created,
+            "updated": updated,
+            "unreachable": len(result.unreachable),
+            "depth": result.depth,
+            "truncated": result.truncated,
+        }
+
+    async def crawl(self, core_ips: Sequence[str], progress: Optional[ProgressCallback] = None) -> DiscoveryResult:
+        """
+        Обход в ширину от опорных коммутаторов.
+
+        Args:
+            core_ips (Sequence[str]): IP-адреса опорных коммутаторов.
+            progress (Optional[ProgressCallback]): Вызывается, когда обход переходит на следующий уровень.
+                Если отчёт выбрасывает исключение (отмена задачи), обход останавливается и исключение
+                передаётся дальше.
+
+        Returns:
+            DiscoveryResult: Найденные коммутаторы и недоступные адреса.
+        """
+        result = DiscoveryResult()
+        visited = {str(ip) for ip in core_ips}
+        queue: "asyncio.Queue[DiscoveredSwitch]" = asyncio.Queue()
+        for ip in visited:
+            queue.put_nowait(DiscoveredSwitch(ip_address=ip, core_switch_ip=ip))
+        reported_depth = 0
+
+        async def worker() -> None:
+            nonlocal reported_depth
+            while True:
+                node = await queue.get()
+                # Очередь FIFO: первый коммутатор нового уровня берётся после всех коммутаторов предыдущего.
+                # Ошибка отчёта завершает воркер, и crawl передаёт её дальше.
+                if progress is not None and node.depth > reported_depth:
+                    reported_depth = node.depth
+                    await progress(node.depth / (self.max_depth + 1), f"Crawling LLDP neighbors at depth {node.depth}")
+                try:
+                    self._visit(node, await self.neighbors(node.ip_address), visited, queue, result)
+                except SnmpError as exc:
+                    result.unreachable[node.ip_address] = str(exc)[:500]
+                except Exception as exc:
+                    logger.exception("Discovery of %s failed", node.ip_address)
+                    result.unreachable[node.ip_address] = str(exc)[:500]
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        joined = asyncio.ensure_future(queue.join())
+        try:
+            await asyncio.wait([joined, *workers], return_when=asyncio.FIRST_COMPLETED)
+            for task in workers:
+                if task.done():
+                    task.result()
+        finally:
+            for task in [joined, *workers]:
+                task.cancel()
+            await asyncio.gather(joined, *workers, return_exceptions=True)
+        return result
+
+    def _visit(
+        self,
+        node: DiscoveredSwitch,
+        neighbors: List[Tuple[str, Optional[str]]],
+        visited: Set[str],
+        queue: "asyncio.Queue[DiscoveredSwitch]",
+        result: DiscoveryResult,
+    ) -> None:
+        """
+        Учитывает ответивший коммутатор и ставит в очередь его ещё не посещённых соседей.
+        """
+        if node.depth:
+            result.switches.append(node)
+            result.depth = max(result.depth, node.depth)
+        if node.depth >= self.max_depth:
+            return
+        for ip_address, name in neighbors:
+            if ip_address in visited:
+                continue
+            if len(visited) >= self.max_switches:
+                result.truncated = True
+                return
+            visited.add(ip_address)
+            queue.put_nowait(
+                DiscoveredSwitch(
+                    ip_address=ip_address, core_switch_ip=node.core_switch_ip, name=name, depth=node.depth + 1
+                )
+            )
+
+    async def neighbors(self, ip_address: str) -> List[Tuple[str, Optional[str]]]:
+        """
+        Соседи-коммутаторы по LLDP.
+
+        Returns:
+            List[Tuple[str, Optional[str]]]: Адрес управления IPv4 и имя системы соседа.
+        """
+        profile = snmp_profiles.setdefault(ip_address, SnmpProfile(self.max_repetitions))
+        client = get_snmp_client(ip_address, retries=self.retries, profile=profile)
+        capabilities, names, addresses = await asyncio.gather(
+            self._walk(client, LLDP_REM_SYS_CAP_ENABLED),
+            self._walk(client, LLDP_REM_SYS_NAME),
+            self._walk(client, LLDP_REM_MAN_ADDR_IF_SUBTYPE),
+        )
+        bridges = {
+            lldp_neighbor_key(index)
+            for index, value in capabilities
+            if (octets := bytes(value.asOctets()))
+            and octets[0] & LLDP_CAP_BRIDGE
+            and not octets[0] & (LLDP_CAP_TELEPHONE | LLDP_CAP_WLAN_AP)
+        }
+        system_names = {
+            lldp_neighbor_key(index): bytes(value.asOctets()).decode("utf-8", "replace").strip() or None
+            for index, value in names
+        }
+
+        neighbors: Dict[Tuple[int, int], str] = {}
+        for index, _ in addresses:
+            key = lldp_neighbor_key(index)
+            address = parse_lldp_man_addr(index)
+            if address is not None and key in bridges:
+                neighbors.setdefault(key, address)
+        return [(address, system_names.get(key)) for key, address in neighbors.items()]
+
+    async def _walk(self, client: SnmpBase, oid: str) -> List[Tuple[Oid, Any]]:
+        prefix_length = len(oid_to_tuple(oid))
+        return [(name[prefix_length:], value) async for name, value in client.bulk_walk(oid, self.max_repetitions)]
+
+
+topology_crawler = TopologyCrawler(
+    session_factory=db_helper.session_factory,
+    concurrency=settings.discovery.concurrency,
+    max_depth=settings.discovery.max_depth,
+    max_switches=settings.discovery.max_switches,
+    max_repetitions=settings.poller.max_repetitions,
+    retries=settings.discovery.retries,
+    update_core_switch=settings.discovery.update_core_switch,
+)
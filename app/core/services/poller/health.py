@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Optional
+
+from .targets import SwitchTarget
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker опроса коммутаторов.
+
+    После failure_threshold неудачных опросов подряд коммутатор не опрашивается до next_poll_at;
+    задержка растёт экспоненциально от backoff_base до backoff_max. По истечении задержки выполняется
+    пробный запрос без повторов (half-open): при успехе коммутатор опрашивается полностью.
+
+    Params:
+        failure_threshold (int): Количество неудачных опросов подряд до открытия.
+        backoff_base (timedelta): Начальная задержка.
+        backoff_max (timedelta): Максимальная задержка.
+    """
+
+    def __init__(self, failure_threshold: int, backoff_base: timedelta, backoff_max: timedelta) -> None:
+        self.failure_threshold = failure_threshold
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def state(self, switch: SwitchTarget, now: datetime) -> BreakerState:
+        if switch.consecutive_failures < self.failure_threshold:
+            return BreakerState.CLOSED
+        if switch.next_poll_at is not None and now < switch.next_poll_at:
+            return BreakerState.OPEN
+        return BreakerState.HALF_OPEN
+
+    def next_poll_at(self, failures: int, now: datetime) -> Optional[datetime]:
+        """
+        Время следующего опроса после failures неудачных опросов подряд (None - без задержки).
+        """
+        if failures < self.failure_threshold:
+            return None
+        exponent = min(failures - self.failure_threshold, 16)
+        delay: timedelta = min(self.backoff_base * (2**exponent), self.backoff_max)
+        return now + delay
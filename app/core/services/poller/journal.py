@@ -0,0 +1,113 @@
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+from core.services.snmp.snmp_base import Oid
+
+from .pipeline import timed
+
+# Отчёт о ходе долгой операции (доля от 0 до 1, описание этапа), например JobContext.progress.
+# Исключение из отчёта (отмена задачи) прерывает операцию.
+ProgressCallback = Callable[[float, Optional[str]], Awaitable[None]]
+
+
+@dataclass
+class SwitchPollStats:
+    """
+    Показатели опроса одного коммутатора для журнала опросов (PollRunSwitch).
+
+    Этапы конвейера выполняются одновременно в разных задачах, поэтому время считается по стадиям:
+    walk - ожидание ответов агента (обход в отдельной задаче), decode - работа цепочки
+    декодирования за вычетом ожидания строк от обхода, write - запросы к БД.
+
+    Attributes:
+        switch_id (int): ID коммутатора.
+        ip_address (str): IP-адрес коммутатора.
+        started_at (datetime): Время начала опроса.
+        succeeded (bool): Опрос завершился успешно.
+        error (Optional[str]): Текст ошибки.
+        duration (float): Общая длительность, в секундах.
+        walk_seconds (float): Время обхода SNMP-таблиц.
+        decode_seconds (float): Время декодирования и сопоставления.
+        write_seconds (float): Время записи в БД.
+        varbinds (int): Количество полученных значений таблицы MAC-адресов.
+        rows_inserted (int): Количество добавленных устройств.
+        rows_updated (int): Количество обновлённых устройств.
+        rows_deleted (int): Количество удалённых устройств.
+    """
+
+    switch_id: int
+    ip_address: str
+    started_at: datetime
+    succeeded: bool = False
+    error: Optional[str] = None
+    duration: float = 0.0
+    walk_seconds: float = 0.0
+    decode_seconds: float = 0.0
+    write_seconds: float = 0.0
+    varbinds: int = 0
+    rows_inserted: int = 0
+    rows_updated: int = 0
+    rows_deleted: int = 0
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+    _chain_seconds: float = field(default=0.0, repr=False)
+    _wait_seconds: float = field(default=0.0, repr=False)
+
+    @contextmanager
+    def walking(self) -> Iterator[None]:
+        """
+        Замер запросов к агенту вне обхода таблицы MAC-адресов (состояние портов, LLDP).
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.walk_seconds += time.perf_counter() - started
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.write_seconds += time.perf_counter() - started
+
+    async def walk(self, source: AsyncIterator[Tuple[Oid, Any]]) -> AsyncIterator[Tuple[Oid, Any]]:
+        """
+        Стадия обхода: время ожидания агента и количество значений.
+        """
+        async for item in timed(source, self._add_walk):
+            self.varbinds += 1
+            yield item
+
+    def rows(self, source: AsyncIterator[Tuple[Oid, Any]]) -> AsyncIterator[Tuple[Oid, Any]]:
+        """
+        Вход цепочки декодирования: время ожидания строк от обхода вычитается из decode.
+        """
+        return timed(source, self._add_wait)
+
+    def chain(self, source: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        """
+        Выход цепочки декодирования: полное время её работы.
+        """
+        return timed(source, self._add_chain)
+
+    def finish(self, error: Optional[str] = None) -> None:
+        self.succeeded = error is None
+        self.error = error[:500] if error else None
+        self.duration = time.perf_counter() - self._started
+        self.decode_seconds = max(self._chain_seconds - self._wait_seconds, 0.0)
+
+    def as_row(self) -> Dict[str, Any]:
+        return {key: value for key, value in asdict(self).items() if not key.startswith("_")}
+
+    def _add_walk(self, seconds: float) -> None:
+        self.walk_seconds += seconds
+
+    def _add_chain(self, seconds: float) -> None:
+        self._chain_seconds += seconds
+
+    def _add_wait(self, seconds: float) -> None:
+        self._wait_seconds += seconds
@@ -0,0 +1,97 @@
+from typing import Any, Optional, Tuple
+
+from core.services.snmp.snmp_base import Oid
+
+# SNMPv2-MIB
+SYS_OBJECT_ID = "1.3.6.1.2.1.1.2.0"
+SYS_UPTIME = "1.3.6.1.2.1.1.3.0"
+
+# IF-MIB
+IF_OPER_STATUS = "1.3.6.1.2.1.2.2.1.8"
+IF_LAST_CHANGE = "1.3.6.1.2.1.2.2.1.9"
+IF_TABLE_LAST_CHANGE = "1.3.6.1.2.1.31.1.5.0"
+IF_OPER_STATUS_UP = 1
+
+# BRIDGE-MIB: номер порта моста -> ifIndex
+DOT1D_BASE_PORT_IF_INDEX = "1.3.6.1.2.1.17.1.4.1.2"
+
+# LLDP-MIB: lldpRemSysCapEnabled, индекс <timeMark>.<lldpRemLocalPortNum>.<lldpRemIndex>.
+# Номер локального порта LLDP совпадает с номером порта моста (LLDP-MIB, LldpPortNumber).
+LLDP_REM_SYS_CAP_ENABLED = "1.0.8802.1.1.2.1.4.1.1.12"
+# Биты LldpSystemCapabilitiesMap (старший бит первого октета - бит 0):
+# bridge(2), wlanAccessPoint(3), router(4), telephone(5).
+LLDP_CAP_BRIDGE = 0x20
+LLDP_CAP_WLAN_AP = 0x10
+LLDP_CAP_ROUTER = 0x08
+LLDP_CAP_TELEPHONE = 0x04
+# lldpRemSysName, индекс как у lldpRemSysCapEnabled.
+LLDP_REM_SYS_NAME = "1.0.8802.1.1.2.1.4.1.1.9"
+# lldpRemManAddrIfSubtype, индекс <timeMark>.<lldpRemLocalPortNum>.<lldpRemIndex>.<addrSubtype>.<addrLen>.<addr>.
+LLDP_REM_MAN_ADDR_IF_SUBTYPE = "1.0.8802.1.1.2.1.4.2.1.3"
+# IANA AddressFamilyNumbers: ipV4(1).
+LLDP_ADDR_IPV4 = 1
+
+
+def format_mac(octets: Any) -> str:
+    """
+    MAC-адрес из последовательности октетов в каноническом виде aa:bb:cc:dd:ee:ff.
+    """
+    return ":".join(f"{octet:02x}" for octet in octets)
+
+
+def parse_fdb_index(index: Oid) -> Tuple[int, str]:
+    """
+    Разбирает индекс строки dot1qTpFdbPort (<fdbId>.<6 октетов MAC>) или dot1dTpFdbPort (<6 октетов MAC>).
+
+    Returns:
+        Tuple[int, str]: VLAN (fdbId, 0 для dot1dTpFdbPort) и MAC-адрес.
+    """
+    vlan = index[-7] if len(index) >= 7 else 0
+    return vlan, format_mac(index[-6:])
+
+
+def parse_arp_entry(index: Oid, value: Any) -> Optional[Tuple[str, str]]:
+    """
+    Разбирает строку ipNetToMediaPhysAddress (<ifIndex>.<4 октета IP> = MAC).
+
+    Returns:
+        Optional[Tuple[str, str]]: MAC-адрес и IP-адрес, None для записей без MAC.
+    """
+    octets = bytes(value.asOctets())
+    if len(octets) != 6:
+        return None
+    return format_mac(octets), ".".join(str(part) for part in index[-4:])
+
+
+def parse_lldp_neighbor(index: Oid, value: Any) -> Optional[int]:
+    """
+    Разбирает строку lldpRemSysCapEnabled.
+
+    Returns:
+        Optional[int]: Локальный порт, если сосед - коммутатор или маршрутизатор, иначе None
+        (конечные устройства тоже анонсируют LLDP; IP-телефоны со встроенным коммутатором для ПК
+        анонсируют Bridge и Telephone).
+    """
+    octets = bytes(value.asOctets())
+    if not octets or octets[0] & LLDP_CAP_TELEPHONE or not octets[0] & (LLDP_CAP_BRIDGE | LLDP_CAP_ROUTER):
+        return None
+    return index[-2]
+
+
+def lldp_neighbor_key(index: Oid) -> Tuple[int, int]:
+    """
+    Ключ соседа LLDP (lldpRemLocalPortNum, lldpRemIndex) из индекса строк lldpRemTable и lldpRemManAddrTable.
+    """
+    return index[1], index[2]
+
+
+def parse_lldp_man_addr(index: Oid) -> Optional[str]:
+    """
+    Разбирает индекс строки lldpRemManAddrIfSubtype.
+
+    Returns:
+        Optional[str]: IPv4 адрес управления соседа, None для адресов других семейств.
+    """
+    if len(index) != 9 or index[3] != LLDP_ADDR_IPV4 or index[4] != 4:
+        return None
+    return ".".join(str(part) for part in index[5:])
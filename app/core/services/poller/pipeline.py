@@ -0,0 +1,211 @@
+import asyncio
+import time
+from collections import defaultdict
+from concurrent.futures import Executor
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, FrozenSet, List, Set, Tuple, TypeVar
+
+from core.services.snmp.snmp_base import Oid
+
+from .oids import parse_fdb_index
+
+T = TypeVar("T")
+
+_END = object()
+
+
+class _Failure:
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+async def buffered(source: AsyncIterator[T], maxsize: int) -> AsyncIterator[T]:
+    """
+    Выполняет источник в отдельной задаче и передаёт элементы через ограниченную очередь.
+    Когда потребитель не успевает, очередь заполняется и источник приостанавливается (backpressure).
+    Ошибка источника выбрасывается у потребителя.
+
+    Args:
+        source (AsyncIterator[T]): Источник.
+        maxsize (int): Размер очереди.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    async def pump() -> None:
+        try:
+            async for item in source:
+                await queue.put(item)
+        except Exception as exc:
+            await queue.put(_Failure(exc))
+            return
+        await queue.put(_END)
+
+    task = asyncio.create_task(pump())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.exc
+            yield item
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+
+async def timed(source: AsyncIterator[T], add: Callable[[float], None]) -> AsyncIterator[T]:
+    """
+    Передаёт элементы источника, суммируя через add время ожидания каждого элемента.
+    Замеряет только источник: время потребителя между элементами не учитывается.
+    """
+    iterator = source.__aiter__()
+    while True:
+        started = time.perf_counter()
+        try:
+            item = await iterator.__anext__()
+        except StopAsyncIteration:
+            add(time.perf_counter() - started)
+            return
+        add(time.perf_counter() - started)
+        yield item
+
+
+async def decode_fdb(rows: AsyncIterator[Tuple[Oid, Any]], prefix_length: int) -> AsyncIterator[Tuple[int, str, int]]:
+    """
+    Varbind'ы таблицы MAC-адресов -> (vlan, mac, port).
+    """
+    async for name, value in rows:
+        vlan, mac = parse_fdb_index(name[prefix_length:])
+        yield vlan, mac, int(value)
+
+
+async def exclude_ports(
+    entries: AsyncIterator[Tuple[int, str, int]], excluded_ports: FrozenSet[int]
+) -> AsyncIterator[Tuple[int, str, int]]:
+    async for vlan, mac, port in entries:
+        if port not in excluded_ports:
+            yield vlan, mac, port
+
+
+def device_row(vlan: int, mac: str, port: int, arp: Dict[str, str], port_status: Dict[int, bool]) -> Dict[str, Any]:
+    return {
+        "mac": mac,
+        "ip_address": arp.get(mac),
+        "port": port,
+        "vlan": vlan,
+        "status": port_status.get(port, False),
+    }
+
+
+async def correlate(
+    entries: AsyncIterator[Tuple[int, str, int]],
+    arp: Dict[str, str],
+    port_status: Dict[int, bool],
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Дополняет записи IP-адресом из ARP-таблицы и состоянием порта.
+    """
+    async for vlan, mac, port in entries:
+        yield device_row(vlan, mac, port, arp, port_status)
+
+
+async def batched(devices: AsyncIterator[Dict[str, Any]], batch_size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Группирует устройства в пачки по batch_size. Внутри пачки MAC-адрес уникален
+    (один MAC может встречаться в нескольких VLAN): остаётся последняя строка, как и между пачками,
+    где её запись перекрывает предыдущую.
+    """
+    batch: Dict[str, Dict[str, Any]] = {}
+    async for device in devices:
+        batch[device["mac"]] = device
+        if len(batch) >= batch_size:
+            yield list(batch.values())
+            batch = {}
+    if batch:
+        yield list(batch.values())
+
+
+@dataclass(frozen=True)
+class DecodedChunk:
+    """
+    Пачка строк таблицы MAC-адресов, декодированная в процессе пула.
+
+    Attributes:
+        entries (List[Tuple[int, str, int]]): Записи (vlan, mac, port) с уникальными MAC, без исключенных портов.
+        port_macs (Dict[int, List[str]]): Порт -> различные MAC-адреса пачки на порту, до фильтра портов.
+        switch_mac_ports (FrozenSet[int]): Порты, на которых видны MAC-адреса известных коммутаторов.
+    """
+
+    entries: List[Tuple[int, str, int]]
+    port_macs: Dict[int, List[str]]
+    switch_mac_ports: FrozenSet[int]
+
+
+def decode_fdb_chunk(
+    rows: List[Tuple[Oid, int]], excluded_ports: FrozenSet[int], switch_macs: FrozenSet[str]
+) -> DecodedChunk:
+    """
+    Декодирует пачку строк (индекс dot1qTpFdbPort, порт): то же, что decode_fdb, UplinkDetector.observe,
+    exclude_ports и batched для одной пачки. Выполняется в процессе пула, аргументы и результат -
+    только встроенные типы.
+    """
+    entries: Dict[str, Tuple[int, str, int]] = {}
+    port_macs: Dict[int, Set[str]] = defaultdict(set)
+    switch_mac_ports = set()
+    for index, port in rows:
+        vlan, mac = parse_fdb_index(index)
+        port_macs[port].add(mac)
+        if mac in switch_macs:
+            switch_mac_ports.add(port)
+        if port not in excluded_ports:
+            entries[mac] = (vlan, mac, port)
+    return DecodedChunk(
+        list(entries.values()), {port: list(macs) for port, macs in port_macs.items()}, frozenset(switch_mac_ports)
+    )
+
+
+async def decode_fdb_offloaded(
+    rows: AsyncIterator[Tuple[Oid, Any]],
+    prefix_length: int,
+    executor: Executor,
+    chunk_size: int,
+    excluded_ports: FrozenSet[int],
+    switch_macs: FrozenSet[str],
+) -> AsyncIterator[DecodedChunk]:
+    """
+    Varbind'ы таблицы MAC-адресов -> пачки, декодированные в executor (decode_fdb_chunk).
+    В event loop остаётся только отрезание префикса OID и int() значения.
+
+    Args:
+        rows (AsyncIterator[Tuple[Oid, Any]]): Varbind'ы таблицы MAC-адресов.
+        prefix_length (int): Длина OID таблицы.
+        executor (Executor): Пул процессов.
+        chunk_size (int): Количество строк в пачке.
+        excluded_ports (FrozenSet[int]): Исключаемые порты.
+        switch_macs (FrozenSet[str]): MAC-адреса известных коммутаторов.
+    """
+    loop = asyncio.get_running_loop()
+    chunk: List[Tuple[Oid, int]] = []
+    async for name, value in rows:
+        chunk.append((name[prefix_length:], int(value)))
+        if len(chunk) >= chunk_size:
+            yield await loop.run_in_executor(executor, decode_fdb_chunk, chunk, excluded_ports, switch_macs)
+            chunk = []
+    if chunk:
+        yield await loop.run_in_executor(executor, decode_fdb_chunk, chunk, excluded_ports, switch_macs)
+
+
+async def correlate_batches(
+    chunks: AsyncIterator[List[Tuple[int, str, int]]],
+    arp: Dict[str, str],
+    port_status: Dict[int, bool],
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    correlate для пачек записей с уникальными MAC. Сопоставление с ARP выполняется в event loop:
+    передача ARP-таблицы опорного коммутатора в процесс пула с каждой пачкой дороже поиска в словаре.
+    """
+    async for entries in chunks:
+        yield [device_row(vlan, mac, port, arp, port_status) for vlan, mac, port in entries]
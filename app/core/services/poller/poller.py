@@ -0,0 +1,548 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, FrozenSet, List, Optional
+
+from core.config import settings
+from core.models import db_helper
+from core.services.crud.crud_device import CrudDevice
+from core.services.crud.crud_poll_run import CrudPollRun
+from core.services.crud.crud_switch import CrudSwitch
+from core.services.snmp import SnmpBase, SnmpError, SnmpProfile, get_snmp_client, snmp_profiles
+from core.services.snmp.snmp_base import oid_to_tuple
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .health import BreakerState, CircuitBreaker
+from .journal import ProgressCallback, SwitchPollStats
+from .oids import (
+    LLDP_REM_SYS_CAP_ENABLED,
+    SYS_OBJECT_ID,
+    SYS_UPTIME,
+    parse_arp_entry,
+    parse_lldp_neighbor,
+)
+from .pipeline import (
+    batched,
+    buffered,
+    correlate,
+    correlate_batches,
+    decode_fdb,
+    decode_fdb_offloaded,
+    exclude_ports,
+)
+from .port_status import PortStatusTracker
+from .single_flight import SingleFlight
+from .targets import CoreSwitchTarget, SwitchTarget, load_switch_ips, load_targets
+from .uplinks import UplinkDetector, switch_macs
+
+logger = logging.getLogger(__name__)
+
+# Ключ advisory-lock: обход сети выполняет только один воркер из нескольких.
+POLLER_LOCK_ID = 0x6E76706C
+
+
+class Poller:
+    """
+    Опрос коммутаторов по SNMP и синхронизация таблицы устройств.
+
+    Для каждого опорного коммутатора читается ARP-таблица (MAC -> IP), затем параллельно опрашиваются
+    подключенные коммутаторы: таблица MAC-адресов (Switch.snmp_oid), состояние портов (IF-MIB).
+    Устройства на исключенных портах пропускаются. Кроме исключенных вручную, при каждом опросе определяются
+    uplink/trunk порты (UplinkDetector): LLDP-сосед - коммутатор, MAC-адрес другого коммутатора на порту
+    или количество MAC-адресов больше порога. Они хранятся отдельно (SwitchUplinkPort) и тоже пропускаются.
+
+    Опрос коммутатора - конвейер асинхронных генераторов: обход -> декодирование -> фильтр портов ->
+    сопоставление с ARP -> запись пачками. Между сетью, обработкой и БД стоят ограниченные очереди,
+    поэтому пиковая память определяется batch_size, а не размером таблиц. Каждая пачка записывается
+    своей короткой транзакцией: соединение с БД не удерживается на время ответов агента. При decode_processes > 0
+    декодирование индексов, подсчёт для UplinkDetector и фильтр портов выполняются пачками в пуле процессов
+    (decode_fdb_offloaded), и сотни одновременных обходов не занимают event loop обработчиков API.
+
+    Каждый обход и опрос по запросу записывается в журнал (PollRun) с показателями и разбивкой времени
+    по этапам для каждого коммутатора (PollRunSwitch).
+
+    Для каждого агента ведётся профиль возможностей (SnmpProfile): max-repetitions подстраивается
+    по ответам, чтобы обход занимал меньше PDU без tooBig и таймаутов. Профиль коммутатора
+    сохраняется в БД рядом с Switch.snmp_oid при успешном опросе.
+
+    Params:
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий.
+        concurrency (int): Максимальное количество одновременно опрашиваемых коммутаторов.
+        core_concurrency (int): Максимальное количество одновременно обрабатываемых опорных коммутаторов.
+        batch_size (int): Размер пачки устройств при записи в БД.
+        max_repetitions (int): Начальное значение max-repetitions для GETBULK.
+        retention (timedelta): Срок хранения устройств, отсутствующих в таблице MAC-адресов.
+        breaker (Optional[CircuitBreaker]): Circuit breaker для недоступных коммутаторов.
+        uplink_mac_threshold (int): Порог количества MAC-адресов на uplink порту (0 - не проверять).
+        uplink_lldp (bool): Определять uplink порты по LLDP.
+        journal_retention (timedelta): Срок хранения журнала опросов.
+        decode_processes (int): Количество процессов для декодирования таблиц MAC-адресов (0 - в event loop).
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        concurrency: int = 50,
+        core_concurrency: int = 4,
+        batch_size: int = 1000,
+        max_repetitions: int = 25,
+        retention: timedelta = timedelta(days=30),
+        breaker: Optional[CircuitBreaker] = None,
+        uplink_mac_threshold: int = 32,
+        uplink_lldp: bool = True,
+        journal_retention: timedelta = timedelta(days=14),
+        decode_processes: int = 0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_repetitions = max_repetitions
+        self.retention = retention
+        self.uplink_mac_threshold = uplink_mac_threshold
+        self.uplink_lldp = uplink_lldp
+        self.journal_retention = journal_retention
+        self.decode_processes = decode_processes
+        self.port_status = PortStatusTracker()
+        self.breaker = breaker or CircuitBreaker(
+            failure_threshold=3, backoff_base=timedelta(minutes=5), backoff_max=timedelta(hours=6)
+        )
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._core_semaphore = asyncio.Semaphore(core_concurrency)
+        self._demand_flights: SingleFlight[SwitchTarget] = SingleFlight()
+        self._switch_flights: SingleFlight[SwitchPollStats] = SingleFlight()
+        self._arp_flights: SingleFlight[Dict[str, str]] = SingleFlight()
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def start(self, interval: int) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def decode_executor(self) -> Optional[ProcessPoolExecutor]:
+        """
+        Пул процессов декодирования, создаётся при первом опросе. Процессы запускаются через spawn:
+        fork процесса с работающим event loop и потоками небезопасен.
+        """
+        if self.decode_processes <= 0:
+            return None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.decode_processes, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def _run(self, interval: int) -> None:
+        while True:
+            try:
+                await self.sweep_exclusive()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Poll sweep failed")
+            await asyncio.sleep(interval)
+
+    async def sweep_exclusive(self, progress: Optional[ProgressCallback] = None) -> bool:
+        """
+        Полный обход под advisory-lock POLLER_LOCK_ID: одновременно обход выполняет только один воркер,
+        будь то периодический обход или задача очереди.
+
+        Args:
+            progress (Optional[ProgressCallback]): Отчёт о ходе обхода (см. sweep).
+
+        Returns:
+            bool: False, если обход уже выполняется и блокировка занята.
+        """
+        async with db_helper.engine.connect() as connection:
+            # Блокировка уровня сессии переживает commit, соединение не висит в открытой транзакции.
+            locked = await connection.scalar(select(func.pg_try_advisory_lock(POLLER_LOCK_ID)))
+            await connection.commit()
+            if not locked:
+                return False
+            try:
+                await self.sweep(progress)
+            finally:
+                await connection.scalar(select(func.pg_advisory_unlock(POLLER_LOCK_ID)))
+                await connection.commit()
+        return True
+
+    async def sweep(self, progress: Optional[ProgressCallback] = None) -> None:
+        """
+        Полный обход всех коммутаторов.
+
+        Args:
+            progress (Optional[ProgressCallback]): Вызывается после каждого опрошенного опорного коммутатора.
+                Если отчёт выбрасывает исключение (отмена задачи), ещё не начатые опорные коммутаторы
+                не опрашиваются, а исключение передаётся дальше.
+        """
+        async with self.session_factory() as session:
+            core_switches = await load_targets(session)
+            switch_ips = await load_switch_ips(session)
+        run_id = await self.start_run("sweep")
+        tasks = [
+            asyncio.ensure_future(self.poll_core_switch(core_switch, switch_ips, run_id))
+            for core_switch in core_switches
+        ]
+        try:
+            for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+                await task
+                if progress is not None:
+                    await progress(done / len(tasks), f"Polled {done} of {len(tasks)} core switches")
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.finish_run(run_id)
+
+    async def start_run(self, kind: str) -> int:
+        async with self.session_factory() as session:
+            return await CrudPollRun(session).start_run(kind, started_at=datetime.now(timezone.utc))
+
+    async def finish_run(self, run_id: int) -> None:
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session:
+            await CrudPollRun(session).finish_run(run_id, finished_at=now, purge_before=now - self.journal_retention)
+
+    async def record_run_switch(self, run_id: int, stats: SwitchPollStats) -> None:
+        async with self.session_factory() as session:
+            await CrudPollRun(session).record_switch(run_id, stats.as_row())
+
+    async def poll_core_switch(
+        self, core_switch: CoreSwitchTarget, switch_ips: FrozenSet[str], run_id: Optional[int] = None
+    ) -> None:
+        async with self._core_semaphore:
+            try:
+                arp = await self.read_arp(core_switch)
+            except SnmpError as exc:
+                logger.warning("ARP poll of core switch %s failed: %s", core_switch.ip_address, exc)
+                arp = {}
+            macs = switch_macs(arp, switch_ips)
+            await asyncio.gather(
+                *[self._poll_switch_safe(switch, arp, macs, run_id) for switch in core_switch.switches]
+            )
+
+    async def poll_on_demand(self, switch_ip: str, max_age: timedelta) -> SwitchTarget:
+        """
+        Опрос одного коммутатора по запросу. Одновременные запросы по одному коммутатору (и ARP-таблице
+        его опорного коммутатора) выполняются одним опросом; если последний успешный опрос моложе
+        max_age, коммутатор не опрашивается. Если коммутатор в этот момент опрашивается обходом,
+        запрос ждёт результат этого опроса.
+
+        Args:
+            switch_ip (str): IP-адрес коммутатора.
+            max_age (timedelta): Допустимый возраст данных.
+
+        Returns:
+            SwitchTarget: Опрошенный коммутатор.
+
+        Raises:
+            LookupError: Коммутатор не найден.
+            SnmpError: Коммутатор не ответил или не опрашивается до истечения задержки circuit breaker.
+        """
+        return await self._demand_flights.run(switch_ip, lambda: self._poll_on_demand(switch_ip, max_age))
+
+    async def _poll_on_demand(self, switch_ip: str, max_age: timedelta) -> SwitchTarget:
+        async with self.session_factory() as session:
+            core_switches = await load_targets(session, switch_ip=switch_ip)
+            switch_ips = await load_switch_ips(session)
+        if not core_switches or not core_switches[0].switches:
+            raise LookupError(f"Switch: {switch_ip} not found")
+        core_switch = core_switches[0]
+        switch = core_switch.switches[0]
+
+        now = datetime.now(timezone.utc)
+        if switch.last_success is not None and now - switch.last_success < max_age:
+            return switch
+        state = self.breaker.state(switch, now)
+        if state is BreakerState.OPEN:
+            raise SnmpError(
+                f"{switch.ip_address}: {switch.consecutive_failures} failed polls, next poll at {switch.next_poll_at}"
+            )
+
+        try:
+            arp = await self._arp_flights.run(core_switch.ip_address, lambda: self.read_arp(core_switch))
+        except SnmpError as exc:
+            logger.warning("ARP poll of core switch %s failed: %s", core_switch.ip_address, exc)
+            arp = {}
+        macs = switch_macs(arp, switch_ips)
+
+        async def poll() -> SwitchPollStats:
+            run_id = await self.start_run("on_demand")
+            try:
+                return await self._poll_and_record(switch, arp, macs, state, run_id)
+            finally:
+                await self.finish_run(run_id)
+
+        stats = await self._switch_flights.run(switch.id, poll)
+        if not stats.succeeded:
+            raise SnmpError(stats.error or f"{switch.ip_address}: poll failed")
+        return switch
+
+    async def read_arp(self, core_switch: CoreSwitchTarget) -> Dict[str, str]:
+        """
+        Returns:
+            Dict[str, str]: MAC-адрес -> IP-адрес из ARP-таблицы опорного коммутатора.
+        """
+        arp: Dict[str, str] = {}
+        prefix_length = len(oid_to_tuple(core_switch.snmp_oid))
+        async with self._semaphore:
+            profile = snmp_profiles.setdefault(core_switch.ip_address, SnmpProfile(self.max_repetitions))
+            client = get_snmp_client(core_switch.ip_address, profile=profile)
+            async for name, value in client.bulk_walk(core_switch.snmp_oid, self.max_repetitions):
+                entry = parse_arp_entry(name[prefix_length:], value)
+                if entry is not None:
+                    arp[entry[0]] = entry[1]
+        return arp
+
+    async def read_lldp(self, client: SnmpBase) -> FrozenSet[int]:
+        """
+        Returns:
+            FrozenSet[int]: Порты, за которыми LLDP видит коммутатор или маршрутизатор.
+        """
+        prefix_length = len(oid_to_tuple(LLDP_REM_SYS_CAP_ENABLED))
+        ports = set()
+        async for name, value in client.bulk_walk(LLDP_REM_SYS_CAP_ENABLED, self.max_repetitions):
+            port = parse_lldp_neighbor(name[prefix_length:], value)
+            if port is not None:
+                ports.add(port)
+        return frozenset(ports)
+
+    async def _poll_switch_safe(
+        self, switch: SwitchTarget, arp: Dict[str, str], macs: FrozenSet[str], run_id: Optional[int] = None
+    ) -> None:
+        state = self.breaker.state(switch, datetime.now(timezone.utc))
+        if state is BreakerState.OPEN:
+            return
+        await self._switch_flights.run(switch.id, lambda: self._poll_and_record(switch, arp, macs, state, run_id))
+
+    async def _poll_and_record(
+        self,
+        switch: SwitchTarget,
+        arp: Dict[str, str],
+        macs: FrozenSet[str],
+        state: BreakerState,
+        run_id: Optional[int] = None,
+    ) -> SwitchPollStats:
+        """
+        Опрос коммутатора с записью результата для circuit breaker и журнала. Выполняется через
+        _switch_flights по ID коммутатора: обход и опрос по запросу не опрашивают один коммутатор одновременно,
+        второй из них получает результат уже идущего опроса.
+
+        Returns:
+            SwitchPollStats: Показатели опроса; ошибка опроса не выбрасывается, а записывается в них.
+        """
+        stats = SwitchPollStats(
+            switch_id=switch.id, ip_address=switch.ip_address, started_at=datetime.now(timezone.utc)
+        )
+        try:
+            if state is BreakerState.HALF_OPEN:
+                await self.probe(switch)
+            await self.poll_switch(switch, arp, macs, stats)
+        except SnmpError as exc:
+            logger.warning("Poll of switch %s failed: %s", switch.ip_address, exc)
+            stats.finish(str(exc))
+        except Exception as exc:
+            # Ошибка БД (deadlock, разрыв соединения) одного коммутатора не прерывает опрос остальных
+            # и учитывается circuit breaker и журналом так же, как ошибка SNMP.
+            logger.exception("Poll of switch %s failed", switch.ip_address)
+            stats.finish(f"{type(exc).__name__}: {exc}")
+        else:
+            stats.finish()
+
+        try:
+            if stats.succeeded:
+                await self.record_success(switch)
+            else:
+                await self.record_failure(switch, stats.error or "")
+            if run_id is not None:
+                await self.record_run_switch(run_id, stats)
+        except Exception:
+            logger.exception("Recording poll result of switch %s failed", switch.ip_address)
+        return stats
+
+    def profile(self, switch: SwitchTarget) -> SnmpProfile:
+        """
+        Профиль SNMP-агента коммутатора: из памяти процесса или, при первом опросе, из БД.
+        """
+        return snmp_profiles.setdefault(
+            switch.ip_address,
+            SnmpProfile(
+                max_repetitions=switch.snmp_max_repetitions or self.max_repetitions,
+                bulk=switch.snmp_bulk,
+                rtt=switch.snmp_rtt,
+                sys_object_id=switch.snmp_sys_object_id,
+            ),
+        )
+
+    async def probe(self, switch: SwitchTarget) -> None:
+        """
+        Пробный запрос sysUpTime без повторов к коммутатору с открытым circuit breaker.
+        """
+        async with self._semaphore:
+            await get_snmp_client(switch.ip_address, retries=0).get(SYS_UPTIME)
+
+    async def record_success(self, switch: SwitchTarget) -> None:
+        async with self.session_factory() as session:
+            await CrudSwitch(session).record_poll_success(
+                switch.id, polled_at=datetime.now(timezone.utc), profile=self.profile(switch)
+            )
+
+    async def record_failure(self, switch: SwitchTarget, error: str) -> None:
+        now = datetime.now(timezone.utc)
+        next_poll_at = self.breaker.next_poll_at(switch.consecutive_failures + 1, now)
+        async with self.session_factory() as session:
+            await CrudSwitch(session).record_poll_failure(
+                switch.id, error=error, failed_at=now, next_poll_at=next_poll_at
+            )
+
+    async def poll_switch(
+        self,
+        switch: SwitchTarget,
+        arp: Dict[str, str],
+        macs: FrozenSet[str] = frozenset(),
+        stats: Optional[SwitchPollStats] = None,
+    ) -> int:
+        """
+        Опрашивает коммутатор и синхронизирует его устройства и uplink порты.
+
+        Порты, определённые как uplink в прошлом опросе или по LLDP в текущем, отфильтровываются при декодировании.
+        Остальные устройства записываются пачками по ходу обхода (write_devices).
+
+        Args:
+            switch (SwitchTarget): Коммутатор.
+            arp (Dict[str, str]): MAC-адрес -> IP-адрес.
+            macs (FrozenSet[str]): MAC-адреса известных коммутаторов.
+            stats (Optional[SwitchPollStats]): Показатели опроса для журнала.
+
+        Returns:
+            int: Количество записанных устройств.
+        """
+        if stats is None:
+            stats = SwitchPollStats(
+                switch_id=switch.id, ip_address=switch.ip_address, started_at=datetime.now(timezone.utc)
+            )
+        async with self._semaphore:
+            profile = self.profile(switch)
+            client = get_snmp_client(switch.ip_address, profile=profile)
+            with stats.walking():
+                if profile.sys_object_id is None:
+                    scalars = await client.get(SYS_OBJECT_ID)
+                    profile.sys_object_id = next((value.prettyPrint() for value in scalars.values()), "")
+                port_status = await self.port_status.refresh(client, self.max_repetitions)
+                lldp_ports = await self.read_lldp(client) if self.uplink_lldp else frozenset()
+            detector = UplinkDetector(self.uplink_mac_threshold, macs, lldp_ports)
+            excluded = switch.excluded_ports | switch.uplink_ports | lldp_ports
+            polled_at = datetime.now(timezone.utc)
+
+            walk = stats.walk(client.bulk_walk(switch.snmp_oid, self.max_repetitions))
+            rows = stats.rows(buffered(walk, maxsize=self.batch_size))
+            prefix_length = len(oid_to_tuple(switch.snmp_oid))
+            executor = self.decode_executor()
+            if executor is None:
+                entries = exclude_ports(detector.observe(decode_fdb(rows, prefix_length)), excluded)
+                chain = stats.chain(batched(correlate(entries, arp, port_status), self.batch_size))
+            else:
+                chunks = decode_fdb_offloaded(rows, prefix_length, executor, self.batch_size, excluded, macs)
+                chain = stats.chain(correlate_batches(detector.merge(chunks), arp, port_status))
+            return await self.write_devices(switch.id, buffered(chain, maxsize=2), detector, polled_at, stats)
+
+    async def write_devices(
+        self,
+        switch_id: int,
+        batches: AsyncIterator[List[Dict[str, Any]]],
+        detector: UplinkDetector,
+        polled_at: datetime,
+        stats: SwitchPollStats,
+    ) -> int:
+        """
+        Записывает пачки устройств коммутатора по ходу обхода и завершает синхронизацию.
+
+        Устройства на портах, уже определённых UplinkDetector как uplink, не записываются. Устройства,
+        записанные за другим коммутатором, не переносятся до конца обхода: на порту, который окажется uplink,
+        это устройства нижестоящих коммутаторов, и их перенос с последующим удалением стёр бы их данные
+        (например, номер рабочего места). Они откладываются в памяти и записываются после обхода, если порт
+        не uplink; отложенные строки порта отбрасываются, как только он определяется как uplink, поэтому
+        при включенном пороге их не больше порога количества MAC-адресов на порт. Устройства коммутатора
+        на uplink портах удаляет finish_switch_sync.
+
+        Args:
+            switch_id (int): Идентификатор коммутатора.
+            batches (AsyncIterator[List[Dict[str, Any]]]): Пачки устройств с уникальными в пачке MAC.
+            detector (UplinkDetector): Детектор uplink портов, наполняемый обходом.
+            polled_at (datetime): Время опроса.
+            stats (SwitchPollStats): Показатели опроса для журнала.
+
+        Returns:
+            int: Количество записанных устройств.
+        """
+        written = 0
+        held: Dict[str, Dict[str, Any]] = {}
+        async for batch in batches:
+            held = {mac: device for mac, device in held.items() if not detector.suspected(device["port"])}
+            batch = [device for device in batch if not detector.suspected(device["port"])]
+            if not batch:
+                continue
+            with stats.writing():
+                async with self.session_factory() as session:
+                    inserted, updated, skipped = await CrudDevice(session).upsert_devices(
+                        switch_id=switch_id, devices=batch, polled_at=polled_at, move=False
+                    )
+                    await session.commit()
+            stats.rows_inserted += inserted
+            stats.rows_updated += updated
+            written += inserted + updated
+            for device in batch:
+                if device["mac"] in skipped:
+                    held[device["mac"]] = device
+
+        uplinks = detector.uplinks()
+        moved = [device for device in held.values() if device["port"] not in uplinks]
+        async with self.session_factory() as session:
+            crud = CrudDevice(session)
+            with stats.writing():
+                for start in range(0, len(moved), self.batch_size):
+                    inserted, updated, _ = await crud.upsert_devices(
+                        switch_id=switch_id, devices=moved[start : start + self.batch_size], polled_at=polled_at
+                    )
+                    stats.rows_inserted += inserted
+                    stats.rows_updated += updated
+                    written += inserted + updated
+                await CrudSwitch(session).sync_uplink_ports(switch_id, uplinks, detected_at=polled_at)
+                offline, deleted = await crud.finish_switch_sync(
+                    switch_id=switch_id, polled_at=polled_at, retention=self.retention, uplink_ports=uplinks
+                )
+            stats.rows_updated += offline
+            stats.rows_deleted += deleted
+        return written
+
+
+poller = Poller(
+    session_factory=db_helper.session_factory,
+    concurrency=settings.poller.concurrency,
+    core_concurrency=settings.poller.core_concurrency,
+    batch_size=settings.poller.batch_size,
+    max_repetitions=settings.poller.max_repetitions,
+    retention=timedelta(days=settings.poller.device_retention_days),
+    breaker=CircuitBreaker(
+        failure_threshold=settings.poller.failure_threshold,
+        backoff_base=timedelta(seconds=settings.poller.backoff_base),
+        backoff_max=timedelta(seconds=settings.poller.backoff_max),
+    ),
+    uplink_mac_threshold=settings.poller.uplink_mac_threshold,
+    uplink_lldp=settings.poller.uplink_lldp,
+    journal_retention=timedelta(days=settings.poller.journal_retention_days),
+    decode_processes=settings.poller.decode_processes,
+)
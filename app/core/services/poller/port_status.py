@@ -0,0 +1,102 @@
+from dataclasses import dataclass, field
+from typing import Dict
+
+from core.services.snmp import SnmpBase
+from core.services.snmp.snmp_base import oid_to_tuple
+
+from .oids import (
+    DOT1D_BASE_PORT_IF_INDEX,
+    IF_LAST_CHANGE,
+    IF_OPER_STATUS,
+    IF_OPER_STATUS_UP,
+    IF_TABLE_LAST_CHANGE,
+    SYS_UPTIME,
+)
+
+SYS_UPTIME_OID = oid_to_tuple(SYS_UPTIME)
+IF_TABLE_LAST_CHANGE_OID = oid_to_tuple(IF_TABLE_LAST_CHANGE)
+
+
+@dataclass
+class PortStatusCache:
+    """
+    Кэш состояния интерфейсов одного коммутатора.
+
+    Attributes:
+        sys_uptime (int): sysUpTime на момент последнего опроса. Уменьшение означает перезагрузку.
+        table_last_change (int): ifTableLastChange - меняется при добавлении/удалении интерфейсов.
+        bridge_ports (Dict[int, int]): Порт моста -> ifIndex (dot1dBasePortIfIndex).
+        last_change (Dict[int, int]): ifIndex -> ifLastChange.
+        oper_up (Dict[int, bool]): ifIndex -> ifOperStatus == up.
+    """
+
+    sys_uptime: int = -1
+    table_last_change: int = -1
+    bridge_ports: Dict[int, int] = field(default_factory=dict)
+    last_change: Dict[int, int] = field(default_factory=dict)
+    oper_up: Dict[int, bool] = field(default_factory=dict)
+
+    def port_status(self) -> Dict[int, bool]:
+        return {port: self.oper_up.get(if_index, False) for port, if_index in self.bridge_ports.items()}
+
+
+class PortStatusTracker:
+    """
+    Отслеживает ifOperStatus портов коммутаторов.
+
+    Таблицы dot1dBasePortIfIndex и ifOperStatus обходятся полностью только при первом опросе,
+    после перезагрузки (уменьшение sysUpTime) или изменения состава интерфейсов (ifTableLastChange).
+    В остальных случаях обходится только колонка ifLastChange, а ifOperStatus запрашивается GET
+    для интерфейсов, у которых ifLastChange изменился.
+    """
+
+    def __init__(self) -> None:
+        self._caches: Dict[str, PortStatusCache] = {}
+
+    def invalidate(self, host: str) -> None:
+        self._caches.pop(host, None)
+
+    async def refresh(self, client: SnmpBase, max_repetitions: int = 25) -> Dict[int, bool]:
+        """
+        Обновляет состояние портов коммутатора.
+
+        Args:
+            client (SnmpBase): SNMP-клиент коммутатора.
+            max_repetitions (int): max-repetitions для GETBULK.
+
+        Returns:
+            Dict[int, bool]: Порт моста -> порт в состоянии up.
+        """
+        cache = self._caches.get(client.host) or PortStatusCache()
+        scalars = await client.get(SYS_UPTIME, IF_TABLE_LAST_CHANGE)
+        sys_uptime = int(scalars.get(SYS_UPTIME_OID, 0))
+        table_last_change = int(scalars.get(IF_TABLE_LAST_CHANGE_OID, 0))
+
+        last_change = {
+            index[0]: int(value) for index, value in (await client.walk_table(IF_LAST_CHANGE, max_repetitions)).items()
+        }
+
+        rebuild = (
+            not cache.bridge_ports
+            or sys_uptime < cache.sys_uptime
+            or table_last_change != cache.table_last_change
+            or last_change.keys() != cache.last_change.keys()
+        )
+        if rebuild:
+            cache = PortStatusCache()
+            bridge_ports = await client.walk_table(DOT1D_BASE_PORT_IF_INDEX, max_repetitions)
+            cache.bridge_ports = {index[0]: int(value) for index, value in bridge_ports.items()}
+            oper_status = await client.walk_table(IF_OPER_STATUS, max_repetitions)
+            cache.oper_up = {index[0]: int(value) == IF_OPER_STATUS_UP for index, value in oper_status.items()}
+        else:
+            changed = [if_index for if_index, value in last_change.items() if cache.last_change.get(if_index) != value]
+            if changed:
+                oper_status = await client.get_many([f"{IF_OPER_STATUS}.{if_index}" for if_index in changed])
+                for oid, value in oper_status.items():
+                    cache.oper_up[oid[-1]] = int(value) == IF_OPER_STATUS_UP
+
+        cache.sys_uptime = sys_uptime
+        cache.table_last_change = table_last_change
+        cache.last_change = last_change
+        self._caches[client.host] = cache
+        return cache.port_status()
@@ -0,0 +1,23 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    Объединение одновременных запросов: пока операция по ключу выполняется,
+    остальные вызовы с тем же ключом ждут её результат, а не запускают свою.
+    Отмена одного из ожидающих (например, клиент разорвал соединение) не отменяет общую операцию.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
@@ -0,0 +1,144 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Optional
+
+from core.models import CoreSwitch, ExcludedPort, Switch, SwitchExcludedPort, SwitchUplinkPort
+from sqlalchemy import select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@dataclass(frozen=True)
+class SwitchTarget:
+    """
+    Коммутатор для опроса.
+
+    Attributes:
+        id (int): Идентификатор коммутатора.
+        ip_address (str): IP-адрес коммутатора.
+        snmp_oid (str): OID таблицы MAC-адресов (dot1qTpFdbPort).
+        core_switch_ip (str): IP опорного коммутатора.
+        excluded_ports (FrozenSet[int]): Исключенные вручную порты.
+        uplink_ports (FrozenSet[int]): Порты, определённые как uplink/trunk при прошлом опросе.
+        consecutive_failures (int): Количество неудачных опросов подряд.
+        next_poll_at (Optional[datetime]): Не опрашивать до этого времени.
+        last_success (Optional[datetime]): Время последнего успешного опроса.
+        snmp_max_repetitions (Optional[int]): Подобранное значение max-repetitions.
+        snmp_bulk (bool): Коммутатор поддерживает GETBULK.
+        snmp_rtt (Optional[float]): Среднее время ответа агента, в секундах.
+        snmp_sys_object_id (Optional[str]): sysObjectID агента.
+    """
+
+    id: int
+    ip_address: str
+    snmp_oid: str
+    core_switch_ip: str
+    excluded_ports: FrozenSet[int] = field(default_factory=frozenset)
+    uplink_ports: FrozenSet[int] = field(default_factory=frozenset)
+    consecutive_failures: int = 0
+    next_poll_at: Optional[datetime] = None
+    last_success: Optional[datetime] = None
+    snmp_max_repetitions: Optional[int] = None
+    snmp_bulk: bool = True
+    snmp_rtt: Optional[float] = None
+    snmp_sys_object_id: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class CoreSwitchTarget:
+    """
+    Опорный коммутатор для опроса ARP-таблицы.
+
+    Attributes:
+        ip_address (str): IP-адрес опорного коммутатора.
+        snmp_oid (str): OID ARP-таблицы (ipNetToMediaPhysAddress).
+        switches (List[SwitchTarget]): Подключенные коммутаторы.
+    """
+
+    ip_address: str
+    snmp_oid: str
+    switches: List[SwitchTarget] = field(default_factory=list)
+
+
+async def load_targets(session: AsyncSession, switch_ip: Optional[str] = None) -> List[CoreSwitchTarget]:
+    """
+    Загружает опорные коммутаторы и коммутаторы для опроса, без загрузки ORM-связей (устройств).
+
+    Args:
+        session (AsyncSession): Сессия базы данных.
+        switch_ip (Optional[str]): Ограничить выборку одним коммутатором.
+
+    Returns:
+        List[CoreSwitchTarget]: Опорные коммутаторы с коммутаторами для опроса.
+    """
+    excluded_stmt = select(SwitchExcludedPort.switch_id, ExcludedPort.port_number).join(
+        ExcludedPort, ExcludedPort.id == SwitchExcludedPort.excluded_port_id
+    )
+    uplinks_stmt = select(SwitchUplinkPort.switch_id, SwitchUplinkPort.port)
+    switches_stmt = select(
+        Switch.id,
+        Switch.ip_address,
+        Switch.snmp_oid,
+        Switch.core_switch_ip,
+        Switch.consecutive_failures,
+        Switch.next_poll_at,
+        Switch.last_success,
+        Switch.snmp_max_repetitions,
+        Switch.snmp_bulk,
+        Switch.snmp_rtt,
+        Switch.snmp_sys_object_id,
+    ).order_by(Switch.id)
+    if switch_ip is not None:
+        excluded_stmt = excluded_stmt.join(Switch, Switch.id == SwitchExcludedPort.switch_id).where(
+            Switch.ip_address == switch_ip
+        )
+        uplinks_stmt = uplinks_stmt.join(Switch, Switch.id == SwitchUplinkPort.switch_id).where(
+            Switch.ip_address == switch_ip
+        )
+        switches_stmt = switches_stmt.where(Switch.ip_address == switch_ip)
+
+    excluded: Dict[int, set] = defaultdict(set)
+    for switch_id, port_number in await session.execute(excluded_stmt):
+        excluded[switch_id].add(port_number)
+    uplinks: Dict[int, set] = defaultdict(set)
+    for switch_id, port in await session.execute(uplinks_stmt):
+        uplinks[switch_id].add(port)
+
+    by_core: Dict[str, List[SwitchTarget]] = defaultdict(list)
+    for row in await session.execute(switches_stmt):
+        by_core[row.core_switch_ip].append(
+            SwitchTarget(
+                id=row.id,
+                ip_address=row.ip_address,
+                snmp_oid=row.snmp_oid,
+                core_switch_ip=row.core_switch_ip,
+                excluded_ports=frozenset(excluded[row.id]),
+                uplink_ports=frozenset(uplinks[row.id]),
+                consecutive_failures=row.consecutive_failures,
+                next_poll_at=row.next_poll_at,
+                last_success=row.last_success,
+                snmp_max_repetitions=row.snmp_max_repetitions,
+                snmp_bulk=row.snmp_bulk,
+                snmp_rtt=row.snmp_rtt,
+                snmp_sys_object_id=row.snmp_sys_object_id,
+            )
+        )
+
+    core_rows = (
+        await session.execute(
+            select(CoreSwitch.ip_address, CoreSwitch.snmp_oid).where(CoreSwitch.ip_address.in_(list(by_core)))
+        )
+    ).all()
+    return [
+        CoreSwitchTarget(ip_address=ip_address, snmp_oid=snmp_oid, switches=by_core[ip_address])
+        for ip_address, snmp_oid in core_rows
+    ]
+
+
+async def load_switch_ips(session: AsyncSession) -> FrozenSet[str]:
+    """
+    IP-адреса всех коммутаторов и опорных коммутаторов - по ним в ARP-таблице находятся MAC-адреса
+    коммутаторов для определения uplink портов.
+    """
+    stmt = union(select(Switch.ip_address), select(CoreSwitch.ip_address))
+    return frozenset(str(ip_address) for ip_address in await session.scalars(stmt))
@@ -0,0 +1,116 @@
+from collections import defaultdict
+from typing import AsyncIterator, Dict, FrozenSet, Iterable, List, Set, Tuple
+
+from .pipeline import DecodedChunk
+
+# Признаки uplink/trunk порта в порядке убывания достоверности.
+REASON_LLDP = "lldp"
+REASON_SWITCH_MAC = "switch_mac"
+REASON_MAC_COUNT = "mac_count"
+
+
+def switch_macs(arp: Dict[str, str], switch_ips: Iterable[str]) -> FrozenSet[str]:
+    """
+    MAC-адреса известных коммутаторов по ARP-таблице опорного коммутатора.
+
+    Args:
+        arp (Dict[str, str]): MAC-адрес -> IP-адрес.
+        switch_ips (Iterable[str]): IP-адреса коммутаторов и опорных коммутаторов.
+    """
+    ips = set(switch_ips)
+    return frozenset(mac for mac, ip in arp.items() if ip in ips)
+
+
+class UplinkDetector:
+    """
+    Определяет uplink/trunk порты коммутатора по данным опроса: за портом LLDP видит коммутатор
+    или маршрутизатор, на порту виден MAC-адрес другого известного коммутатора, либо количество
+    MAC-адресов на порту больше порога.
+
+    Счётчики ведутся по всем записям таблицы MAC-адресов, до фильтра исключенных портов, поэтому
+    порт, переставший быть uplink, перестаёт исключаться при следующем опросе. Считаются различные
+    MAC-адреса: MAC из нескольких VLAN на одном порту - одно устройство. Для решения достаточно знать,
+    что порог превышен, поэтому при включенном пороге на порту запоминается не больше mac_threshold + 1 MAC-адресов.
+
+    Params:
+        mac_threshold (int): Порог количества MAC-адресов на порту (0 - не проверять).
+        switch_macs (FrozenSet[str]): MAC-адреса известных коммутаторов.
+        lldp_ports (FrozenSet[int]): Порты с LLDP-соседом - коммутатором или маршрутизатором.
+    """
+
+    def __init__(self, mac_threshold: int, switch_macs: FrozenSet[str], lldp_ports: FrozenSet[int]) -> None:
+        self.mac_threshold = mac_threshold
+        self.switch_macs = switch_macs
+        self.lldp_ports = lldp_ports
+        self.port_macs: Dict[int, Set[str]] = defaultdict(set)
+        self.switch_mac_ports: Set[int] = set()
+
+    @property
+    def mac_counts(self) -> Dict[int, int]:
+        """
+        Порт -> количество различных MAC-адресов на порту.
+        """
+        return {port: len(macs) for port, macs in self.port_macs.items()}
+
+    def add(self, port: int, macs: Iterable[str]) -> None:
+        """
+        Учитывает MAC-адреса, увиденные на порту.
+        """
+        seen = self.port_macs[port]
+        if self.mac_threshold <= 0:
+            seen.update(macs)
+            return
+        for mac in macs:
+            if len(seen) > self.mac_threshold:
+                break
+            seen.add(mac)
+
+    async def observe(self, entries: AsyncIterator[Tuple[int, str, int]]) -> AsyncIterator[Tuple[int, str, int]]:
+        """
+        Стадия конвейера: учитывает MAC-адреса записей (vlan, mac, port) по портам и передаёт записи
+        дальше без изменений.
+        """
+        async for vlan, mac, port in entries:
+            self.add(port, (mac,))
+            if mac in self.switch_macs:
+                self.switch_mac_ports.add(port)
+            yield vlan, mac, port
+
+    async def merge(self, chunks: AsyncIterator[DecodedChunk]) -> AsyncIterator[List[Tuple[int, str, int]]]:
+        """
+        Стадия конвейера для пачек, декодированных в пуле процессов: учитывает MAC-адреса портов пачки
+        и передаёт дальше её записи.
+        """
+        async for chunk in chunks:
+            for port, macs in chunk.port_macs.items():
+                self.add(port, macs)
+            self.switch_mac_ports.update(chunk.switch_mac_ports)
+            yield chunk.entries
+
+    def suspected(self, port: int) -> bool:
+        """
+        Порт уже определён как uplink по данным, полученным к этому моменту обхода.
+        Признаки только накапливаются, поэтому порт остаётся в uplinks() до конца опроса.
+        """
+        return (
+            port in self.lldp_ports
+            or port in self.switch_mac_ports
+            or 0 < self.mac_threshold < len(self.port_macs.get(port, ()))
+        )
+
+    def uplinks(self) -> Dict[int, Tuple[str, int]]:
+        """
+        Returns:
+            Dict[int, Tuple[str, int]]: Порт -> (признак, количество MAC-адресов на порту).
+        """
+        result: Dict[int, Tuple[str, int]] = {}
+        counts = self.mac_counts
+        if self.mac_threshold > 0:
+            for port, count in counts.items():
+                if count > self.mac_threshold:
+                    result[port] = (REASON_MAC_COUNT, count)
+        for port in self.switch_mac_ports:
+            result[port] = (REASON_SWITCH_MAC, counts.get(port, 0))
+        for port in self.lldp_ports:
+            result[port] = (REASON_LLDP, counts.get(port, 0))
+        return result
@@ -0,0 +1,55 @@
+__all__ = (
+    "SnmpBase",
+    "SnmpError",
+    "SnmpProfile",
+    "SnmpV2",
+    "SnmpV3",
+    "get_snmp_client",
+    "snmp_profiles",
+)
+
+from typing import Optional
+
+from core.config import settings
+
+from .profile import SnmpProfile, snmp_profiles
+from .snmp_base import SnmpBase, SnmpError
+from .snmp_v2 import SnmpV2
+from .snmp_v3 import SnmpV3
+
+
+def get_snmp_client(host: str, retries: Optional[int] = None, profile: Optional[SnmpProfile] = None) -> SnmpBase:
+    """
+    Создаёт SNMP-клиент агента по настройкам SnmpConfig.
+
+    Args:
+        host (str): IP-адрес агента.
+        retries (Optional[int]): Количество повторов вместо settings.snmp.retries.
+        profile (Optional[SnmpProfile]): Профиль возможностей агента.
+
+    Returns:
+        SnmpBase: SnmpV3 или SnmpV2 в зависимости от settings.snmp.version.
+    """
+    snmp = settings.snmp
+    retries = snmp.retries if retries is None else retries
+    if snmp.version == 3:
+        return SnmpV3(
+            host=host,
+            username=snmp.username,
+            auth_key=snmp.auth_key,
+            priv_key=snmp.priv_key,
+            auth_protocol=snmp.auth_protocol,
+            priv_protocol=snmp.priv_protocol,
+            port=int(snmp.port),
+            timeout=snmp.timeout,
+            retries=retries,
+            profile=profile,
+        )
+    return SnmpV2(
+        host=host,
+        community=snmp.community,
+        port=int(snmp.port),
+        timeout=snmp.timeout,
+        retries=retries,
+        profile=profile,
+    )
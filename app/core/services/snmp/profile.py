@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+# Вес нового замера в скользящем среднем RTT.
+RTT_WEIGHT = 0.2
+
+
+@dataclass
+class SnmpProfile:
+    """
+    Профиль возможностей SNMP-агента, подбираемый по ходу опросов.
+
+    max-repetitions растёт, пока агент отвечает полными и быстрыми ответами, и уменьшается вдвое
+    при tooBig или таймауте GETBULK. Агент, отвечающий на GETBULK noSuchName, обходится GETNEXT.
+
+    Attributes:
+        max_repetitions (int): Текущее значение max-repetitions для GETBULK.
+        bulk (bool): Агент поддерживает GETBULK.
+        rtt (Optional[float]): Скользящее среднее времени ответа, в секундах.
+        sys_object_id (Optional[str]): sysObjectID агента (модель/производитель).
+    """
+
+    max_repetitions: int
+    bulk: bool = True
+    rtt: Optional[float] = None
+    sys_object_id: Optional[str] = None
+
+    def observe(self, rtt: float, returned: int, timeout: float, limit: int) -> None:
+        """
+        Учитывает успешный ответ: обновляет RTT и увеличивает max-repetitions, если ответ заполнен
+        полностью (таблица не закончилась) и пришёл быстрее четверти таймаута.
+
+        Args:
+            rtt (float): Время ответа, в секундах.
+            returned (int): Количество значений в ответе.
+            timeout (float): Таймаут запроса, в секундах.
+            limit (int): Максимальное значение max-repetitions.
+        """
+        self.rtt = rtt if self.rtt is None else self.rtt + RTT_WEIGHT * (rtt - self.rtt)
+        if self.bulk and returned >= self.max_repetitions and rtt < timeout / 4:
+            self.max_repetitions = min(limit, self.max_repetitions + max(1, self.max_repetitions // 4))
+
+    def shrink(self, minimum: int) -> bool:
+        """
+        Уменьшает max-repetitions вдвое.
+
+        Returns:
+            bool: False, если значение уже минимальное.
+        """
+        if self.max_repetitions <= minimum:
+            return False
+        self.max_repetitions = max(minimum, self.max_repetitions // 2)
+        return True
+
+
+class ProfileCache:
+    """
+    Профили агентов по IP-адресу. Общие для периодического опроса и опроса по запросу;
+    в БД профиль коммутатора сохраняется после успешного опроса (Switch.snmp_*).
+    """
+
+    def __init__(self) -> None:
+        self._profiles: Dict[str, SnmpProfile] = {}
+
+    def get(self, host: str) -> Optional[SnmpProfile]:
+        return self._profiles.get(host)
+
+    def setdefault(self, host: str, profile: SnmpProfile) -> SnmpProfile:
+        return self._profiles.setdefault(host, profile)
+
+    def invalidate(self, host: str) -> None:
+        self._profiles.pop(host, None)
+
+
+snmp_profiles = ProfileCache()
@@ -1,5 +1,233 @@
+import time
+import zlib
 from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Type
+
+from core.config import settings
+from pysnmp.carrier.asyncio.dgram import udp
+from pysnmp.hlapi.v3arch.asyncio import (
+    ContextData,
+    ObjectIdentity,
+    ObjectType,
+    SnmpEngine,
+    UdpTransportTarget,
+    bulk_cmd,
+    get_cmd,
+    next_cmd,
+)
+from pysnmp.proto import errind
+from pysnmp.proto.rfc1905 import EndOfMibView, NoSuchInstance, NoSuchObject
+
+from .profile import SnmpProfile
+
+Oid = Tuple[int, ...]
+
+# Один SNMP-движок на процесс: общий диспетчер asyncio и кэш USM.
+snmp_engine = SnmpEngine()
+
+# Разрешённые транспортные цели по (host, port, timeout, retries): без getaddrinfo на каждый запрос.
+_targets: Dict[Tuple[str, int, float, int], UdpTransportTarget] = {}
+
+# Классы транспортных целей по номеру сокета пула. LCD pysnmp выбирает сокет по атрибуту класса
+# TRANSPORT_DOMAIN, поэтому каждому сокету нужен свой подкласс UdpTransportTarget.
+_target_classes: Dict[int, Type[UdpTransportTarget]] = {}
+
+
+# error-status из RFC 3416.
+TOO_BIG = 1
+# noSuchName: так на GETBULK отвечают агенты без его поддержки (SNMPv1-only). genErr сюда не относится:
+# это сбой агента при сборке конкретного ответа, после него GETBULK не отключается.
+NO_SUCH_NAME = 2
+
+
+class SnmpError(Exception):
+    """Ошибка SNMP-запроса: таймаут, ошибка агента или транспорта."""
+
+
+def oid_to_tuple(oid: str) -> Oid:
+    return tuple(int(part) for part in oid.strip(".").split("."))
 
 
 class SnmpBase(ABC):
-    pass
+    """
+    Базовый асинхронный SNMP-клиент одного агента.
+
+    Params:
+        host (str): IP-адрес агента.
+        port (int): UDP-порт агента.
+        timeout (float): Таймаут ответа, в секундах.
+        retries (int): Количество повторов запроса.
+        profile (Optional[SnmpProfile]): Профиль возможностей агента; обход подстраивает его max-repetitions.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 161,
+        timeout: float = 2.0,
+        retries: int = 2,
+        profile: Optional[SnmpProfile] = None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self.profile = profile
+
+    @abstractmethod
+    def auth_data(self) -> Any:
+        """Данные аутентификации pysnmp (CommunityData / UsmUserData)."""
+
+    async def prepare(self) -> None:
+        """Подготовка перед запросом (например, обнаружение SNMPv3 engine ID). По умолчанию не требуется."""
+
+    def on_error(self, error_indication: Any) -> None:
+        """Обработка ошибки запроса до того, как она будет выброшена как SnmpError."""
+
+    def target_class(self) -> Type[UdpTransportTarget]:
+        """
+        Класс транспортной цели агента: все агенты распределяются по небольшому пулу UDP-сокетов.
+        Сокет открывается pysnmp при первом запросе через его домен; ответы внутри сокета
+        сопоставляются с запросами диспетчером pysnmp по request-id.
+        """
+        socket = zlib.crc32(self.host.encode()) % settings.snmp.sockets
+        target_class = _target_classes.get(socket)
+        if target_class is None:
+            target_class = type(
+                f"UdpTransportTarget{socket}",
+                (UdpTransportTarget,),
+                {"TRANSPORT_DOMAIN": udp.DOMAIN_NAME + (socket,)},
+            )
+            _target_classes[socket] = target_class
+        return target_class
+
+    async def transport(self) -> UdpTransportTarget:
+        key = (self.host, self.port, self.timeout, self.retries)
+        target = _targets.get(key)
+        if target is None:
+            target = await self.target_class().create(
+                (self.host, self.port),
+                timeout=self.timeout,
+                retries=self.retries,
+            )
+            _targets[key] = target
+        return target
+
+    def _check(self, error_indication: Any, error_status: Any, error_index: Any) -> None:
+        if error_indication:
+            self.on_error(error_indication)
+            raise SnmpError(f"{self.host}: {error_indication}")
+        if error_status:
+            raise SnmpError(f"{self.host}: {error_status.prettyPrint()} at {error_index}")
+
+    async def get(self, *oids: str) -> Dict[Oid, Any]:
+        """
+        GET нескольких OID одним PDU. Отсутствующие у агента OID в результат не попадают.
+
+        Returns:
+            Dict[Oid, Any]: OID -> значение pysnmp.
+        """
+        await self.prepare()
+        error_indication, error_status, error_index, var_binds = await get_cmd(
+            snmp_engine,
+            self.auth_data(),
+            await self.transport(),
+            ContextData(),
+            *[ObjectType(ObjectIdentity(oid)) for oid in oids],
+        )
+        self._check(error_indication, error_status, error_index)
+        return {
+            tuple(name): value
+            for name, value in var_binds
+            if not isinstance(value, (NoSuchObject, NoSuchInstance, EndOfMibView))
+        }
+
+    async def bulk_walk(self, oid: str, max_repetitions: int = 25) -> AsyncIterator[Tuple[Oid, Any]]:
+        """
+        Обход поддерева OID запросами GETBULK (GETNEXT, если агент не поддерживает GETBULK).
+
+        Размер ответа подстраивается под агент по профилю (self.profile): max-repetitions растёт,
+        пока ответы полные и быстрые, и уменьшается при tooBig или таймауте. Без профиля обход
+        начинается с max_repetitions и подстраивается только в пределах одного обхода.
+
+        Yields:
+            Tuple[Oid, Any]: Полный OID и значение pysnmp.
+        """
+        await self.prepare()
+        profile = self.profile or SnmpProfile(max_repetitions=max_repetitions)
+        root = oid_to_tuple(oid)
+        current = root
+        while True:
+            var_binds = await self._walk_step(current, profile)
+            if not var_binds:
+                return
+            for name, value in var_binds:
+                name = tuple(name)
+                if name[: len(root)] != root or isinstance(value, EndOfMibView):
+                    return
+                if name <= current:
+                    raise SnmpError(f"{self.host}: OID not increasing at {'.'.join(map(str, name))}")
+                current = name
+                yield name, value
+
+    async def _walk_step(self, oid: Oid, profile: SnmpProfile) -> List[Tuple[Any, Any]]:
+        """
+        Один запрос обхода после OID с подстройкой профиля агента.
+        """
+        snmp = settings.snmp
+        while True:
+            started = time.monotonic()
+            if profile.bulk:
+                error_indication, error_status, error_index, var_binds = await bulk_cmd(
+                    snmp_engine,
+                    self.auth_data(),
+                    await self.transport(),
+                    ContextData(),
+                    0,
+                    profile.max_repetitions,
+                    ObjectType(ObjectIdentity(oid)),
+                )
+            else:
+                error_indication, error_status, error_index, var_binds = await next_cmd(
+                    snmp_engine,
+                    self.auth_data(),
+                    await self.transport(),
+                    ContextData(),
+                    ObjectType(ObjectIdentity(oid)),
+                    lexicographicMode=False,
+                )
+            rtt = time.monotonic() - started
+
+            if profile.bulk and not error_indication and error_status:
+                # tooBig - ответ не помещается в PDU агента.
+                if int(error_status) == TOO_BIG and profile.shrink(snmp.min_repetitions):
+                    continue
+                if int(error_status) == NO_SUCH_NAME:
+                    profile.bulk = False
+                    continue
+            if profile.bulk and isinstance(error_indication, errind.RequestTimedOut):
+                # Большой ответ мог потеряться при фрагментации: следующий опрос начнётся с меньшего размера.
+                profile.shrink(snmp.min_repetitions)
+
+            self._check(error_indication, error_status, error_index)
+            profile.observe(rtt, len(var_binds), self.timeout, snmp.max_repetitions)
+            return list(var_binds)
+
+    async def walk_table(self, oid: str, max_repetitions: int = 25) -> Dict[Oid, Any]:
+        """
+        Обход колонки таблицы.
+
+        Returns:
+            Dict[Oid, Any]: Индекс строки (суффикс OID после колонки) -> значение pysnmp.
+        """
+        prefix_length = len(oid_to_tuple(oid))
+        return {name[prefix_length:]: value async for name, value in self.bulk_walk(oid, max_repetitions)}
+
+    async def get_many(self, oids: List[str], chunk_size: int = 20) -> Dict[Oid, Any]:
+        """
+        GET большого количества OID пачками по chunk_size в одном PDU.
+        """
+        result: Dict[Oid, Any] = {}
+        for start in range(0, len(oids), chunk_size):
+            result.update(await self.get(*oids[start : start + chunk_size]))
+        return result
@@ -0,0 +1,30 @@
+from typing import Any, Optional
+
+from pysnmp.hlapi.v3arch.asyncio import CommunityData
+
+from .profile import SnmpProfile
+from .snmp_base import SnmpBase
+
+
+class SnmpV2(SnmpBase):
+    """
+    SNMPv2c клиент.
+
+    Params:
+        community (str): Сообщество SNMP.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        community: str,
+        port: int = 161,
+        timeout: float = 2.0,
+        retries: int = 2,
+        profile: Optional[SnmpProfile] = None,
+    ) -> None:
+        super().__init__(host=host, port=port, timeout=timeout, retries=retries, profile=profile)
+        self.community = community
+
+    def auth_data(self) -> Any:
+        return CommunityData(self.community, mpModel=1)
@@ -0,0 +1,139 @@
+import asyncio
+from typing import Any, Dict, Optional
+
+from pysnmp.hlapi.v3arch.asyncio import (
+    USM_KEY_TYPE_LOCALIZED,
+    USM_KEY_TYPE_MASTER,
+    ContextData,
+    ObjectIdentity,
+    ObjectType,
+    UsmUserData,
+    get_cmd,
+)
+from pysnmp.proto.rfc1902 import OctetString
+
+from .profile import SnmpProfile
+from .snmp_base import SnmpBase, SnmpError, oid_to_tuple, snmp_engine
+from .usm import AUTH_ERRORS, AUTH_PROTOCOLS, PRIV_PROTOCOLS, AgentSecurity, password_to_key, usm_cache
+
+# SNMP-FRAMEWORK-MIB
+SNMP_ENGINE_ID = "1.3.6.1.6.3.10.2.1.1.0"
+
+# Параллельные опросы одного агента выполняют обнаружение один раз.
+_discovery_locks: Dict[tuple, asyncio.Lock] = {}
+
+
+class SnmpV3(SnmpBase):
+    """
+    SNMPv3 клиент (authPriv).
+
+    Первый запрос к агенту обнаруживает его engine ID, после чего
+    локализованные ключи сохраняются в usm_cache и следующие запросы идут без обнаружения
+    и без вычисления ключей из паролей. При ошибке аутентификации запись кэша сбрасывается.
+
+    Params:
+        username (str): Имя пользователя USM.
+        auth_key (str): Пароль аутентификации.
+        priv_key (str): Пароль шифрования.
+        auth_protocol (str): Протокол аутентификации (md5, sha, sha256, sha512).
+        priv_protocol (str): Протокол шифрования (des, aes, aes256).
+    """
+
+    def __init__(
+        self,
+        host: str,
+        username: str,
+        auth_key: str,
+        priv_key: str,
+        auth_protocol: str = "sha",
+        priv_protocol: str = "aes",
+        port: int = 161,
+        timeout: float = 2.0,
+        retries: int = 2,
+        profile: Optional[SnmpProfile] = None,
+    ) -> None:
+        super().__init__(host=host, port=port, timeout=timeout, retries=retries, profile=profile)
+        self.username = username
+        self.auth_key = auth_key
+        self.priv_key = priv_key
+        self.auth_protocol = auth_protocol
+        self.priv_protocol = priv_protocol
+        self.security = usm_cache.get(host, port, username)
+
+    def auth_data(self) -> Any:
+        if self.security is not None:
+            return self.security.auth_data
+        return self._discovery_auth_data()
+
+    def _discovery_auth_data(self) -> UsmUserData:
+        # Мастер-ключи вычисляются один раз на процесс; pysnmp остаётся только локализовать их.
+        return UsmUserData(
+            self.username,
+            authKey=password_to_key(self.auth_key, self.auth_protocol),
+            privKey=password_to_key(self.priv_key, self.auth_protocol),
+            authProtocol=AUTH_PROTOCOLS[self.auth_protocol],
+            privProtocol=PRIV_PROTOCOLS[self.priv_protocol],
+            authKeyType=USM_KEY_TYPE_MASTER,
+            privKeyType=USM_KEY_TYPE_MASTER,
+        )
+
+    def _localized_auth_data(self, security: AgentSecurity) -> UsmUserData:
+        return UsmUserData(
+            self.username,
+            authKey=security.auth_key,
+            privKey=security.priv_key,
+            authProtocol=AUTH_PROTOCOLS[self.auth_protocol],
+            privProtocol=PRIV_PROTOCOLS[self.priv_protocol],
+            securityEngineId=OctetString(security.engine_id),
+            authKeyType=USM_KEY_TYPE_LOCALIZED,
+            privKeyType=USM_KEY_TYPE_LOCALIZED,
+        )
+
+    async def prepare(self) -> None:
+        if self.security is not None:
+            return
+
+        lock = _discovery_locks.setdefault((self.host, self.port, self.username), asyncio.Lock())
+        async with lock:
+            self.security = usm_cache.get(self.host, self.port, self.username)
+            if self.security is None:
+                self.security = await self.discover()
+
+    async def discover(self) -> AgentSecurity:
+        """
+        Обнаружение engine ID агента и локализация ключей.
+
+        Returns:
+            AgentSecurity: Запись кэша агента.
+        """
+        error_indication, error_status, error_index, var_binds = await get_cmd(
+            snmp_engine,
+            self._discovery_auth_data(),
+            await self.transport(),
+            ContextData(),
+            ObjectType(ObjectIdentity(SNMP_ENGINE_ID)),
+        )
+        self._check(error_indication, error_status, error_index)
+        values = {tuple(name): value for name, value in var_binds}
+        try:
+            engine_id = bytes(values[oid_to_tuple(SNMP_ENGINE_ID)].asOctets())
+        except (KeyError, TypeError, ValueError, AttributeError) as exc:
+            raise SnmpError(f"{self.host}: engine discovery failed: {exc!r}")
+
+        security = usm_cache.put(
+            self.host,
+            self.port,
+            self.username,
+            engine_id=engine_id,
+            auth_password=self.auth_key,
+            priv_password=self.priv_key,
+            auth_protocol=self.auth_protocol,
+            priv_protocol=self.priv_protocol,
+        )
+        security.auth_data = self._localized_auth_data(security)
+        return security
+
+    def on_error(self, error_indication: Any) -> None:
+        if type(error_indication).__name__ in AUTH_ERRORS:
+            usm_cache.invalidate(self.host, self.port, self.username)
+            self.security = None
@@ -0,0 +1,138 @@
+import hashlib
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from pysnmp.hlapi.v3arch.asyncio import (
+    USM_AUTH_HMAC96_MD5,
+    USM_AUTH_HMAC96_SHA,
+    USM_AUTH_HMAC192_SHA256,
+    USM_AUTH_HMAC384_SHA512,
+    USM_PRIV_CBC56_DES,
+    USM_PRIV_CFB128_AES,
+    USM_PRIV_CFB256_AES,
+)
+from pysnmp.proto.rfc1902 import OctetString
+from pysnmp.proto.secmod.rfc3414.service import SnmpUSMSecurityModel
+
+AUTH_PROTOCOLS = {
+    "md5": USM_AUTH_HMAC96_MD5,
+    "sha": USM_AUTH_HMAC96_SHA,
+    "sha256": USM_AUTH_HMAC192_SHA256,
+    "sha512": USM_AUTH_HMAC384_SHA512,
+}
+
+PRIV_PROTOCOLS = {
+    "des": USM_PRIV_CBC56_DES,
+    "aes": USM_PRIV_CFB128_AES,
+    "aes256": USM_PRIV_CFB256_AES,
+}
+
+# Алгоритмы хеширования, которыми по RFC 3414 / RFC 7860 из пароля получается ключ.
+KEY_HASHES = {
+    "md5": "md5",
+    "sha": "sha1",
+    "sha256": "sha256",
+    "sha512": "sha512",
+}
+
+# Ошибки USM, после которых закэшированные engine ID и ключи агента считаются устаревшими.
+AUTH_ERRORS = frozenset(
+    {
+        "UnknownEngineID",
+        "UnknownUserName",
+        "UnknownSecurityName",
+        "WrongDigest",
+        "NotInTimeWindow",
+        "DecryptionError",
+        "AuthenticationFailure",
+    }
+)
+
+PASSWORD_TO_KEY_LENGTH = 1048576
+
+
+@lru_cache(maxsize=64)
+def password_to_key(password: str, auth_protocol: str) -> bytes:
+    """
+    Мастер-ключ (Ku) из пароля по RFC 3414 A.2: хеш пароля, повторённого до 1 МБ.
+    Зависит только от пароля и алгоритма, поэтому вычисляется один раз на процесс.
+    """
+    data = password.encode()
+    stream = (data * (PASSWORD_TO_KEY_LENGTH // len(data) + 1))[:PASSWORD_TO_KEY_LENGTH]
+    return hashlib.new(KEY_HASHES[auth_protocol], stream).digest()
+
+
+def localize_auth_key(master_key: bytes, engine_id: bytes, auth_protocol: str) -> bytes:
+    """
+    Локализованный ключ аутентификации (Kul) по RFC 3414 A.2: H(Ku || engineID || Ku).
+    """
+    service = SnmpUSMSecurityModel.AUTH_SERVICES[AUTH_PROTOCOLS[auth_protocol]]
+    return bytes(service.localize_key(master_key, OctetString(engine_id)).asOctets())
+
+
+def localize_priv_key(master_key: bytes, engine_id: bytes, auth_protocol: str, priv_protocol: str) -> bytes:
+    """
+    Локализованный ключ шифрования той же процедурой, что у сервиса шифрования pysnmp.
+    Удлинение ключа до 32 байт для AES-256 у pysnmp своё (Reeder), поэтому ключ не собирается вручную.
+    """
+    service = SnmpUSMSecurityModel.PRIV_SERVICES[PRIV_PROTOCOLS[priv_protocol]]
+    key = service.localize_key(AUTH_PROTOCOLS[auth_protocol], master_key, OctetString(engine_id))
+    return bytes(key.asOctets())
+
+
+@dataclass
+class AgentSecurity:
+    """
+    Закэшированные параметры безопасности SNMPv3 агента.
+
+    Attributes:
+        engine_id (bytes): Идентификатор authoritative SNMP engine агента.
+        auth_key (bytes): Локализованный ключ аутентификации.
+        priv_key (bytes): Локализованный ключ шифрования.
+        auth_data (Any): Готовые данные аутентификации pysnmp с engine ID и локализованными ключами.
+    """
+
+    engine_id: bytes
+    auth_key: bytes
+    priv_key: bytes
+    auth_data: Any = field(default=None, repr=False)
+
+
+class UsmCache:
+    """
+    Кэш engine ID и локализованных ключей по агентам.
+    Ключ кэша - адрес агента и пользователь, так как ключи зависят от пароля.
+    snmpEngineBoots/Time не кэшируются: окно времени агента pysnmp ведёт сам по ответам агента.
+    """
+
+    def __init__(self) -> None:
+        self._agents: Dict[tuple, AgentSecurity] = {}
+
+    def get(self, host: str, port: int, username: str) -> Optional[AgentSecurity]:
+        return self._agents.get((host, port, username))
+
+    def put(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        engine_id: bytes,
+        auth_password: str,
+        priv_password: str,
+        auth_protocol: str,
+        priv_protocol: str,
+    ) -> AgentSecurity:
+        auth_key = localize_auth_key(password_to_key(auth_password, auth_protocol), engine_id, auth_protocol)
+        priv_key = localize_priv_key(
+            password_to_key(priv_password, auth_protocol), engine_id, auth_protocol, priv_protocol
+        )
+        security = AgentSecurity(engine_id=engine_id, auth_key=auth_key, priv_key=priv_key)
+        self._agents[(host, port, username)] = security
+        return security
+
+    def invalidate(self, host: str, port: int, username: str) -> None:
+        self._agents.pop((host, port, username), None)
+
+
+usm_cache = UsmCache()
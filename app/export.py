@@ -0,0 +1,35 @@
+import argparse
+import asyncio
+
+from core.config import settings
+from core.models import db_helper
+from core.services.export import write_snapshot
+
+
+async def main(path: str, batch_size: int, compression: str) -> None:
+    """
+    Выгружает снимок топологии в zip-архив из Parquet-файлов.
+
+    Args:
+        path (str): Путь к итоговому архиву.
+        batch_size (int): Размер пачки строк.
+        compression (str): Кодек сжатия Parquet.
+    """
+    try:
+        async with db_helper.session_factory() as session:
+            counts = await write_snapshot(session, path=path, batch_size=batch_size, compression=compression)
+    finally:
+        await db_helper.dispose()
+
+    for name, count in counts.items():
+        print(f"{name}: {count}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export topology snapshot (zip of Parquet files)")
+    parser.add_argument("path", help="Output .zip file")
+    parser.add_argument("--batch-size", type=int, default=settings.export.batch_size)
+    parser.add_argument("--compression", default=settings.export.compression)
+    args = parser.parse_args()
+
+    asyncio.run(main(path=args.path, batch_size=args.batch_size, compression=args.compression))
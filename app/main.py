@@ -4,6 +4,11 @@ import api
 import uvicorn
 from core.config import settings
 from core.models import db_helper
+from core.services.compression import response_cache
+from core.services.jobs import job_queue
+from core.services.notify import change_listener
+from core.services.oui import oui_index
+from core.services.poller import poller
 from fastapi import FastAPI
 
 
@@ -19,8 +24,20 @@ async def lifespan(app: FastAPI):
         None: Возвращает управление приложению между этапами запуска и завершения.
     """
     # start up logic
+    oui_index.load(settings.oui.paths)
+    if settings.notify.enabled:
+        response_cache.attach(change_listener)
+        job_queue.attach(change_listener)
+        await change_listener.start()
+    if settings.poller.enabled:
+        await poller.start(interval=settings.poller.interval)
+    if settings.jobs.enabled:
+        await job_queue.start()
     yield
     # shutdown logic
+    await job_queue.stop()
+    await poller.stop()
+    await change_listener.stop()
     await db_helper.dispose()
 
 
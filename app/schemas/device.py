@@ -1,7 +1,10 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from core.services.oui import oui_index
+from pydantic import BaseModel, Field, computed_field, field_validator
+
+from .validation_helper import validation_helper
 
 
 class DeviceBase(BaseModel):
@@ -15,13 +18,66 @@ class DeviceCreate(DeviceBase):
 class DeviceUpdate(DeviceBase):
     mac: str
 
+    @field_validator("mac")
+    @classmethod
+    def validate_mac(cls, value: str) -> str:
+        return validation_helper.validate_mac_address(mac=value)
+
 
 class DeviceRead(DeviceBase):
     id: int
     port: int
     mac: str
     vlan: int
-    ip_address: str
+    ip_address: Optional[str] = None
     status: bool
     update_time: datetime
     switch_id: int
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def vendor(self) -> Optional[str]:
+        """Производитель сетевой карты по реестру IEEE OUI."""
+        return oui_index.lookup(self.mac)
+
+
+class DeviceLookup(BaseModel):
+    keys: List[str] = Field(
+        ..., min_length=1, max_length=50_000, description="MAC-адреса (в любом формате) и/или IP-адреса"
+    )
+
+
+class DeviceLookupResult(BaseModel):
+    devices: List[DeviceRead] = Field(description="Найденные устройства")
+    not_found: List[str] = Field(description="Ключи, по которым устройства не найдены")
+    invalid: List[str] = Field(description="Ключи, не являющиеся MAC- или IP-адресом")
+
+
+class DeviceStatsBySwitch(BaseModel):
+    switch_id: int
+    ip_address: str
+    device_count: int
+
+
+class DeviceStatsByVlan(BaseModel):
+    vlan: int
+    device_count: int
+
+
+class DeviceStatsByCoreSwitch(BaseModel):
+    core_switch_ip: str
+    device_count: int
+
+
+class DeviceStatsByStatus(BaseModel):
+    status: bool
+    device_count: int
+
+
+class DeviceStatsSummary(BaseModel):
+    devices: int
+    online: int
+    offline: int
+    vlans: int
+    switches: int
+    core_switches: int
@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class JobCreate(BaseModel):
+    type: str = Field(..., description="Тип задачи: sweep, poll_switch, discover, snapshot")
+    params: Dict[str, Any] = Field(default_factory=dict, description="Параметры задачи")
+
+
+class JobRead(BaseModel):
+    id: int
+    type: str
+    status: str
+    params: Dict[str, Any] = {}
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    progress: float = 0.0
+    message: Optional[str] = None
+    cancel_requested: bool = False
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
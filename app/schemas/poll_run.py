@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class PollRunRead(BaseModel):
+    id: int
+    kind: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    switches_attempted: int = 0
+    switches_succeeded: int = 0
+    switches_failed: int = 0
+    varbinds: int = 0
+    rows_inserted: int = 0
+    rows_updated: int = 0
+    rows_deleted: int = 0
+
+
+class PollRunSwitchRead(BaseModel):
+    switch_id: int
+    ip_address: str
+    succeeded: bool
+    error: Optional[str] = None
+    started_at: datetime
+    duration: float
+    walk_seconds: float
+    decode_seconds: float
+    write_seconds: float
+    varbinds: int
+    rows_inserted: int
+    rows_updated: int
+    rows_deleted: int
+
+
+class PollRunDetail(PollRunRead):
+    switches: List[PollRunSwitchRead] = []
+
+
+class SlowSwitchRead(BaseModel):
+    switch_id: int
+    ip_address: str
+    polls: int
+    failures: int
+    avg_duration: float
+    max_duration: float
+    avg_walk_seconds: float
+    avg_decode_seconds: float
+    avg_write_seconds: float
+    avg_varbinds: float
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import List, Optional
 
 from pydantic import BaseModel, Field, field_validator
@@ -46,10 +47,27 @@ class SwitchExcludedPortBase(BaseModel):
     excluded_port: ExcludedPortBase
 
 
+class SwitchUplinkPortRead(BaseModel):
+    port: int
+    reason: str
+    mac_count: int
+    detected_at: datetime
+
+
 class SwitchRead(SwitchBase):
     id: int
     ip_address: str
     snmp_oid: str
     core_switch_ip: str
+    consecutive_failures: int = 0
+    last_success: Optional[datetime] = None
+    last_failure: Optional[datetime] = None
+    last_error: Optional[str] = None
+    next_poll_at: Optional[datetime] = None
+    snmp_max_repetitions: Optional[int] = None
+    snmp_bulk: bool = True
+    snmp_rtt: Optional[float] = None
+    snmp_sys_object_id: Optional[str] = None
     devices: Optional[List[DeviceRead]] = []
     excluded_ports_relation: List[SwitchExcludedPortBase] = []
+    uplink_ports: List[SwitchUplinkPortRead] = []
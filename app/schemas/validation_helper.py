@@ -1,21 +1,85 @@
 import re
-from ipaddress import ip_address
+from ipaddress import ip_address, ip_network
+from typing import Any, Dict, Iterable, List, Tuple
+
+MAC_SEPARATORS = re.compile(r"[:.\-]")
+MAC_DIGITS = re.compile(r"^[0-9a-f]{12}$")
 
 
 class ValidationHelper:
 
     @staticmethod
     def validate_ip_address(ip: str) -> str:
-        if not ip_address(ip):
-            raise ValueError(f"ValueError - ip-address: {ip}")
-        return ip
+        """
+        Проверяет IP-адрес и возвращает его каноническое представление (как его вернёт PostgreSQL inet).
+        """
+        return str(ip_address(ip))
+
+    @staticmethod
+    def validate_ip_network(network: str) -> str:
+        """
+        Проверяет подсеть (10.20.0.0/16) и возвращает её каноническое представление; биты хоста обнуляются.
+        """
+        return str(ip_network(network, strict=False))
 
     @staticmethod
     def validate_mac_address(mac: str) -> str:
-        pattern = r"^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$"
-        if not re.match(pattern, mac):
+        """
+        Проверяет MAC-адрес в форматах aa:bb:cc:dd:ee:ff, aa-bb-cc-dd-ee-ff, aabb.ccdd.eeff, aabbccddeeff
+        и возвращает каноническое представление PostgreSQL macaddr (aa:bb:cc:dd:ee:ff).
+        """
+        digits = MAC_SEPARATORS.sub("", mac.strip().lower())
+        if not MAC_DIGITS.match(digits):
             raise ValueError(f"ValueError - mac: {mac}")
-        return mac
+        return ":".join(digits[i : i + 2] for i in range(0, 12, 2))
+
+    @staticmethod
+    def split_lookup_keys(keys: Iterable[str]) -> Tuple[Dict[str, List[str]], Dict[str, List[str]], List[str]]:
+        """
+        Разбирает ключи пакетного поиска устройств: ключ считается MAC-адресом, если он им является,
+        иначе IP-адресом. Исходные ключи группируются по каноническому виду, чтобы вернуть их в ответе как есть.
+
+        Returns:
+            Tuple[Dict[str, List[str]], Dict[str, List[str]], List[str]]: Канонический MAC -> исходные ключи,
+            канонический IP -> исходные ключи, некорректные ключи.
+        """
+        macs: Dict[str, List[str]] = {}
+        ips: Dict[str, List[str]] = {}
+        invalid: List[str] = []
+        for key in keys:
+            try:
+                macs.setdefault(ValidationHelper.validate_mac_address(mac=key), []).append(key)
+                continue
+            except ValueError:
+                pass
+            try:
+                ips.setdefault(ValidationHelper.validate_ip_address(ip=key.strip()), []).append(key)
+            except ValueError:
+                invalid.append(key)
+        return macs, ips, invalid
+
+    @staticmethod
+    def lookup_not_found(macs: Dict[str, List[str]], ips: Dict[str, List[str]], devices: Iterable[Any]) -> List[str]:
+        """
+        Исходные ключи пакетного поиска, для которых не найдено устройство. Адреса устройств приводятся
+        к строке: в зависимости от драйвера inet может прийти объектом ipaddress.
+
+        Args:
+            macs (Dict[str, List[str]]): Канонический MAC -> исходные ключи (split_lookup_keys).
+            ips (Dict[str, List[str]]): Канонический IP -> исходные ключи (split_lookup_keys).
+            devices (Iterable[Any]): Найденные устройства (mac, ip_address).
+
+        Returns:
+            List[str]: Ключи без совпадений: сначала MAC-адреса, затем IP-адреса.
+        """
+        found_macs, found_ips = set(), set()
+        for device in devices:
+            found_macs.add(str(device.mac))
+            if device.ip_address is not None:
+                found_ips.add(str(device.ip_address))
+        not_found = [key for mac, keys in macs.items() if mac not in found_macs for key in keys]
+        not_found += [key for ip, keys in ips.items() if ip not in found_ips for key in keys]
+        return not_found
 
     @staticmethod
     def validate_port(self, port: int) -> int:
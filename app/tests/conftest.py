@@ -0,0 +1,17 @@
+import os
+
+# Settings читаются при импорте модулей приложения; для тестов достаточно фиктивных значений.
+for name, value in {
+    "APP_CONFIG__DB__USER": "test",
+    "APP_CONFIG__DB__PASSWORD": "test",
+    "APP_CONFIG__DB__HOST": "localhost",
+    "APP_CONFIG__DB__PORT": "5432",
+    "APP_CONFIG__DB__DATABASE": "test",
+    "APP_CONFIG__SNMP__PORT": "161",
+    "APP_CONFIG__SNMP__USERNAME": "test",
+    "APP_CONFIG__SNMP__AUTH_KEY": "maplesyrup",
+    "APP_CONFIG__SNMP__PRIV_KEY": "maplesyrup",
+    "APP_CONFIG__SNMP__COMMUNITY": "public",
+    "APP_CONFIG__API_KEY": "test",
+}.items():
+    os.environ.setdefault(name, value)
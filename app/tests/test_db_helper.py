@@ -0,0 +1,34 @@
+import asyncio
+from ipaddress import IPv4Address
+from typing import Any, Dict, Tuple
+
+from core.models import db_helper
+
+
+class FakeAsyncpgConnection:
+    def __init__(self) -> None:
+        self.codecs: Dict[str, Tuple[Any, str]] = {}
+
+    async def set_type_codec(self, typename, encoder, decoder, schema, format):
+        self.codecs[typename] = (decoder, format)
+
+
+class FakeAdaptedConnection:
+    def __init__(self) -> None:
+        self._connection = FakeAsyncpgConnection()
+
+    def await_(self, coroutine):
+        return asyncio.run(coroutine)
+
+
+def test_inet_columns_are_read_as_text():
+    connection = FakeAdaptedConnection()
+
+    db_helper.engine.dialect.on_connect()(connection)
+
+    for typename in ("inet", "cidr"):
+        decoder, format = connection._connection.codecs[typename]
+        assert format == "text"
+        value = decoder("10.20.0.15")
+        assert value == "10.20.0.15"
+        assert not isinstance(value, IPv4Address)
@@ -0,0 +1,119 @@
+import asyncio
+import importlib
+from typing import cast
+
+import pytest
+from core.services.crud.crud_switch import CrudSwitch
+from core.services.poller.discovery import TopologyCrawler
+from core.services.poller.oids import LLDP_REM_MAN_ADDR_IF_SUBTYPE, LLDP_REM_SYS_CAP_ENABLED, LLDP_REM_SYS_NAME
+from pysnmp.proto.rfc1902 import Integer, OctetString
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+discovery = importlib.import_module("core.services.poller.discovery")
+
+
+def neighbor(port: int, capabilities: bytes, name: str, address: str):
+    key = (0, port, 1)
+    man_addr = key + (1, 4) + tuple(int(octet) for octet in address.split("."))
+    return {
+        LLDP_REM_SYS_CAP_ENABLED: (key, OctetString(capabilities)),
+        LLDP_REM_SYS_NAME: (key, OctetString(name.encode())),
+        LLDP_REM_MAN_ADDR_IF_SUBTYPE: (man_addr, Integer(2)),
+    }
+
+
+NEIGHBORS = [
+    neighbor(1, b"\x20\x00", "access-sw", "192.0.2.11"),  # Bridge
+    neighbor(2, b"\x28\x00", "l3-sw", "192.0.2.12"),  # Bridge, Router
+    neighbor(3, b"\x24\x00", "phone", "192.0.2.13"),  # Bridge, Telephone
+    neighbor(4, b"\x30\x00", "ap", "192.0.2.14"),  # Bridge, WLAN Access Point
+    neighbor(5, b"\x08\x00", "router", "192.0.2.15"),  # Router
+]
+
+
+def test_neighbors_skip_phones_and_access_points(monkeypatch):
+    monkeypatch.setattr(discovery, "get_snmp_client", lambda *args, **kwargs: None)
+    crawler = TopologyCrawler(session_factory=None)
+
+    async def walk(client, oid):
+        return [row[oid] for row in NEIGHBORS]
+
+    monkeypatch.setattr(crawler, "_walk", walk)
+
+    neighbors = asyncio.run(crawler.neighbors("192.0.2.1"))
+
+    assert sorted(neighbors) == [("192.0.2.11", "access-sw"), ("192.0.2.12", "l3-sw")]
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.statement = None
+
+    async def scalars(self, statement, params=None):
+        self.statement = statement
+        return [True] * len(params)
+
+    async def execute(self, statement, params=None):
+        pass
+
+    async def commit(self):
+        pass
+
+
+@pytest.mark.parametrize("update_core_switch", [False, True])
+def test_upsert_discovered_updates_core_switch_only_when_asked(update_core_switch):
+    session = FakeSession()
+    rows = [{"ip_address": "192.0.2.11", "core_switch_ip": "192.0.2.1", "comment": "access-sw"}]
+
+    asyncio.run(CrudSwitch(session).upsert_discovered(rows, update_core_switch=update_core_switch))
+
+    sql = str(session.statement.compile(dialect=postgresql.dialect()))
+    set_clause = sql.split("DO UPDATE SET", 1)[1]
+    assert "comment = coalesce" in set_clause
+    assert ("core_switch_ip = excluded.core_switch_ip" in set_clause) is update_core_switch
+
+
+# Линейная топология: опорный коммутатор -> .11 -> .12 -> .13.
+CHAIN = {
+    "192.0.2.1": [("192.0.2.11", "sw-1")],
+    "192.0.2.11": [("192.0.2.12", "sw-2")],
+    "192.0.2.12": [("192.0.2.13", "sw-3")],
+    "192.0.2.13": [],
+}
+
+
+class Cancelled(Exception):
+    pass
+
+
+def chain_crawler(monkeypatch) -> TopologyCrawler:
+    crawler = TopologyCrawler(session_factory=cast(async_sessionmaker, None), concurrency=2, max_depth=3)
+
+    async def neighbors(ip_address):
+        return CHAIN[ip_address]
+
+    monkeypatch.setattr(crawler, "neighbors", neighbors)
+    return crawler
+
+
+def test_crawl_reports_progress_per_depth(monkeypatch):
+    reports = []
+
+    async def progress(value, message):
+        reports.append((value, message))
+
+    result = asyncio.run(chain_crawler(monkeypatch).crawl(["192.0.2.1"], progress))
+
+    assert result.depth == 3
+    assert [value for value, message in reports] == [0.25, 0.5, 0.75]
+    assert reports[0][1] == "Crawling LLDP neighbors at depth 1"
+
+
+def test_crawl_stops_when_progress_raises(monkeypatch):
+    async def progress(value, message):
+        if value >= 0.5:
+            raise Cancelled()
+
+    with pytest.raises(Cancelled):
+        asyncio.run(chain_crawler(monkeypatch).crawl(["192.0.2.1"], progress))
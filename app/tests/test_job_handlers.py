@@ -0,0 +1,11 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from core.services.jobs import handlers
+
+
+@pytest.mark.parametrize("params", [{}, {"ip_address": None}, {"ip_address": 3232235777}])
+def test_poll_switch_requires_ip_address(params):
+    with pytest.raises(ValueError, match="requires the ip_address param"):
+        asyncio.run(handlers.poll_switch(SimpleNamespace(params=params)))
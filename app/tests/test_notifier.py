@@ -0,0 +1,56 @@
+import asyncio
+
+from core.services.notify import notifier
+from core.services.notify.notifier import RESYNC_ACTION, ChangeListener
+
+
+class FakeConnection:
+    def __init__(self, answers: bool) -> None:
+        self.answers = answers
+        self.terminated = False
+
+    def add_termination_listener(self, callback):
+        pass
+
+    async def add_listener(self, channel, callback):
+        pass
+
+    async def fetchval(self, query):
+        if not self.answers:
+            # Полуоткрытое соединение: запрос ушёл, ответа нет.
+            await asyncio.Event().wait()
+        return 1
+
+    def is_closed(self):
+        return self.terminated
+
+    def terminate(self):
+        self.terminated = True
+
+
+def test_listener_reconnects_when_liveness_check_times_out(monkeypatch):
+    connections = [FakeConnection(answers=False), FakeConnection(answers=True)]
+    opened = []
+
+    async def connect(dsn):
+        connection = connections[len(opened)]
+        opened.append(connection)
+        return connection
+
+    monkeypatch.setattr(notifier.asyncpg, "connect", connect)
+    listener = ChangeListener(
+        dsn="postgresql://", channel="changes", reconnect_delay=0, keepalive_interval=0.01, keepalive_timeout=0.01
+    )
+    resyncs = []
+    listener.subscribe("device", lambda event: resyncs.append(event) if event.action == RESYNC_ACTION else None)
+
+    async def main():
+        await listener.start()
+        await asyncio.sleep(0.2)
+        await listener.stop()
+
+    asyncio.run(main())
+
+    assert opened == connections
+    assert connections[0].terminated
+    assert len(resyncs) == 2
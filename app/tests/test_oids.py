@@ -0,0 +1,22 @@
+import pytest
+from core.services.poller.oids import parse_lldp_neighbor
+from pysnmp.proto.rfc1902 import OctetString
+
+# <timeMark>.<lldpRemLocalPortNum>.<lldpRemIndex>
+INDEX = (0, 7, 1)
+
+
+@pytest.mark.parametrize(
+    "capabilities, port",
+    [
+        (b"\x20\x00", 7),  # Bridge
+        (b"\x08\x00", 7),  # Router
+        (b"\x28\x00", 7),  # Bridge, Router
+        (b"\x24\x00", None),  # Bridge, Telephone: IP-телефон с портом для ПК
+        (b"\x04\x00", None),  # Telephone
+        (b"\x01\x00", None),  # Station Only
+        (b"", None),
+    ],
+)
+def test_parse_lldp_neighbor(capabilities, port):
+    assert parse_lldp_neighbor(INDEX, OctetString(capabilities)) == port
@@ -0,0 +1,62 @@
+import pytest
+from core.services.oui import OuiIndex
+
+ENTRIES = [
+    ("001122", "Vendor L"),
+    ("70B3D5", "IEEE Registration Authority"),
+    ("70B3D51", "Vendor M"),
+    ("70B3D5123", "Vendor S"),
+    ("AA-BB-CC", "Vendor  Dashes\n"),
+    ("12345", "Ignored: wrong length"),
+    ("ZZZZZZ", "Ignored: not hex"),
+]
+
+
+@pytest.fixture
+def index() -> OuiIndex:
+    index = OuiIndex()
+    index.build(ENTRIES)
+    return index
+
+
+@pytest.mark.parametrize(
+    "mac, vendor",
+    [
+        ("00:11:22:33:44:55", "Vendor L"),  # MA-L, 24 бита
+        ("70:b3:d5:1f:ff:ff", "Vendor M"),  # MA-M, 28 бит внутри OUI 70B3D5
+        ("70:b3:d5:12:30:01", "Vendor S"),  # MA-S, 36 бит внутри блока MA-M
+        ("70:b3:d5:20:00:00", "IEEE Registration Authority"),
+        ("70b3.d512.3fff", "Vendor S"),
+        ("AA-BB-CC-00-00-01", "Vendor Dashes"),
+        ("00:11:23:00:00:00", None),
+        ("00:11:22", None),
+        ("not a mac", None),
+        (None, None),
+    ],
+)
+def test_lookup(index, mac, vendor):
+    assert index.lookup(mac) == vendor
+
+
+def test_build_skips_invalid_assignments(index):
+    assert len(index) == 5
+
+
+def test_load_reads_ieee_csv(tmp_path):
+    path = tmp_path / "oui.csv"
+    path.write_text(
+        "Registry,Assignment,Organization Name,Organization Address\n"
+        'MA-L,001122,"Vendor L","Street 1"\n'
+        'MA-S,70B3D5123,"Vendor S","Street 2"\n',
+        encoding="utf-8",
+    )
+    index = OuiIndex()
+    index.load([str(path)])
+
+    assert index.lookup("00:11:22:00:00:00") == "Vendor L"
+    assert index.lookup("70:b3:d5:12:30:00") == "Vendor S"
+
+
+def test_load_missing_file_is_an_error(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        OuiIndex().load([str(tmp_path / "oui.csv")])
@@ -0,0 +1,148 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator, List, TypeVar
+
+import pytest
+from core.services.poller.pipeline import (
+    batched,
+    correlate,
+    correlate_batches,
+    decode_fdb,
+    decode_fdb_offloaded,
+    exclude_ports,
+)
+from core.services.poller.uplinks import UplinkDetector
+from pysnmp.proto.rfc1902 import Integer
+
+T = TypeVar("T")
+
+
+async def aiter_of(items: List[T]) -> AsyncIterator[T]:
+    for item in items:
+        yield item
+
+
+def device(mac: str, vlan: int, port: int):
+    return {"mac": mac, "ip_address": None, "port": port, "vlan": vlan, "status": True}
+
+
+async def by_mac(batches):
+    """
+    Итог записи пачек по порядку: строка MAC-адреса из более поздней пачки перекрывает прежнюю.
+    """
+    devices = {}
+    async for batch in batches:
+        for row in batch:
+            devices[row["mac"]] = row
+    return devices
+
+
+def test_batched_keeps_last_row_within_batch():
+    rows = [
+        device("00:00:00:00:00:01", 10, 1),
+        device("00:00:00:00:00:02", 10, 2),
+        device("00:00:00:00:00:01", 20, 3),
+        device("00:00:00:00:00:03", 20, 3),
+    ]
+
+    async def main():
+        return [batch async for batch in batched(aiter_of(rows), batch_size=3)]
+
+    assert asyncio.run(main()) == [
+        [device("00:00:00:00:00:01", 20, 3), device("00:00:00:00:00:02", 10, 2), device("00:00:00:00:00:03", 20, 3)],
+    ]
+
+
+FDB = (1, 3, 6, 1, 2, 1, 17, 7, 1, 2, 2, 1, 2)
+SWITCH_MAC = "00:00:5e:00:00:fe"
+ARP = {"00:00:5e:00:00:01": "192.0.2.1", "00:00:5e:00:00:03": "192.0.2.3"}
+PORT_STATUS = {1: True, 2: True, 3: False}
+
+
+def fdb_row(vlan: int, mac: str, port: int):
+    return FDB + (vlan, *(int(octet, 16) for octet in mac.split(":"))), Integer(port)
+
+
+ROWS = [
+    fdb_row(10, "00:00:5e:00:00:01", 1),
+    fdb_row(10, "00:00:5e:00:00:02", 2),
+    fdb_row(10, "00:00:5e:00:00:03", 3),
+    fdb_row(10, "00:00:5e:00:00:04", 4),  # исключенный порт
+    fdb_row(10, SWITCH_MAC, 5),  # MAC известного коммутатора
+    fdb_row(20, "00:00:5e:00:00:01", 2),  # повтор MAC в другом VLAN, в другой пачке
+    fdb_row(20, "00:00:5e:00:00:05", 3),
+    fdb_row(30, "00:00:5e:00:00:05", 1),  # повтор MAC внутри пачки
+    fdb_row(30, "00:00:5e:00:00:06", 4),
+    fdb_row(30, "00:00:5e:00:00:07", 5),
+]
+EXCLUDED = frozenset({4})
+MACS = frozenset({SWITCH_MAC})
+
+
+def decode_in_loop(batch_size: int):
+    detector = UplinkDetector(mac_threshold=1, switch_macs=MACS, lldp_ports=frozenset())
+    entries = exclude_ports(detector.observe(decode_fdb(aiter_of(ROWS), len(FDB))), EXCLUDED)
+    devices = asyncio.run(by_mac(batched(correlate(entries, ARP, PORT_STATUS), batch_size)))
+    return devices, detector
+
+
+def decode_offloaded(executor: Executor, batch_size: int):
+    detector = UplinkDetector(mac_threshold=1, switch_macs=MACS, lldp_ports=frozenset())
+    chunks = decode_fdb_offloaded(aiter_of(ROWS), len(FDB), executor, batch_size, EXCLUDED, MACS)
+    devices = asyncio.run(by_mac(correlate_batches(detector.merge(chunks), ARP, PORT_STATUS)))
+    return devices, detector
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 6, 100])
+def test_offloaded_decode_matches_in_loop(batch_size):
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        offloaded, offloaded_detector = decode_offloaded(executor, batch_size)
+    in_loop, in_loop_detector = decode_in_loop(batch_size)
+
+    assert list(offloaded.values()) == list(in_loop.values())
+    assert offloaded_detector.mac_counts == in_loop_detector.mac_counts
+    assert offloaded_detector.switch_mac_ports == in_loop_detector.switch_mac_ports == {5}
+    assert offloaded_detector.uplinks() == in_loop_detector.uplinks()
+
+
+def test_in_loop_decode_result():
+    devices, detector = decode_in_loop(batch_size=3)
+
+    assert list(devices.values()) == [
+        {"mac": "00:00:5e:00:00:01", "ip_address": "192.0.2.1", "port": 2, "vlan": 20, "status": True},
+        {"mac": "00:00:5e:00:00:02", "ip_address": None, "port": 2, "vlan": 10, "status": True},
+        {"mac": "00:00:5e:00:00:03", "ip_address": "192.0.2.3", "port": 3, "vlan": 10, "status": False},
+        {"mac": SWITCH_MAC, "ip_address": None, "port": 5, "vlan": 10, "status": False},
+        {"mac": "00:00:5e:00:00:05", "ip_address": None, "port": 1, "vlan": 30, "status": True},
+        {"mac": "00:00:5e:00:00:07", "ip_address": None, "port": 5, "vlan": 30, "status": False},
+    ]
+    assert detector.mac_counts == {1: 2, 2: 2, 3: 2, 4: 2, 5: 2}
+
+
+def test_offloaded_decode_in_process_pool():
+    executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    with executor:
+        offloaded, offloaded_detector = decode_offloaded(executor, batch_size=4)
+    in_loop, in_loop_detector = decode_in_loop(batch_size=4)
+
+    assert list(offloaded.values()) == list(in_loop.values())
+    assert offloaded_detector.mac_counts == in_loop_detector.mac_counts
+
+
+@pytest.mark.parametrize("batch_size", [2, 100])
+def test_uplink_detector_counts_distinct_macs(batch_size):
+    rows = [fdb_row(vlan, "00:00:5e:00:00:01", 1) for vlan in range(10, 15)]
+    rows += [fdb_row(10, f"00:00:5e:00:01:{index:02x}", 2) for index in range(5)]
+
+    in_loop = UplinkDetector(mac_threshold=2, switch_macs=frozenset(), lldp_ports=frozenset())
+    entries = in_loop.observe(decode_fdb(aiter_of(rows), len(FDB)))
+    asyncio.run(by_mac(batched(correlate(entries, ARP, PORT_STATUS), batch_size)))
+    offloaded = UplinkDetector(mac_threshold=2, switch_macs=frozenset(), lldp_ports=frozenset())
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        chunks = decode_fdb_offloaded(aiter_of(rows), len(FDB), executor, batch_size, frozenset(), frozenset())
+        asyncio.run(by_mac(correlate_batches(offloaded.merge(chunks), ARP, PORT_STATUS)))
+
+    # Один MAC в пяти VLAN - одно устройство; на порту 2 счёт останавливается на пороге + 1.
+    assert in_loop.mac_counts == offloaded.mac_counts == {1: 1, 2: 3}
+    assert in_loop.uplinks() == offloaded.uplinks() == {2: ("mac_count", 3)}
@@ -0,0 +1,214 @@
+import asyncio
+import importlib
+from datetime import datetime, timedelta, timezone
+from typing import List, cast
+
+import pytest
+from core.services.poller.journal import SwitchPollStats
+from core.services.poller.poller import Poller
+from core.services.poller.targets import CoreSwitchTarget, SwitchTarget
+from core.services.poller.uplinks import UplinkDetector
+from core.services.snmp import SnmpError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+# Атрибут пакета poller - экземпляр Poller, модуль берётся по полному имени.
+poller_module = importlib.import_module("core.services.poller.poller")
+
+SWITCH = SwitchTarget(id=1, ip_address="192.0.2.10", snmp_oid="1.3.6.1.2.1.17.7.1.2.2.1.2", core_switch_ip="192.0.2.1")
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def commit(self):
+        pass
+
+
+class FakePoller(Poller):
+    def __init__(self) -> None:
+        super().__init__(session_factory=cast(async_sessionmaker, FakeSession))
+        self.polls = 0
+        self.results: List[bool] = []
+
+    async def poll_switch(self, switch, arp, macs=frozenset(), stats=None):
+        self.polls += 1
+        await asyncio.sleep(0.01)
+        return 0
+
+    async def read_arp(self, core_switch):
+        return {}
+
+    async def start_run(self, kind):
+        return 1
+
+    async def finish_run(self, run_id):
+        pass
+
+    async def record_run_switch(self, run_id, stats):
+        pass
+
+    async def record_success(self, switch):
+        self.results.append(True)
+
+    async def record_failure(self, switch, error):
+        self.results.append(False)
+
+
+@pytest.fixture
+def targets(monkeypatch):
+    switches = [SWITCH]
+
+    async def load_targets(session, switch_ip=None):
+        return [CoreSwitchTarget(ip_address="192.0.2.1", snmp_oid="1.3.6.1.2.1.4.22.1.2", switches=switches)]
+
+    async def load_switch_ips(session):
+        return frozenset()
+
+    monkeypatch.setattr(poller_module, "load_targets", load_targets)
+    monkeypatch.setattr(poller_module, "load_switch_ips", load_switch_ips)
+    return switches
+
+
+def test_sweep_and_on_demand_share_one_poll(targets):
+    poller = FakePoller()
+
+    async def main():
+        await asyncio.gather(
+            poller._poll_switch_safe(SWITCH, {}, frozenset(), run_id=1),
+            poller.poll_on_demand(SWITCH.ip_address, max_age=timedelta(0)),
+        )
+
+    asyncio.run(main())
+
+    assert poller.polls == 1
+    assert poller.results == [True]
+
+
+def test_on_demand_respects_open_breaker(targets):
+    targets[0] = SwitchTarget(
+        id=1,
+        ip_address="192.0.2.10",
+        snmp_oid="1.3.6.1.2.1.17.7.1.2.2.1.2",
+        core_switch_ip="192.0.2.1",
+        consecutive_failures=5,
+        next_poll_at=datetime.now(timezone.utc) + timedelta(hours=1),
+    )
+    poller = FakePoller()
+
+    with pytest.raises(SnmpError):
+        asyncio.run(poller.poll_on_demand(SWITCH.ip_address, max_age=timedelta(0)))
+    assert poller.polls == 0
+
+
+class Cancelled(Exception):
+    pass
+
+
+def two_core_switches(monkeypatch):
+    async def load_targets(session, switch_ip=None):
+        return [
+            CoreSwitchTarget(ip_address=f"192.0.2.{index}", snmp_oid="1.3.6.1.2.1.4.22.1.2", switches=[])
+            for index in (1, 2)
+        ]
+
+    async def load_switch_ips(session):
+        return frozenset()
+
+    monkeypatch.setattr(poller_module, "load_targets", load_targets)
+    monkeypatch.setattr(poller_module, "load_switch_ips", load_switch_ips)
+
+
+def test_sweep_reports_progress_per_core_switch(monkeypatch):
+    two_core_switches(monkeypatch)
+    reports = []
+
+    async def progress(value, message):
+        reports.append((value, message))
+
+    asyncio.run(FakePoller().sweep(progress))
+
+    assert reports == [(0.5, "Polled 1 of 2 core switches"), (1.0, "Polled 2 of 2 core switches")]
+
+
+def test_sweep_stops_when_progress_raises(monkeypatch):
+    two_core_switches(monkeypatch)
+    poller = FakePoller()
+    polled = []
+
+    async def poll_core_switch(core_switch, switch_ips, run_id=None):
+        await asyncio.sleep(0.01 if core_switch.ip_address.endswith(".1") else 1)
+        polled.append(core_switch.ip_address)
+
+    async def progress(value, message):
+        raise Cancelled()
+
+    monkeypatch.setattr(poller, "poll_core_switch", poll_core_switch)
+
+    with pytest.raises(Cancelled):
+        asyncio.run(poller.sweep(progress))
+    assert polled == ["192.0.2.1"]
+
+
+def device(mac: str, port: int):
+    return {"mac": mac, "ip_address": None, "port": port, "vlan": 10, "status": True}
+
+
+def test_write_devices_holds_back_devices_of_other_switches(monkeypatch):
+    # MAC-адрес -> коммутатор, за которым записано устройство.
+    owners = {"00:00:00:00:00:0a": 2, "00:00:00:00:00:0e": 3}
+    writes = []
+    synced = {}
+
+    class FakeCrudDevice:
+        def __init__(self, session):
+            pass
+
+        async def upsert_devices(self, switch_id, devices, polled_at, move=True):
+            skipped = {row["mac"] for row in devices if owners.get(row["mac"], switch_id) != switch_id and not move}
+            written = [(row["mac"], row["port"]) for row in devices if row["mac"] not in skipped]
+            owners.update((mac, switch_id) for mac, port in written)
+            if written:
+                writes.append(written)
+            return len(written), 0, skipped
+
+        async def finish_switch_sync(self, switch_id, polled_at, retention, uplink_ports):
+            synced["uplink_ports"] = set(uplink_ports)
+            return 0, 0
+
+    class FakeCrudSwitch:
+        def __init__(self, session):
+            pass
+
+        async def sync_uplink_ports(self, switch_id, uplinks, detected_at):
+            pass
+
+    monkeypatch.setattr(poller_module, "CrudDevice", FakeCrudDevice)
+    monkeypatch.setattr(poller_module, "CrudSwitch", FakeCrudSwitch)
+    detector = UplinkDetector(mac_threshold=2, switch_macs=frozenset(), lldp_ports=frozenset())
+    batches = [
+        [device("00:00:00:00:00:0a", 2), device("00:00:00:00:00:0b", 3), device("00:00:00:00:00:0e", 4)],
+        [device("00:00:00:00:00:0c", 2), device("00:00:00:00:00:0d", 2), device("00:00:00:00:00:0e", 5)],
+    ]
+
+    async def observed():
+        for batch in batches:
+            for row in batch:
+                detector.add(row["port"], (row["mac"],))
+            yield batch
+
+    stats = SwitchPollStats(switch_id=1, ip_address=SWITCH.ip_address, started_at=datetime.now(timezone.utc))
+    written = asyncio.run(
+        FakePoller().write_devices(1, observed(), detector, polled_at=datetime.now(timezone.utc), stats=stats)
+    )
+
+    # Порт 2 стал uplink на второй пачке: устройство коммутатора 2 за ним не перенесено,
+    # устройство коммутатора 3 на порту доступа перенесено после обхода один раз, с последнего порта.
+    assert writes == [[("00:00:00:00:00:0b", 3)], [("00:00:00:00:00:0e", 5)]]
+    assert owners["00:00:00:00:00:0a"] == 2
+    assert owners["00:00:00:00:00:0e"] == 1
+    assert synced["uplink_ports"] == {2}
+    assert written == stats.rows_inserted == 2
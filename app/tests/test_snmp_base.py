@@ -0,0 +1,70 @@
+import asyncio
+import importlib
+
+import pytest
+from core.services.snmp import SnmpBase, SnmpError, SnmpProfile
+from pysnmp.proto.rfc1902 import Integer, ObjectName
+
+snmp_base = importlib.import_module("core.services.snmp.snmp_base")
+
+ROOT = "1.3.6.1.2.1.17.7.1.2.2.1.2"
+
+
+class Client(SnmpBase):
+    def auth_data(self):
+        return None
+
+    async def transport(self):
+        return None
+
+
+class ErrorStatus(Integer):
+    def prettyPrint(self):
+        return f"error-status {int(self)}"
+
+
+def walk(client: SnmpBase):
+    async def main():
+        return [name async for name, _ in client.bulk_walk(ROOT)]
+
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    calls = []
+
+    def command(kind, error_status):
+        async def cmd(*args, **kwargs):
+            calls.append(kind)
+            if error_status:
+                return None, ErrorStatus(error_status), 1, []
+            return None, 0, 0, [(ObjectName(ROOT + ".1"), Integer(5)), (ObjectName("1.3.6.1.2.1.18"), Integer(0))]
+
+        return cmd
+
+    def setup(bulk_error_status: int):
+        monkeypatch.setattr(snmp_base, "bulk_cmd", command("bulk", bulk_error_status))
+        monkeypatch.setattr(snmp_base, "next_cmd", command("next", 0))
+        return calls
+
+    return setup
+
+
+def test_no_such_name_falls_back_to_getnext(agent):
+    calls = agent(bulk_error_status=2)
+    client = Client("192.0.2.10", profile=SnmpProfile(max_repetitions=25))
+
+    assert walk(client) == [tuple(ObjectName(ROOT + ".1"))]
+    assert calls == ["bulk", "next"]
+    assert client.profile.bulk is False
+
+
+def test_gen_err_keeps_getbulk(agent):
+    calls = agent(bulk_error_status=5)
+    client = Client("192.0.2.10", profile=SnmpProfile(max_repetitions=25))
+
+    with pytest.raises(SnmpError):
+        walk(client)
+    assert calls == ["bulk"]
+    assert client.profile.bulk is True
@@ -0,0 +1,64 @@
+import hashlib
+
+import pytest
+from core.services.snmp.usm import AUTH_PROTOCOLS, PRIV_PROTOCOLS, UsmCache, password_to_key
+from pysnmp.proto.rfc1902 import OctetString
+from pysnmp.proto.secmod.rfc3414.service import SnmpUSMSecurityModel
+
+ENGINE_ID = bytes.fromhex("000000000000000000000002")
+PASSWORD = "maplesyrup"
+
+
+def put(auth_protocol: str, priv_protocol: str):
+    return UsmCache().put(
+        "192.0.2.1",
+        161,
+        "user",
+        engine_id=ENGINE_ID,
+        auth_password=PASSWORD,
+        priv_password=PASSWORD,
+        auth_protocol=auth_protocol,
+        priv_protocol=priv_protocol,
+    )
+
+
+@pytest.mark.parametrize(
+    "auth_protocol, expected",
+    [
+        # RFC 3414 A.3.1 / A.3.2
+        ("md5", "526f5eed9fcce26f8964c2930787d82b"),
+        ("sha", "6695febc9288e36282235fc7151f128497b38f3f"),
+    ],
+)
+def test_auth_key_matches_rfc3414(auth_protocol, expected):
+    assert put(auth_protocol, "des").auth_key.hex() == expected
+
+
+@pytest.mark.parametrize("auth_protocol", ["md5", "sha", "sha256", "sha512"])
+@pytest.mark.parametrize("priv_protocol", ["des", "aes", "aes256"])
+def test_keys_match_pysnmp(auth_protocol, priv_protocol):
+    auth_service = SnmpUSMSecurityModel.AUTH_SERVICES[AUTH_PROTOCOLS[auth_protocol]]
+    priv_service = SnmpUSMSecurityModel.PRIV_SERVICES[PRIV_PROTOCOLS[priv_protocol]]
+    engine_id = OctetString(ENGINE_ID)
+
+    security = put(auth_protocol, priv_protocol)
+
+    auth_key = auth_service.localize_key(auth_service.hash_passphrase(PASSWORD), engine_id)
+    priv_key = priv_service.localize_key(
+        AUTH_PROTOCOLS[auth_protocol],
+        priv_service.hash_passphrase(AUTH_PROTOCOLS[auth_protocol], PASSWORD),
+        engine_id,
+    )
+    assert security.auth_key == auth_key.asOctets()
+    assert security.priv_key == priv_key.asOctets()
+
+
+def test_aes256_key_is_not_blumenthal_extended():
+    security = put("sha", "aes256")
+    master_key = password_to_key(PASSWORD, "sha")
+    local_key = hashlib.sha1(master_key + ENGINE_ID + master_key).digest()
+    blumenthal = (local_key + hashlib.sha1(local_key).digest())[:32]
+
+    assert len(security.priv_key) == 32
+    assert security.priv_key[:20] == local_key
+    assert security.priv_key != blumenthal
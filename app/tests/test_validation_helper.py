@@ -0,0 +1,56 @@
+from ipaddress import IPv4Address
+from types import SimpleNamespace
+
+import pytest
+from schemas.validation_helper import validation_helper
+
+
+@pytest.mark.parametrize(
+    "mac",
+    [
+        "aa:bb:cc:dd:ee:ff",
+        "AA:BB:CC:DD:EE:FF",
+        "aa-bb-cc-dd-ee-ff",
+        "aabb.ccdd.eeff",
+        "aabbccddeeff",
+        " AABB.CCDD.EEFF\n",
+    ],
+)
+def test_validate_mac_address_formats(mac):
+    assert validation_helper.validate_mac_address(mac=mac) == "aa:bb:cc:dd:ee:ff"
+
+
+@pytest.mark.parametrize(
+    "mac",
+    [
+        "",
+        "aa:bb:cc:dd:ee",
+        "aa:bb:cc:dd:ee:ff:00",
+        "gg:bb:cc:dd:ee:ff",
+        "aa bb cc dd ee ff",
+        "10.20.0.15",
+    ],
+)
+def test_validate_mac_address_rejects(mac):
+    with pytest.raises(ValueError):
+        validation_helper.validate_mac_address(mac=mac)
+
+
+def test_split_lookup_keys():
+    keys = ["AABB.CCDD.EEFF", "aa:bb:cc:dd:ee:ff", " 10.20.0.15 ", "10.20.0.15", "::1", "hostname", "aa:bb:cc"]
+
+    macs, ips, invalid = validation_helper.split_lookup_keys(keys)
+
+    assert macs == {"aa:bb:cc:dd:ee:ff": ["AABB.CCDD.EEFF", "aa:bb:cc:dd:ee:ff"]}
+    assert ips == {"10.20.0.15": [" 10.20.0.15 ", "10.20.0.15"], "::1": ["::1"]}
+    assert invalid == ["hostname", "aa:bb:cc"]
+
+
+@pytest.mark.parametrize("ip_address", [IPv4Address("10.20.0.15"), "10.20.0.15"])
+def test_lookup_not_found_matches_address_objects(ip_address):
+    macs, ips, _ = validation_helper.split_lookup_keys(
+        ["aabb.ccdd.eeff", "00:11:22:33:44:55", "10.20.0.15", "10.20.0.16"]
+    )
+    devices = [SimpleNamespace(mac="aa:bb:cc:dd:ee:ff", ip_address=ip_address)]
+
+    assert validation_helper.lookup_not_found(macs, ips, devices) == ["00:11:22:33:44:55", "10.20.0.16"]